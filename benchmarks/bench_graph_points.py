@@ -0,0 +1,98 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Cost of turning the rows of a graph into path points, per sample count.
+
+Compares the former per row transform, through index lookups and a call per
+coordinate, with the transform of whole columns followed by the min/max
+decimation. Run from the project root:
+
+    python -m benchmarks.bench_graph_points
+"""
+import math
+import time
+from typing import Callable, List, Tuple
+
+from gwe.model.graph_column import GraphColumn
+from gwe.view.widget.graph_points import decimate_min_max, transform_points
+
+_WIDTH = 400
+_HEIGHT = 80
+_REPEAT = 5
+
+Columns = Tuple[GraphColumn[int], GraphColumn[float]]
+
+
+def _make_columns(count: int) -> Columns:
+    timestamps = GraphColumn[int]('', count)
+    values = GraphColumn[float]('', count)
+    for i in range(count):
+        timestamps.append(i * 1000)
+        values.append(50 + 40 * math.sin(i / 50))
+    return timestamps, values
+
+
+def _calc_x(timestamp: int, begin: float, timespan: float, width: int) -> float:
+    return (timestamp - begin) / float(timespan) * width
+
+
+def _calc_y(value: float, range_begin: float, range_end: float, height: int) -> float:
+    y = float(value)
+    y -= range_begin
+    y /= (range_end - range_begin)
+    return height - (y * height)
+
+
+def per_row(columns: Columns) -> int:
+    timestamps, values = columns
+    begin, end = timestamps[0], timestamps[-1]
+    points: List[Tuple[float, float]] = []
+    for i in range(len(timestamps)):
+        points.append((_calc_x(timestamps.get_value(i), begin, end - begin, _WIDTH),
+                       _calc_y(values.get_value(i), 0.0, 100.0, _HEIGHT)))
+    return len(points)
+
+
+def per_column(columns: Columns) -> int:
+    timestamps, values = columns
+    begin, end = timestamps[0], timestamps[-1]
+    xs, ys = transform_points(timestamps.get_slice(0, len(timestamps)), values.get_slice(0, len(values)),
+                              begin, end, 0.0, 100.0, _WIDTH, _HEIGHT)
+    xs, ys = decimate_min_max(xs, ys)
+    return len(xs)
+
+
+def _time(function: Callable[[Columns], int], columns: Columns) -> Tuple[float, int]:
+    best = math.inf
+    points = 0
+    for _ in range(_REPEAT):
+        start = time.perf_counter()
+        points = function(columns)
+        best = min(best, time.perf_counter() - start)
+    return best, points
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'per row':>12} {'per column':>12} {'points':>8}")
+    for count in (1000, 10000, 100000):
+        columns = _make_columns(count)
+        row_time, _ = _time(per_row, columns)
+        column_time, points = _time(per_column, columns)
+        print(f"{count:>8} {row_time * 1000:>9.2f} ms {column_time * 1000:>9.2f} ms {points:>8}")
+
+
+if __name__ == '__main__':
+    main()
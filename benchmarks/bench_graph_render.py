@@ -0,0 +1,229 @@
+"""Off-screen rendering cost of the graph renderers, checked against golden images.
+
+Renders synthetic models with GraphLineRenderer and GraphStackedRenderer the way
+GraphView does, through a RasterJob into a cairo.ImageSurface, for a full frame
+and for a frame scrolled by one new row. FanProfileChart is rendered through its
+FanProfilePlot, from scratch and again with its cached grid as the current
+temperature marker moves. Reports the ms per frame and the peak Python memory
+allocated during a frame. Doesn't need a display. Run from the project root:
+
+    python -m benchmarks.bench_graph_render [--update-golden]
+
+Each renderer is also rendered once with fixed data and compared with its image
+in benchmarks/golden, exiting with an error on a difference or a missing image,
+so performance work can't silently change what's drawn. --update-golden writes
+the images instead, after an intended change. Commit them.
+"""
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import gi
+gi.require_version('Gdk', '3.0')
+import cairo
+from gi.repository import Gdk
+
+from gwe.model.graph_model import GraphModel, USEC_PER_SEC
+from gwe.view.graph_stacked_renderer_view import GraphStackedRenderer
+from gwe.view.widget.fan_profile_chart import FanProfilePlot
+from gwe.view.widget.graph_rasterizer import RasterJob, create_surface
+from gwe.view.widget.graph_renderer import GraphLineRenderer, GraphRenderer
+
+_GOLDEN_DIR = Path(__file__).parent / 'golden'
+_HEIGHT = 80
+_SIZES = (1000, 10000, 100000)
+_WIDTHS = (200, 800, 1600)
+_REPEAT = 5
+_ROW_USEC = USEC_PER_SEC
+# a pixel differs when one of its channels is off by more than this,
+#  allowing for anti-aliasing differences between cairo versions
+_CHANNEL_TOLERANCE = 8
+_MAX_DIFFERENT_PIXELS = 0.001
+
+_FAN_PROFILE = {0: 30, 40: 35, 55: 50, 65: 70, 75: 90, 85: 100}
+
+
+def _rgba(spec: str) -> Gdk.RGBA:
+    colour = Gdk.RGBA()
+    colour.parse(spec)
+    return colour
+
+
+def _line_renderer() -> GraphRenderer:
+    return GraphLineRenderer(_rgba('#76b900'), 1.5)
+
+
+def _stacked_renderer() -> GraphRenderer:
+    renderer = GraphStackedRenderer()
+    renderer.set_line_width(1.5)
+    renderer.set_stroke_color_rgba(_rgba('#76b900'))
+    stacked = _rgba('#76b900')
+    stacked.alpha = 0.5
+    renderer.set_stacked_color_rgba(stacked)
+    return renderer
+
+
+_RENDERERS: Dict[str, Callable[[], GraphRenderer]] = {
+    'line': _line_renderer,
+    'stacked': _stacked_renderer,
+}
+
+
+def _make_model(rows: int) -> GraphModel:
+    model = GraphModel(['value'], rows + 1, rows * _ROW_USEC)
+    model.extend((i * _ROW_USEC, (50 + 40 * math.sin(i / 50) + 9 * math.sin(i / 3),)) for i in range(rows))
+    return model
+
+
+def _area(width: int, height: int) -> Gdk.Rectangle:
+    area = Gdk.Rectangle()
+    area.x, area.y, area.width, area.height = 0, 0, width, height
+    return area
+
+
+def _full_job(model: GraphModel, renderer: GraphRenderer, width: int) -> RasterJob:
+    end_time = model.get_end_time()
+    begin_time = end_time - model.timespan
+    return RasterJob(model.snapshot(begin_time, end_time), [renderer], create_surface(width, _HEIGHT, 1), None,
+                     0, 0, begin_time, end_time, _area(width, _HEIGHT))
+
+
+def _scroll_job(model: GraphModel, renderer: GraphRenderer, width: int, source: cairo.ImageSurface) -> RasterJob:
+    """The job GraphView submits when a row was appended, it moves `source` and renders the new strip"""
+    end_time = model.get_end_time()
+    usec_per_px = model.timespan / width
+    shift = math.ceil(_ROW_USEC / usec_per_px)
+    x = max(0, math.floor(width - shift - 4))
+    begin_time = int(end_time - model.timespan + x * usec_per_px)
+    return RasterJob(model.snapshot(begin_time, begin_time + model.timespan), [renderer],
+                     create_surface(width, _HEIGHT, 1), source, shift, x, begin_time,
+                     begin_time + model.timespan, _area(width, _HEIGHT))
+
+
+def _measure(frame: Callable[[], None]) -> Tuple[float, float]:
+    """Best time in ms of `frame`, and the peak KiB allocated by Python while it ran"""
+    best = math.inf
+    for _ in range(_REPEAT):
+        start = time.perf_counter()
+        frame()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000.0, peak / 1024.0
+
+
+def _run_job(job: RasterJob) -> None:
+    job.run()
+    if not job.succeeded:
+        raise RuntimeError("Rendering failed")
+
+
+def bench_graph(name: str) -> None:
+    print(f"{name:>8} {'rows':>7} {'width':>6} {'full ms':>9} {'KiB':>8} {'scroll ms':>10} {'KiB':>8}")
+    for rows in _SIZES:
+        model = _make_model(rows)
+        for width in _WIDTHS:
+            renderer = _RENDERERS[name]()
+            full_ms, full_kib = _measure(lambda: _run_job(_full_job(model, renderer, width)))
+            source = _full_job(model, renderer, width)
+            _run_job(source)
+            model.append(model.get_end_time() + _ROW_USEC, 50.0)
+            scroll_ms, scroll_kib = _measure(lambda: _run_job(_scroll_job(model, renderer, width, source.target)))
+            print(f"{'':>8} {rows:>7} {width:>6} {full_ms:>9.2f} {full_kib:>8.1f} {scroll_ms:>10.2f} {scroll_kib:>8.1f}")
+
+
+def _fan_profile_plot() -> FanProfilePlot:
+    plot = FanProfilePlot(_rgba('#76b900'))
+    plot.set_data(_FAN_PROFILE, 5)
+    return plot
+
+
+def _draw_fan_profile(surface: cairo.ImageSurface, plot: FanProfilePlot) -> None:
+    cr = cairo.Context(surface)
+    cr.set_operator(cairo.OPERATOR_CLEAR)
+    cr.paint()
+    cr.set_operator(cairo.OPERATOR_OVER)
+    plot.draw(cr, surface.get_width(), surface.get_height(), _rgba('#333333'))
+    surface.flush()
+
+
+def bench_fan_profile() -> None:
+    """A new plot draws its grid and labels, a redraw with a moving marker reuses them"""
+    print(f"{'fan':>8} {'':>7} {'width':>6} {'full ms':>9} {'KiB':>8} {'marker ms':>10} {'KiB':>8}")
+    for width in (400, 800, 1600):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, width * 3 // 4)
+        full_ms, full_kib = _measure(lambda: _draw_fan_profile(surface, _fan_profile_plot()))
+        plot = _fan_profile_plot()
+        temperatures = iter(range(1000000))
+
+        def draw_marker() -> None:
+            plot.set_temperature(next(temperatures) % 100)
+            _draw_fan_profile(surface, plot)
+
+        marker_ms, marker_kib = _measure(draw_marker)
+        print(f"{'':>8} {'':>7} {width:>6} {full_ms:>9.2f} {full_kib:>8.1f} {marker_ms:>10.2f} {marker_kib:>8.1f}")
+
+
+def _golden_surfaces() -> Dict[str, cairo.ImageSurface]:
+    surfaces: Dict[str, cairo.ImageSurface] = {}
+    model = _make_model(1000)
+    for name, renderer in _RENDERERS.items():
+        job = _full_job(model, renderer(), 400)
+        _run_job(job)
+        surfaces[name] = job.target
+    surfaces['fan_profile'] = cairo.ImageSurface(cairo.FORMAT_ARGB32, 400, 300)
+    _draw_fan_profile(surfaces['fan_profile'], _fan_profile_plot())
+    return surfaces
+
+
+def _different_pixels(surface: cairo.ImageSurface, golden: cairo.ImageSurface) -> int:
+    if (surface.get_width(), surface.get_height()) != (golden.get_width(), golden.get_height()):
+        return surface.get_width() * surface.get_height()
+    data = bytes(surface.get_data())
+    golden_data = bytes(golden.get_data())
+    different = 0
+    for i in range(0, len(data), 4):
+        if any(abs(data[i + c] - golden_data[i + c]) > _CHANNEL_TOLERANCE for c in range(4)):
+            different += 1
+    return different
+
+
+def check_golden(update: bool) -> List[str]:
+    """Names of the renderers whose output doesn't match their golden image, or that have none"""
+    if update:
+        _GOLDEN_DIR.mkdir(exist_ok=True)
+    failed: List[str] = []
+    for name, surface in _golden_surfaces().items():
+        path = _GOLDEN_DIR / f'{name}.png'
+        if update:
+            surface.write_to_png(str(path))
+            print(f"wrote {path}")
+            continue
+        if not path.exists():
+            failed.append(name)
+            print(f"{name}: no golden image {path}, write it with --update-golden")
+            continue
+        different = _different_pixels(surface, cairo.ImageSurface.create_from_png(str(path)))
+        if different > surface.get_width() * surface.get_height() * _MAX_DIFFERENT_PIXELS:
+            failed.append(name)
+            surface.write_to_png(str(path.with_suffix('.actual.png')))
+            print(f"{name}: {different} pixels differ from {path}")
+    return failed
+
+
+def main() -> None:
+    failed = check_golden('--update-golden' in sys.argv[1:])
+    for name in _RENDERERS:
+        bench_graph(name)
+    bench_fan_profile()
+    if failed:
+        sys.exit(f"Output changed or not checked: {', '.join(failed)}")
+
+
+if __name__ == '__main__':
+    main()
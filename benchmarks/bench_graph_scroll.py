@@ -0,0 +1,95 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""CPU used by the scrolling of the historical data graphs.
+
+Opens a window with the nine graphs of the historical data dialog, fed with a
+sample every few seconds, and measures the process CPU time while they scroll.
+Needs a display. Run from the project root:
+
+    python -m benchmarks.bench_graph_scroll [seconds] [fps]
+
+`fps` 0 gives each graph its own uncapped driver, close to the former tick
+callback per graph, minus the redraws of less than a pixel.
+"""
+import resource
+import sys
+import time
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Gdk', '3.0')
+from gi.repository import GLib, Gtk
+
+from gwe.model.graph_model import GraphModel, USEC_PER_SEC
+from gwe.view.graph_stacked_renderer_view import GraphStackedRenderer
+from gwe.view.widget.graph_scroll_driver import GraphScrollDriver
+from gwe.view.widget.graph_view import GraphView
+
+_GRAPHS = 9
+_REFRESH_INTERVAL_SEC = 3
+_TIMESPAN_SEC = 300
+
+
+def _cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    fps = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    window = Gtk.Window(default_width=600)
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    window.add(box)
+    shared_driver = GraphScrollDriver(fps) if fps > 0 else None
+    models = []
+    for _ in range(_GRAPHS):
+        model = GraphModel(['value'], _TIMESPAN_SEC // _REFRESH_INTERVAL_SEC + 1, _TIMESPAN_SEC * USEC_PER_SEC)
+        model.append(GLib.get_monotonic_time(), 0.0)
+        view = GraphView(model, shared_driver if shared_driver is not None else GraphScrollDriver(1000))
+        view.props.height_request = 80
+        view.add_renderer(GraphStackedRenderer())
+        box.add(view)
+        models.append(model)
+    window.show_all()
+
+    def add_sample() -> bool:
+        for i, model in enumerate(models):
+            model.append(GLib.get_monotonic_time(), float((time.monotonic() * (i + 1)) % 100))
+        return GLib.SOURCE_CONTINUE
+
+    GLib.timeout_add_seconds(_REFRESH_INTERVAL_SEC, add_sample)
+    GLib.timeout_add(int(seconds * 1000), Gtk.main_quit)
+    start = [0.0, 0.0]
+
+    def start_measure() -> bool:
+        start[:] = [_cpu_time(), time.monotonic()]
+        return GLib.SOURCE_REMOVE
+
+    # let the window settle before measuring
+    GLib.timeout_add(1000, start_measure)
+    Gtk.main()
+
+    cpu_start, wall_start = start
+    cpu = _cpu_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    print(f"{'uncapped' if fps == 0 else f'{fps} fps cap'}: {cpu / wall * 100:.1f}% CPU over {wall:.0f} s")
+
+
+if __name__ == '__main__':
+    main()
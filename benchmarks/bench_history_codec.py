@@ -0,0 +1,96 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Encode/decode throughput and size of the compressed history segments.
+
+Run from the project root:
+
+    python -m benchmarks.bench_history_codec [hours]
+"""
+import io
+import math
+import random
+import sys
+import time
+from typing import List
+
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric
+from gwe.repository.history_repository import HistoryRow, USEC_PER_SEC, _CompressedSegment, \
+    write_compressed_segment
+
+
+def make_rows(samples: int, seed: int = 1) -> List[HistoryRow]:
+    """1 Hz samples of a GPU going between idle and load, with a jittery sampling interval"""
+    rng = random.Random(seed)
+    rows: List[HistoryRow] = []
+    timestamp = 1_700_000_000 * USEC_PER_SEC
+    temp = 40.0
+    load = 0.0
+    for i in range(samples):
+        timestamp += USEC_PER_SEC + rng.randint(-3000, 3000)
+        if i % 600 == 0:
+            load = rng.choice([0.0, 35.0, 99.0])
+        gpu_load = max(0.0, min(100.0, load + rng.choice([0, 0, 0, 1, -1])))
+        temp += (30 + gpu_load * 0.45 - temp) / 120
+        values = [math.nan] * len(HISTORY_METRICS)
+        values[HISTORY_METRICS.index(HistoryMetric.GPU_CLOCK)] = 1950.0 if gpu_load > 10 else 210.0
+        values[HISTORY_METRICS.index(HistoryMetric.MEMORY_CLOCK)] = 9501.0 if gpu_load > 10 else 405.0
+        values[HISTORY_METRICS.index(HistoryMetric.GPU_TEMP)] = float(round(temp))
+        values[HISTORY_METRICS.index(HistoryMetric.FAN_DUTY)] = 30.0 if temp < 60 else 55.0
+        values[HISTORY_METRICS.index(HistoryMetric.FAN_RPM)] = 1100.0 if temp < 60 else 1800.0
+        values[HISTORY_METRICS.index(HistoryMetric.GPU_LOAD)] = gpu_load
+        values[HISTORY_METRICS.index(HistoryMetric.MEMORY_LOAD)] = round(gpu_load / 3)
+        values[HISTORY_METRICS.index(HistoryMetric.MEMORY_USAGE)] = 1024.0 + round(gpu_load * 20)
+        values[HISTORY_METRICS.index(HistoryMetric.POWER_DRAW)] = round(20 + gpu_load * 2.5 + rng.random() * 5, 2)
+        values[HISTORY_METRICS.index(HistoryMetric.POWER_LIMIT)] = 320.0
+        rows.append((timestamp, values))
+    return rows
+
+
+def main() -> None:
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24.0
+    rows = make_rows(int(hours * 3600))
+    samples = len(rows) * len(HISTORY_METRICS)
+
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    write_compressed_segment(buffer, rows)
+    encode_time = time.perf_counter() - start
+    size = len(buffer.getvalue())
+
+    buffer.seek(0)
+    start = time.perf_counter()
+    decoded = sum(1 for _ in _CompressedSegment(buffer).read(0, 2 ** 63 - 1))
+    decode_time = time.perf_counter() - start
+    assert decoded == len(rows)
+
+    buffer.seek(0)
+    column = HISTORY_METRICS.index(HistoryMetric.GPU_TEMP)
+    start = time.perf_counter()
+    sum(1 for _ in _CompressedSegment(buffer).read_column(column, 0, 2 ** 63 - 1))
+    decode_column_time = time.perf_counter() - start
+
+    raw_size = len(rows) * 8 * (1 + len(HISTORY_METRICS))
+    print(f"rows: {len(rows)}, metric samples: {samples}")
+    print(f"size: {size} bytes, {size / samples:.2f} bytes/sample (raw {raw_size / size:.1f}x larger)")
+    print(f"encode: {encode_time * 1000:.1f} ms, {samples / encode_time / 1e6:.2f} M samples/s")
+    print(f"decode all metrics: {decode_time * 1000:.1f} ms, {samples / decode_time / 1e6:.2f} M samples/s")
+    print(f"decode one metric: {decode_column_time * 1000:.1f} ms, "
+          f"{len(rows) / decode_column_time / 1e6:.2f} M samples/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Time to load a long range of one metric, from the raw samples and from the rollups.
+
+Run from the project root:
+
+    python -m benchmarks.bench_history_rollup [days]
+"""
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from benchmarks.bench_history_codec import make_rows
+from gwe.model.history_metric import HistoryMetric
+from gwe.model.sys_paths import SysPaths
+from gwe.repository.history_repository import HistoryRepository, USEC_PER_SEC
+from gwe.repository.history_rollup import select_resolution
+
+_SAMPLE_INTERVAL_SEC = 3
+_MAX_POINTS = 1000
+
+
+def _stretch(origin: int, timestamp: int) -> int:
+    """Spread the 1 Hz benchmark samples to the default sampling interval"""
+    return origin + (timestamp - origin) * _SAMPLE_INTERVAL_SEC
+
+
+def _load(repository: HistoryRepository, begin: int, end: int, max_points: Optional[int]) -> float:
+    """Time to map the temperature and read every value, as the renderers would"""
+    start = time.perf_counter()
+    timestamps, temps = repository.map_metric('GPU-bench', HistoryMetric.GPU_TEMP, begin, end, max_points)
+    for _ in zip(timestamps, temps):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 7.0
+    rows = make_rows(int(days * 24 * 3600 / _SAMPLE_INTERVAL_SEC))
+    with tempfile.TemporaryDirectory() as root:
+        repository = HistoryRepository(SysPaths('', '', root))
+        start = time.perf_counter()
+        for timestamp, values in rows:
+            repository._queue.put(('GPU-bench', _stretch(rows[0][0], timestamp), values))
+        repository.flush()
+        write_time = time.perf_counter() - start
+
+        begin = _stretch(rows[0][0], rows[0][0])
+        end = _stretch(rows[0][0], rows[-1][0])
+        raw_time = _load(repository, begin, end, None)
+        rollup_time = _load(repository, begin, end, _MAX_POINTS)
+        repository.close()
+
+    resolution = select_resolution(begin, end, _MAX_POINTS) // USEC_PER_SEC
+    print(f"rows: {len(rows)} over {days:g} days, written with rollups in {write_time:.1f} s")
+    print(f"load raw samples: {raw_time * 1000:.1f} ms")
+    print(f"load {resolution} s rollup for {_MAX_POINTS} points: {rollup_time * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Cost of reading a setting, from the in-memory copy and with a query per read
+as SettingsInteractor used to do. Run from the project root:
+
+    python -m benchmarks.bench_settings
+"""
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from peewee import SqliteDatabase
+from reactivex import Subject
+
+from gwe.interactor.settings_interactor import SettingsInteractor
+from gwe.model import setting
+from gwe.model.setting import Setting, SettingChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+
+_READS = 100000
+
+
+def _measure(read: Callable[[], int]) -> float:
+    """Usec per read"""
+    start = time.perf_counter()
+    for _ in range(_READS):
+        read()
+    return (time.perf_counter() - start) * 1000000.0 / _READS
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database = SqliteDatabase(str(Path(directory) / 'bench.db'))
+        Setting._meta.database = database
+        database.create_tables([Setting])
+        setting.SPEED_STEP_CHANGED_SUBJECT = SettingChangedSubject(Subject())
+        Setting.create(key='settings_hysteresis', value=3)
+        worker = DatabaseWorker(database)
+        interactor = SettingsInteractor(setting.SPEED_STEP_CHANGED_SUBJECT, worker)
+        cached = _measure(lambda: interactor.get_int('settings_hysteresis'))
+        queried = _measure(lambda: int(Setting.get_or_none(key='settings_hysteresis').value))
+        worker.close()
+        database.close()
+    print(f"{'cached':>8} {cached:>8.3f} usec/read")
+    print(f"{'queried':>8} {queried:>8.3f} usec/read")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Startup cost: the time to import the application, and the time to its first frame.
+
+The import time is read from `python -X importtime`, with the slowest top level
+imports. The first frame is measured in a child process that starts the
+application with an empty configuration directory, and quits once the main
+window was drawn for the first time, reporting its peak resident memory. That needs a display, the application
+resources built by meson and NVIDIA GPU access. Run from the project root:
+
+    MESON_BUILD_ROOT=build python -m benchmarks.bench_startup [runs] [--max-import-ms MS]
+
+Without MESON_BUILD_ROOT only the import time is measured. With --max-import-ms
+it exits with an error when the median import time is over MS, to check it in CI.
+tests/gwe/test_startup_imports.py checks that the modules only needed by rarely
+used features aren't imported while starting up.
+"""
+import json
+import os
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_RUNS = 5
+_TOP_IMPORTS = 15
+_IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+# what's imported before the main window is shown, the dialogs are imported when they're opened
+_STARTUP_MODULES = ('gwe.app', 'gwe.di')
+
+
+def _import_times() -> Tuple[int, Dict[str, int]]:
+    """Cumulative usec to import the startup modules, and of each of their top level imports"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {', '.join(_STARTUP_MODULES)}"],
+                            capture_output=True, text=True, check=True)
+    total = 0
+    top_level: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        if name in _STARTUP_MODULES:
+            total += cumulative
+        elif len(indent) <= 2:
+            top_level[name] = cumulative
+    return total, top_level
+
+
+def bench_import() -> float:
+    """Prints the import times, returns the median ms"""
+    runs: List[Tuple[int, Dict[str, int]]] = [_import_times() for _ in range(_RUNS)]
+    median_ms = statistics.median(total for total, _ in runs) / 1000
+    print(f"import {', '.join(_STARTUP_MODULES)}: {median_ms:.1f} ms")
+    slowest = sorted(runs[-1][1].items(), key=lambda item: item[1], reverse=True)[:_TOP_IMPORTS]
+    for name, usec in slowest:
+        print(f"  {usec / 1000:>8.1f} ms  {name}")
+    return median_ms
+
+
+def _first_frame() -> None:
+    """Runs in the child process, prints the times as JSON"""
+    start = time.perf_counter()
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import GLib, Gtk
+    from injector import Injector
+
+    from gwe import __main__ as gwe_main
+    from gwe import di
+    from gwe.app import Application
+    imported = time.perf_counter()
+
+    build_dir = os.environ['MESON_BUILD_ROOT']
+    di.PKGDATA_DIR = os.path.join(build_dir, 'data')
+    di.ICON_PATH = str(Path(__file__).parent.parent / 'data' / 'icons')
+    injector = Injector([di.ProviderModule])
+    lifetime = injector.get(gwe_main.GweLifetime)
+    application: Application = injector.get(Application)
+    times: Dict[str, float] = {'import_ms': (imported - start) * 1000.0}
+
+    def on_draw(*_: object) -> bool:
+        if 'first_frame_ms' not in times:
+            times['first_frame_ms'] = (time.perf_counter() - start) * 1000.0
+            GLib.idle_add(application.quit)
+        return False
+
+    def on_window_added(_: Gtk.Application, window: Gtk.Window) -> None:
+        window.connect_after('draw', on_draw)
+
+    application.connect('window-added', on_window_added)
+    application.run([sys.argv[0]])
+    lifetime.cleanup()
+    times['max_rss_mib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print(json.dumps(times))
+
+
+def bench_first_frame() -> None:
+    results: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        env = dict(os.environ, XDG_CONFIG_HOME=config_dir)
+        for _ in range(_RUNS):
+            result = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--first-frame'],
+                                    capture_output=True, text=True, check=True, env=env)
+            results.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    for key in ('import_ms', 'first_frame_ms', 'max_rss_mib'):
+        print(f"{key}: {statistics.median(r[key] for r in results):.1f}")
+
+
+def main() -> None:
+    global _RUNS  # pylint: disable=global-statement
+    if '--first-frame' in sys.argv[1:]:
+        _first_frame()
+        return
+    args = sys.argv[1:]
+    max_import_ms = None
+    if '--max-import-ms' in args:
+        index = args.index('--max-import-ms')
+        max_import_ms = float(args[index + 1])
+        del args[index:index + 2]
+    if args:
+        _RUNS = int(args[0])
+    import_ms = bench_import()
+    if 'MESON_BUILD_ROOT' in os.environ:
+        bench_first_frame()
+    if max_import_ms is not None and import_ms > max_import_ms:
+        sys.exit(f"Import time {import_ms:.1f} ms is over {max_import_ms:g} ms")
+
+
+if __name__ == '__main__':
+    main()
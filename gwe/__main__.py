@@ -46,7 +46,11 @@ from gwe.model.speed_step import SpeedStep
 from gwe.util.log import set_log_level
 from gwe.di import ProviderModule
 from gwe.app import Application
+from gwe.repository.database_worker import DatabaseWorker
+from gwe.repository.history_repository import HistoryRepository
 from gwe.repository.nvidia_repository import NvidiaRepository
+from gwe.repository.snapshot_repository import SnapshotRepository
+from gwe.util.executor import LaneExecutor
 
 WHERE_AM_I = abspath(dirname(__file__))
 LOCALE_DIR = join(WHERE_AM_I, 'mo')
@@ -67,9 +71,17 @@ class GweLifetime:
     def __init__(self,
                  composite_disposable: CompositeDisposable,
                  nvidia_repository: NvidiaRepository,
+                 history_repository: HistoryRepository,
+                 snapshot_repository: SnapshotRepository,
+                 database_worker: DatabaseWorker,
+                 lane_executor: LaneExecutor,
                  database: SqliteDatabase) -> None:
         self._composite_disposable = composite_disposable
         self._nvidia_repository = nvidia_repository
+        self._history_repository = history_repository
+        self._snapshot_repository = snapshot_repository
+        self._database_worker = database_worker
+        self._lane_executor = lane_executor
         self._database = database
         self._init_database()
 
@@ -79,7 +91,12 @@ class GweLifetime:
         try:
             _LOG.debug("cleanup")
             self._composite_disposable.dispose()
+            self._lane_executor.shutdown()
             self._nvidia_repository.set_all_gpus_fan_to_auto()
+            self._nvidia_repository.close()
+            self._snapshot_repository.save()
+            self._history_repository.close()
+            self._database_worker.close()
             self._database.close()
             # futures.thread._threads_queues.clear()
         except:
@@ -16,21 +16,27 @@
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import os
 import gi
 from time import sleep
 from enum import Enum
 from gettext import gettext as _
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List
 from injector import inject, singleton
 from gwe.conf import APP_NAME, APP_ID, APP_VERSION, APP_ICON_NAME
+from gwe.interactor.export_history_interactor import ExportHistoryInteractor
+from gwe.interactor.settings_interactor import SettingsInteractor
 from gwe.view.main_view import MainBuilder
 from gwe.model import load_fan_db_default_data, load_overclock_db_default_data
 from gwe.model.fan_profile import FanProfile
+from gwe.model.history_metric import HISTORY_METRICS
 from gwe.model.overclock_profile import OverclockProfile
 from gwe.presenter.main_presenter import MainPresenter
+from gwe.repository.history_repository import MAX_TIMESTAMP
 from gwe.repository.nvidia_repository import NvidiaRepository
 from gwe.util.deployment import is_flatpak
 from gwe.util.desktop_entry import set_autostart_entry, add_application_entry
+from gwe.util.history_export import ExportFormat, parse_metrics, parse_timestamp
 from gwe.util.log import LOG_DEBUG_FORMAT
 from gwe.util.view import build_glib_option
 from gwe.view.main_view import MainView
@@ -49,6 +55,8 @@ class Application(Gtk.Application):
                  presenter: MainPresenter,
                  builder: MainBuilder,
                  nvidia_repository: NvidiaRepository,
+                 export_history_interactor: ExportHistoryInteractor,
+                 settings_interactor: SettingsInteractor,
                  *args: Any,
                  **kwargs: Any) -> None:
         _LOG.debug("init Application")
@@ -65,6 +73,8 @@ class Application(Gtk.Application):
         self._view = view
         self._presenter = presenter
         self._nvidia_repository = nvidia_repository
+        self._export_history_interactor = export_history_interactor
+        self._settings_interactor = settings_interactor
         self._window: Optional[Gtk.ApplicationWindow] = None
         self._builder: Gtk.Builder = builder
         self._start_hidden: bool = False
@@ -86,6 +96,19 @@ class Application(Gtk.Application):
     def do_startup(self) -> None:
         Gtk.Application.do_startup(self)
 
+    def do_handle_local_options(self, options: GLib.VariantDict) -> int:
+        """Export in the process that was started, before it hands its command line
+        to a running instance, so the output goes to its own standard output and a
+        live export doesn't block the main loop of the running instance."""
+        if not options.contains(_Options.EXPORT.value):
+            return -1
+        _LOG.debug(f"Option {_Options.EXPORT.value} selected")
+        # convert GVariantDict -> GVariant -> dict
+        option_values = options.end().unpack()
+        if _Options.CTRL_DISPLAY.value in option_values:
+            self._nvidia_repository.set_ctrl_display(option_values[_Options.CTRL_DISPLAY.value])
+        return self._export(option_values)
+
     def do_command_line(self, command_line: Gio.ApplicationCommandLine) -> int:
 
         start_app = True
@@ -131,6 +154,38 @@ class Application(Gtk.Application):
             self.activate()
         return exit_value
 
+    def _export(self, options: Dict[str, Any]) -> int:
+        path = options[_Options.EXPORT.value]
+        if path != '-':
+            path = os.path.join(os.getcwd(), path)
+        try:
+            export_format = ExportFormat(options[_Options.EXPORT_FORMAT.value]) \
+                if _Options.EXPORT_FORMAT.value in options else ExportFormat.from_path(path)
+            uuids = options[_Options.EXPORT_GPU.value].split(',') if _Options.EXPORT_GPU.value in options else None
+            metrics = parse_metrics(options[_Options.EXPORT_METRICS.value]) \
+                if _Options.EXPORT_METRICS.value in options else HISTORY_METRICS
+            if _Options.EXPORT_LIVE.value in options:
+                count = self._export_history_interactor.export_live(
+                    path, export_format,
+                    duration=options[_Options.EXPORT_LIVE.value],
+                    interval=self._settings_interactor.get_int('settings_refresh_interval'),
+                    uuids=uuids,
+                    metrics=metrics)
+            else:
+                count = self._export_history_interactor.export_history(
+                    path, export_format,
+                    uuids=uuids,
+                    metrics=metrics,
+                    begin=parse_timestamp(options[_Options.EXPORT_BEGIN.value])
+                    if _Options.EXPORT_BEGIN.value in options else 0,
+                    end=parse_timestamp(options[_Options.EXPORT_END.value])
+                    if _Options.EXPORT_END.value in options else MAX_TIMESTAMP)
+        except (ValueError, ImportError, OSError) as e:
+            _LOG.error(f"Export failed: {str(e)}")
+            return 1
+        _LOG.info(f"Exported {count} rows to {path}")
+        return 0
+
     @staticmethod
     def _get_main_option_entries() -> List[GLib.OptionEntry]:
         options = [
@@ -147,6 +202,34 @@ class Application(Gtk.Application):
                               arg=GLib.OptionArg.STRING,
                               description="Specify the NV-CONTROL display (if you use Bumblebee, set this to \":8\" "
                                           "and start GWE2 with optirun)"),
+            build_glib_option(_Options.EXPORT.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Export the telemetry history to FILE and exit, \"-\" for the standard output",
+                              arg_description="FILE"),
+            build_glib_option(_Options.EXPORT_FORMAT.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Export format: csv, jsonl or parquet (default: from the FILE extension)",
+                              arg_description="FORMAT"),
+            build_glib_option(_Options.EXPORT_GPU.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Comma separated UUIDs of the GPUs to export (default: all)",
+                              arg_description="UUIDS"),
+            build_glib_option(_Options.EXPORT_METRICS.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Comma separated metrics to export, such as gpu_temp,fan_rpm (default: all)",
+                              arg_description="METRICS"),
+            build_glib_option(_Options.EXPORT_BEGIN.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Export samples from this ISO 8601 date and time",
+                              arg_description="DATETIME"),
+            build_glib_option(_Options.EXPORT_END.value,
+                              arg=GLib.OptionArg.STRING,
+                              description="Export samples up to this ISO 8601 date and time",
+                              arg_description="DATETIME"),
+            build_glib_option(_Options.EXPORT_LIVE.value,
+                              arg=GLib.OptionArg.INT,
+                              description="Export a live session sampling the GPUs for SECONDS instead of the history",
+                              arg_description="SECONDS"),
         ]
         if not is_flatpak():
             options.append(build_glib_option(_Options.AUTOSTART_ON.value,
@@ -164,3 +247,10 @@ class _Options(Enum):
     AUTOSTART_ON = 'autostart-on'
     AUTOSTART_OFF = 'autostart-off'
     DELAY = 'delay'
+    EXPORT = 'export'
+    EXPORT_FORMAT = 'export-format'
+    EXPORT_GPU = 'export-gpu'
+    EXPORT_METRICS = 'export-metrics'
+    EXPORT_BEGIN = 'export-begin'
+    EXPORT_END = 'export-end'
+    EXPORT_LIVE = 'export-live'
@@ -24,6 +24,8 @@ APP_ICON_NAME = APP_ID
 APP_ICON_NAME_SYMBOLIC = APP_ID + "-symbolic"
 APP_DB_NAME = APP_PACKAGE_NAME + ".db"
 APP_DB_VERSION = 1
+APP_HISTORY_DIR_NAME = "history"
+APP_SNAPSHOT_NAME = "snapshot.json"
 APP_MAIN_UI_NAME = "main.glade"
 APP_EDIT_FAN_PROFILE_UI_NAME = "edit_fan_profile.glade"
 APP_EDIT_OC_PROFILE_UI_NAME = "edit_oc_profile.glade"
@@ -36,6 +38,8 @@ APP_AUTHOR = 'Roberto Leinardi'
 APP_AUTHOR_EMAIL = 'roberto@leinardi.com'
 
 GRAPH_COLOR_HEX = '#76B900'
+# colour of each GPU in the historical data graphs
+GRAPH_GPU_COLORS_HEX = [GRAPH_COLOR_HEX, '#00A3E0', '#E0A800', '#E0457B', '#9B6BDF', '#1ABC9C', '#F0703A', '#A0A8B0']
 
 MIN_TEMP = 0
 MAX_TEMP = 100
@@ -49,6 +53,8 @@ SETTINGS_DEFAULTS: Dict[str, Any] = {
     'settings_minimize_to_tray': True,
     'settings_refresh_interval': 3,
     'settings_hysteresis': 2,
+    'settings_history_retention_days': 30,
+    'settings_graph_scroll_fps': 30,
     'settings_show_app_indicator': True,
     'settings_app_indicator_show_gpu_temp': True,
 }
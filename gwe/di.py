@@ -22,7 +22,7 @@ import shutil
 from typing import NewType
 
 from gi.repository import Gio, GLib, Gtk
-from injector import Binder, Module, provider, singleton
+from injector import Binder, Injector, Module, provider, singleton
 from peewee import BooleanField, SqliteDatabase
 from playhouse.migrate import SqliteMigrator, migrate
 from reactivex.disposable import CompositeDisposable
@@ -42,11 +42,13 @@ from gwe.model.overclock_profile import (OverclockProfile,
 from gwe.model.setting import Setting, SettingChangedSubject
 from gwe.model.speed_step import SpeedStep, SpeedStepChangedSubject
 from gwe.model.sys_paths import SysPaths
-from gwe.view.edit_fan_profile_view import EditFanProfileBuilder
-from gwe.view.edit_overclock_profile_view import EditOverclockProfileBuilder
-from gwe.view.historical_data_view import HistoricalDataBuilder
+from gwe.presenter.edit_fan_profile_presenter import EditFanProfileViewInterface
+from gwe.presenter.edit_overclock_profile_presenter import EditOverclockProfileViewInterface
+from gwe.presenter.historical_data_presenter import HistoricalDataViewInterface
+from gwe.presenter.preferences_presenter import PreferencesViewInterface
+from gwe.view.dialog_builders import (EditFanProfileBuilder, EditOverclockProfileBuilder,
+                                     HistoricalDataBuilder, PreferencesBuilder)
 from gwe.view.main_view import MainBuilder
-from gwe.view.preferences_view import PreferencesBuilder
 
 _LOG = logging.getLogger(__name__)
 
@@ -147,6 +149,29 @@ class ProviderModule(Module):
         builder.add_from_resource(_UI_RESOURCE_PATH.format(APP_PREFERENCES_UI_NAME))
         return builder
 
+    # The dialogs are built by their presenters when they're first shown, most
+    #  sessions never open them, so their modules are only imported then too.
+
+    @provider
+    def provide_edit_fan_profile_view(self, injector: Injector) -> EditFanProfileViewInterface:
+        from gwe.view.edit_fan_profile_view import EditFanProfileView
+        return injector.get(EditFanProfileView)
+
+    @provider
+    def provide_edit_overclock_profile_view(self, injector: Injector) -> EditOverclockProfileViewInterface:
+        from gwe.view.edit_overclock_profile_view import EditOverclockProfileView
+        return injector.get(EditOverclockProfileView)
+
+    @provider
+    def provide_historical_data_view(self, injector: Injector) -> HistoricalDataViewInterface:
+        from gwe.view.historical_data_view import HistoricalDataView
+        return injector.get(HistoricalDataView)
+
+    @provider
+    def provide_preferences_view(self, injector: Injector) -> PreferencesViewInterface:
+        from gwe.view.preferences_view import PreferencesView
+        return injector.get(PreferencesView)
+
     @singleton
     @provider
     def provide_thread_pool_scheduler(self) -> CompositeDisposable:
@@ -155,7 +180,8 @@ class ProviderModule(Module):
 
     @staticmethod
     def _create_database(path_to_db: str) -> SqliteDatabase:
-        database = SqliteDatabase(path_to_db)
+        # the writes run on the database worker, WAL lets the main thread read meanwhile
+        database = SqliteDatabase(path_to_db, pragmas={'journal_mode': 'wal', 'synchronous': 'normal'})
 
         if os.path.exists(path_to_db):
             if database.pragma('user_version') == 0:
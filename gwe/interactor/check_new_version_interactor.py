@@ -16,16 +16,17 @@
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import json
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import requests
 import reactivex
 from injector import singleton, inject
-from packaging.version import Version
 from reactivex import Observable
 
 from gwe.conf import APP_ID, APP_VERSION
 
+if TYPE_CHECKING:
+    from packaging.version import Version
+
 _LOG = logging.getLogger(__name__)
 
 
@@ -41,7 +42,11 @@ class CheckNewVersionInteractor:
         _LOG.debug("CheckNewVersionInteractor.execute()")
         return reactivex.defer(lambda _: reactivex.just(self._check_new_version()))
 
-    def _check_new_version(self) -> Optional[Version]:
+    def _check_new_version(self) -> 'Optional[Version]':
+        # imported on the scheduler thread when checking, rather than while starting up
+        import requests
+        from packaging.version import Version
+
         req = requests.get(self.URL_PATTERN.format(package=APP_ID))
         version = Version("0")
         if req.status_code == requests.codes.ok:
@@ -0,0 +1,123 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from injector import singleton, inject
+
+from gwe.model.gpu_status import GpuStatus
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric, get_history_values
+from gwe.repository.history_repository import HistoryRepository, MAX_TIMESTAMP
+from gwe.repository.nvidia_repository import NvidiaRepository
+from gwe.util.history_export import ExportFormat, ExportRow, write_export
+
+_LOG = logging.getLogger(__name__)
+
+
+def history_rows(history_repository: HistoryRepository,
+                 uuids: Sequence[str],
+                 begin: int,
+                 end: int) -> Iterator[ExportRow]:
+    """Stream the stored samples of each GPU of `uuids` in turn"""
+    for uuid in uuids:
+        for timestamp, values in history_repository.query(uuid, begin, end):
+            yield uuid, timestamp, values
+
+
+def live_rows(get_status: Callable[[], Optional[List[GpuStatus]]],
+              uuids: Optional[Sequence[str]],
+              duration: float,
+              interval: float) -> Iterator[ExportRow]:
+    """Sample every GPU each `interval` seconds for `duration` seconds"""
+    deadline = time.monotonic() + duration
+    while True:
+        started = time.monotonic()
+        timestamp = time.time_ns() // 1000
+        for gpu_status in get_status() or []:
+            uuid = gpu_status.info.uuid
+            if uuid is not None and (uuids is None or uuid in uuids):
+                yield uuid, timestamp, get_history_values(gpu_status)
+        if started + interval > deadline:
+            return
+        time.sleep(max(0.0, started + interval - time.monotonic()))
+
+
+@contextmanager
+def _open_output(path: str, export_format: ExportFormat) -> Iterator[Any]:
+    """Open `path` for writing, `-` is the standard output"""
+    if path == '-':
+        yield sys.stdout.buffer if export_format.is_binary else sys.stdout
+    elif export_format.is_binary:
+        with open(path, 'wb') as file:
+            yield file
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            yield file
+
+
+@singleton
+class ExportHistoryInteractor:
+    @inject
+    def __init__(self,
+                 history_repository: HistoryRepository,
+                 nvidia_repository: NvidiaRepository,
+                 ) -> None:
+        self._history_repository = history_repository
+        self._nvidia_repository = nvidia_repository
+
+    def export_history(self,
+                       path: str,
+                       export_format: ExportFormat,
+                       uuids: Optional[Sequence[str]] = None,
+                       metrics: Sequence[HistoryMetric] = HISTORY_METRICS,
+                       begin: int = 0,
+                       end: int = MAX_TIMESTAMP) -> int:
+        """Export the stored samples with `begin <= timestamp <= end` (wall clock, µs) of `uuids`,
+        every GPU with a history when None.
+
+        Returns:
+            int: the number of rows written
+        """
+        _LOG.debug("ExportHistoryInteractor.export_history()")
+        self._history_repository.flush()
+        if uuids is None:
+            uuids = self._history_repository.get_gpu_uuids()
+        rows = history_rows(self._history_repository, uuids, begin, end)
+        with _open_output(path, export_format) as file:
+            return write_export(file, export_format, metrics, rows)
+
+    def export_live(self,
+                    path: str,
+                    export_format: ExportFormat,
+                    duration: float,
+                    interval: float,
+                    uuids: Optional[Sequence[str]] = None,
+                    metrics: Sequence[HistoryMetric] = HISTORY_METRICS) -> int:
+        """Sample the GPUs of `uuids`, every GPU when None, for `duration` seconds and export the samples
+        as they are taken.
+
+        Returns:
+            int: the number of rows written
+        """
+        _LOG.debug("ExportHistoryInteractor.export_live()")
+        rows = live_rows(self._nvidia_repository.get_status, uuids, duration, interval)
+        with _open_output(path, export_format) as file:
+            return write_export(file, export_format, metrics, rows)
+
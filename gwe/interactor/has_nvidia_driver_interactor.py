@@ -39,8 +39,9 @@ class HasNvidiaDriverInteractor:
         return reactivex.defer(lambda _: reactivex.just(self._has_nvidia_driver()))
 
     def _has_nvidia_driver(self) -> HasNvidiaDriverResult:
-        if not self._nvidia_repository.has_nv_control_extension():
+        has_nv_control, has_nvml = self._nvidia_repository.probe()
+        if not has_nv_control:
             return HasNvidiaDriverResult.NV_CONTROL_MISSING
-        if not self._nvidia_repository.has_nvml_shared_library():
+        if not has_nvml:
             return HasNvidiaDriverResult.NVML_MISSING
         return HasNvidiaDriverResult.POSITIVE
@@ -14,71 +14,101 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
-from typing import Optional
+import logging
+import threading
+from typing import Any, Dict, Optional
 
 from injector import singleton, inject
 
 from gwe.conf import SETTINGS_DEFAULTS
-from gwe.model.setting import Setting
+from gwe.model.cb_change import DbChange
+from gwe.model.setting import Setting, SettingChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+
+_LOG = logging.getLogger(__name__)
 
 
 @singleton
 class SettingsInteractor:
+    """Reads the settings from an in-memory copy of the table.
+
+    The table is read once, writes go to the copy and are queued to the database
+    worker, and changes made elsewhere reach the copy through the
+    SettingChangedSubject, so a getter is a dict lookup rather than a query.
+    The changes of a key are ignored while writes of it are queued, they would
+    be the echo of an older value than the copy has.
+    """
+
     @inject
-    def __init__(self) -> None:
-        pass
+    def __init__(self, setting_changed_subject: SettingChangedSubject, database_worker: DatabaseWorker) -> None:
+        self._database_worker = database_worker
+        self._values: Dict[str, Any] = {setting.key: setting.value for setting in Setting.select()}
+        # the queued writes of each key, counted down on the database worker
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[str, int] = {}
+        setting_changed_subject.subscribe(on_next=self._on_setting_changed,
+                                          on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+
+    def _on_setting_changed(self, db_change: DbChange) -> None:
+        with self._pending_lock:
+            if self._pending.get(db_change.entry.key, 0) > 0:
+                return
+        if db_change.type == DbChange.DELETE:
+            self._values.pop(db_change.entry.key, None)
+        else:
+            self._values[db_change.entry.key] = db_change.entry.value
+
+    def _set(self, key: str, value: Any) -> None:
+        self._values[key] = value
+        with self._pending_lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._database_worker.submit(lambda: self._save(key, value))
 
-    @staticmethod
-    def get_bool(key: str, default: Optional[bool] = None) -> bool:
+    def _save(self, key: str, value: Any) -> None:
+        try:
+            _save(key, value)
+        finally:
+            with self._pending_lock:
+                self._pending[key] -= 1
+                if self._pending[key] == 0:
+                    del self._pending[key]
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> bool:
+        if key in self._values:
+            return bool(self._values[key])
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return bool(setting.value)
         return bool(default)
 
-    @staticmethod
-    def set_bool(key: str, value: bool) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value
-            setting.save()
-        else:
-            Setting.create(key=key, value=value)
+    def set_bool(self, key: str, value: bool) -> None:
+        self._set(key, value)
 
-    @staticmethod
-    def get_int(key: str, default: Optional[int] = None) -> int:
+    def get_int(self, key: str, default: Optional[int] = None) -> int:
+        if key in self._values:
+            return int(self._values[key])
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return int(setting.value)
         assert default is not None
         return default
 
-    @staticmethod
-    def set_int(key: str, value: int) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value
-            setting.save()
-        else:
-            Setting.create(key=key, value=value)
+    def set_int(self, key: str, value: int) -> None:
+        self._set(key, value)
 
-    @staticmethod
-    def get_str(key: str, default: Optional[str] = None) -> str:
+    def get_str(self, key: str, default: Optional[str] = None) -> str:
+        if key in self._values:
+            return str(self._values[key].decode("utf-8"))
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return str(setting.value.decode("utf-8"))
         return str(default)
 
-    @staticmethod
-    def set_str(key: str, value: str) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value.encode("utf-8")
-            setting.save()
-        else:
-            Setting.create(key=key, value=value.encode("utf-8"))
+    def set_str(self, key: str, value: str) -> None:
+        self._set(key, value.encode("utf-8"))
+
+
+def _save(key: str, value: Any) -> None:
+    setting: Setting = Setting.get_or_none(key=key)
+    if setting is not None:
+        setting.value = value
+        setting.save()
+    else:
+        Setting.create(key=key, value=value)
@@ -21,7 +21,8 @@
 import sys
 import typing
 from collections import deque
-from typing import Any, Generic, TypeVar
+from itertools import chain, islice
+from typing import Any, Generic, Iterator, List, Optional, Sequence, TypeVar
 
 # silence type error with deque
 if sys.version_info >= (3, 10):
@@ -29,6 +30,8 @@ if sys.version_info >= (3, 10):
 else:
     from typing_extensions import TypeAlias
 
+from gwe.util.sequence import chain_sequences
+
 if typing.TYPE_CHECKING:
     from _typeshed import SupportsRichComparison
 else:
@@ -37,40 +40,91 @@ else:
 
 T = TypeVar('T', bound=SupportsRichComparison)
 class GraphColumn(Generic[T]):
+    """Ring buffer of values.
+
+    The oldest values can be a read-only backing store, such as a memory mapped
+    file, wrapped without copying. Appended values are kept after it, and once the
+    column is full the backing store is trimmed first.
+    """
     name: str
 
     def __init__(self, name: str, max_len: int) -> None:
         self.name = name
         self._values: deque[T] = deque(maxlen=max_len)
         self._max_len: int = max_len
+        self._backing: Sequence[T] = ()
+        self._backing_start: int = 0
 
     @property
     def max_len(self) -> int:
         return self._max_len
 
+    def _backing_len(self) -> int:
+        return len(self._backing) - self._backing_start
+
+    def wrap(self, backing: Sequence[T]) -> None:
+        """Replace all values with the last `max_len` values of the read-only `backing`"""
+        self._values.clear()
+        self._backing = backing
+        self._backing_start = max(0, len(backing) - self._max_len)
+
     def append(self, value: T) -> None:
+        if self._backing_len() > 0 and self._backing_len() + len(self._values) >= self._max_len:
+            self._backing_start += 1
         self._values.append(value)
 
+    def clear(self) -> None:
+        self._values.clear()
+        self._backing = ()
+        self._backing_start = 0
+
     def resize(self, new_max_len: int) -> None:
+        overflow = self._backing_len() + len(self._values) - new_max_len
+        if overflow > 0:
+            self._backing_start += min(overflow, self._backing_len())
         new_values: deque[T] = deque(self._values, maxlen=new_max_len)
         self._max_len = new_max_len
         self._values = new_values
 
     def __len__(self) -> int:
-        return len(self._values)
+        return self._backing_len() + len(self._values)
+
+    def _iter_values(self) -> Iterator[T]:
+        """Iterate over the values, skipping NaN"""
+        backing = self._backing[self._backing_start:] if self._backing_len() > 0 else ()
+        # NaN is the only value not equal to itself
+        return (v for v in chain(backing, self._values) if v == v)
 
     def max_value(self) -> T:
-        if len(self._values) == 0:
+        value: Optional[T] = max(self._iter_values(), default=None)
+        if value is None:
             raise RuntimeError("No samples in column")
-        # dequeue can be iterated, but type checkers don't seem to think so
-        return max(self._values)
+        return value
 
     def min_value(self) -> T:
-        if len(self._values) == 0:
+        value: Optional[T] = min(self._iter_values(), default=None)
+        if value is None:
             raise RuntimeError("No samples in column")
-        # dequeue can be iterated, but type checkers don't seem to think so
-        return min(self._values)
-
+        return value
+
+    def get_slice(self, start: int, stop: int) -> Sequence[T]:
+        """The values from `start` to `stop` (exclusive), without copying the backing store"""
+        backing_len = self._backing_len()
+        start = max(0, start)
+        stop = min(stop, len(self))
+        parts: List[Sequence[T]] = []
+        if start < backing_len:
+            parts.append(self._backing[self._backing_start + start:self._backing_start + min(stop, backing_len)])
+        if stop > backing_len:
+            parts.append(list(islice(self._values, max(0, start - backing_len), stop - backing_len)))
+        return chain_sequences(parts)
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("GraphColumn index out of range")
+        return index
 
     def get_value(self, index: int) -> T:
         """
@@ -83,7 +137,11 @@ class GraphColumn(Generic[T]):
         Returns:
             T: The value at `index`
         """
-        return self._values[index]
+        index = self._normalize_index(index)
+        backing_len = self._backing_len()
+        if index < backing_len:
+            return self._backing[self._backing_start + index]
+        return self._values[index - backing_len]
     __getitem__ = get_value
 
     def set_value(self, index: int, value: T) -> None:
@@ -95,10 +153,11 @@ class GraphColumn(Generic[T]):
 
         Raises:
             IndexError: if `index` is out of range
+            RuntimeError: if `index` is part of the read-only backing store
         """
-        self._values[index] = value
+        index = self._normalize_index(index)
+        backing_len = self._backing_len()
+        if index < backing_len:
+            raise RuntimeError("Can't set a value of the read-only backing store")
+        self._values[index - backing_len] = value
     __setitem__ = set_value
-
-
-
-
@@ -19,13 +19,15 @@
 #    Christian Hergert
 #
 
+from bisect import bisect_left, bisect_right
 from math import e
-from typing import Iterable, List, Optional, cast
+from typing import Iterable, List, Optional, Sequence, Tuple, cast
 
 from gi.repository import GLib, GObject
 from gi.repository.GObject import SignalFlags
 
 from .graph_column import GraphColumn
+from .graph_snapshot import GraphSnapshot
 
 USEC_PER_SEC: int = 1000000
 
@@ -114,6 +116,7 @@ class GraphModelIter():
 
         self._table._check_min_max(value)
         col.set_value(self._index, value )
+        self._table._reset_serial += 1
         self._table.emit("changed")
 
 
@@ -128,6 +131,7 @@ class GraphModel(GObject.GObject):
         value_min (float): The minimum value for the graph's Y-axis. Default is 0.0.
         value_max (float): The maximum value for the graph's Y-axis. Default is 100.0.
         timespan (int): The time span in microseconds that the graph covers. Default is 60 seconds.
+            Changed to zoom the graph.
 
     """
 
@@ -149,6 +153,7 @@ class GraphModel(GObject.GObject):
         self._value_min: float = value_min
         self._value_max: float = value_max
         self._timespan: int = timespan
+        self._reset_serial: int = 0
 
     def __len__(self) -> int:
         """Returns the number of samples in the model."""
@@ -163,6 +168,20 @@ class GraphModel(GObject.GObject):
     def max_samples(self) -> int:
         return self._max_samples
 
+    @max_samples.setter
+    def set_max_samples(self, val: int) -> None:
+        """Changes the capacity, dropping the oldest samples that don't fit anymore"""
+        if val < 1:
+            raise ValueError("Invalid Argument: max_samples must be at least 1")
+        if val == self._max_samples:
+            return
+        self._max_samples = val
+        self._timestamps.resize(val)
+        for col in self._columns:
+            col.resize(val)
+        self._reset_serial += 1
+        self.notify("max_samples")
+
     @GObject.Property(type=float, default=0.0)
     def value_min(self) -> float:
         return self._value_min
@@ -185,11 +204,18 @@ class GraphModel(GObject.GObject):
         self._value_max = val
         self.notify("value_max")
 
-    @GObject.Property(type=int, default=60 * USEC_PER_SEC)
+    @GObject.Property(type=GObject.TYPE_INT64, default=60 * USEC_PER_SEC)
     def timespan(self) -> int:
         """timespan in microseconds"""
         return self._timespan
 
+    @timespan.setter
+    def set_timespan(self, val: int) -> None:
+        if val <= 0:
+            raise ValueError("Invalid Argument: timespan must be positive")
+        self._timespan = val
+        self.notify("timespan")
+
     def get_iter_first(self) -> GraphModelIter:
         """
         Returns:
@@ -197,6 +223,48 @@ class GraphModel(GObject.GObject):
         """
         return GraphModelIter(self, -1)
 
+    def get_iter_at(self, timestamp: int) -> GraphModelIter:
+        """Binary search for the rows from `timestamp` on.
+
+        Returns:
+            GraphModelIter: The iterator, starting at the last row before `timestamp` if there is one,
+                so a line can be drawn from the left edge of a graph beginning at `timestamp`.
+        """
+        index = bisect_left(self._timestamps, timestamp)
+        return GraphModelIter(self, max(0, index - 1) - 1)
+
+    def get_window(self, begin_time: int, end_time: int, column: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """Timestamps and values of `column` from `begin_time` to `end_time`, plus the rows just
+        outside of it on both sides, so lines can be drawn to the edges of a graph.
+
+        Raises:
+            ValueError: if `column` is out of range
+        """
+        if column >= len(self._columns) or column < 0:
+            raise ValueError("Invalid Argument: column out of range")
+        first = max(0, bisect_left(self._timestamps, begin_time) - 1)
+        last = bisect_right(self._timestamps, end_time) + 1
+        return self._timestamps.get_slice(first, last), self._columns[column].get_slice(first, last)
+
+    def snapshot(self, begin_time: int, end_time: int) -> GraphSnapshot:
+        """The rows from `begin_time` to `end_time` of every column, plus the rows just outside
+        of it, for rendering on another thread.
+
+        The read-only backing store isn't copied, only the rows appended after it.
+        """
+        first = max(0, bisect_left(self._timestamps, begin_time) - 1)
+        last = bisect_right(self._timestamps, end_time) + 1
+        return GraphSnapshot(self._timestamps.get_slice(first, last),
+                             [col.get_slice(first, last) for col in self._columns],
+                             self._max_samples,
+                             self._value_min,
+                             self._value_max,
+                             self._timespan)
+
+    def get_reset_serial(self) -> int:
+        """Incremented whenever existing rows are replaced or modified, but not when rows are appended"""
+        return self._reset_serial
+
     def append(self, timestamp: int, *values: float) -> None:
         if len(values) != len(self._columns):
             raise ValueError("Invalid Argument: values length does not match number of columns")
@@ -207,6 +275,56 @@ class GraphModel(GObject.GObject):
             col.append(values[i])
         self.emit("changed")
 
+    def extend(self, rows: Iterable[Tuple[int, Sequence[float]]]) -> None:
+        """Append every row of `rows`, emitting `changed` only once.
+
+        `rows` is consumed lazily, so a long series can be streamed through
+        the model while only the last `max_samples` rows are kept.
+        """
+        appended = False
+        for timestamp, values in rows:
+            if len(values) != len(self._columns):
+                raise ValueError("Invalid Argument: values length does not match number of columns")
+            self._timestamps.append(timestamp)
+            for col, value in zip(self._columns, values):
+                self._check_min_max(value)
+                col.append(value)
+            appended = True
+        if appended:
+            self.emit("changed")
+
+    def clear(self) -> None:
+        """Removes all samples from the model"""
+        self._timestamps.clear()
+        for col in self._columns:
+            col.clear()
+        self._reset_serial += 1
+        self.emit("changed")
+
+    def wrap(self, timestamps: Sequence[int], *columns: Sequence[float]) -> None:
+        """Replace all samples with read-only sequences, without copying them.
+
+        Meant for memory mapped history, only the last `max_samples` rows are
+        visible. Samples appended afterwards are stored after the wrapped ones.
+        NaN values mark missing samples and are skipped by the renderers.
+        """
+        if len(columns) != len(self._columns):
+            raise ValueError("Invalid Argument: values length does not match number of columns")
+        if any(len(values) != len(timestamps) for values in columns):
+            raise ValueError("Invalid Argument: column lengths do not match timestamps")
+
+        self._timestamps.wrap(timestamps)
+        for col, values in zip(self._columns, columns):
+            col.wrap(values)
+            if len(col) > 0:
+                try:
+                    self._check_min_max(col.min_value())
+                    self._check_min_max(col.max_value())
+                except RuntimeError:
+                    pass  # only NaN
+        self._reset_serial += 1
+        self.emit("changed")
+
     def get_column_max(self, column: int) -> float:
         if len(self._timestamps) == 0:
             raise RuntimeError("No samples in model")
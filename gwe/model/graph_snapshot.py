@@ -0,0 +1,80 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from typing import List, Sequence, Tuple
+
+
+class GraphSnapshot:
+    """Immutable rows of a `GraphModel` in a time window.
+
+    Taken on the main thread with `GraphModel.snapshot()`, so the rows can be
+    rendered on another thread while the model keeps changing.
+    """
+
+    def __init__(self,
+                 timestamps: Sequence[int],
+                 columns: List[Sequence[float]],
+                 max_samples: int,
+                 value_min: float,
+                 value_max: float,
+                 timespan: int) -> None:
+        if any(len(values) != len(timestamps) for values in columns):
+            raise ValueError("Invalid Argument: column lengths do not match timestamps")
+        self._timestamps: Sequence[int] = timestamps
+        self._columns: Tuple[Sequence[float], ...] = tuple(columns)
+        self._max_samples: int = max_samples
+        self._value_min: float = value_min
+        self._value_max: float = value_max
+        self._timespan: int = timespan
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def max_samples(self) -> int:
+        return self._max_samples
+
+    @property
+    def value_min(self) -> float:
+        return self._value_min
+
+    @property
+    def value_max(self) -> float:
+        return self._value_max
+
+    @property
+    def timespan(self) -> int:
+        """timespan in microseconds"""
+        return self._timespan
+
+    def get_end_time(self) -> int:
+        if len(self._timestamps) == 0:
+            raise RuntimeError("No samples in snapshot")
+        return self._timestamps[-1]
+
+    def get_window(self, begin_time: int, end_time: int, column: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """Same as `GraphModel.get_window()`
+
+        Raises:
+            ValueError: if `column` is out of range
+        """
+        if column >= len(self._columns) or column < 0:
+            raise ValueError("Invalid Argument: column out of range")
+        first = max(0, bisect_left(self._timestamps, begin_time) - 1)
+        last = bisect_right(self._timestamps, end_time) + 1
+        return self._timestamps[first:last], self._columns[column][first:last]
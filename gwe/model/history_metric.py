@@ -0,0 +1,74 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import math
+from enum import Enum
+from typing import List, Optional, Union
+
+from gwe.model.gpu_status import GpuStatus
+
+
+class HistoryMetric(Enum):
+    """Metrics of a `GpuStatus` that are recorded in the history store.
+
+    The declaration order is the on-disk column order, new members must
+    only ever be appended.
+    """
+    GPU_CLOCK = 'gpu_clock'
+    MEMORY_CLOCK = 'memory_clock'
+    SM_CLOCK = 'sm_clock'
+    VIDEO_CLOCK = 'video_clock'
+    GPU_TEMP = 'gpu_temp'
+    FAN_DUTY = 'fan_duty'
+    FAN_RPM = 'fan_rpm'
+    GPU_LOAD = 'gpu_load'
+    MEMORY_LOAD = 'memory_load'
+    MEMORY_USAGE = 'memory_usage'
+    ENCODER_LOAD = 'encoder_load'
+    DECODER_LOAD = 'decoder_load'
+    POWER_DRAW = 'power_draw'
+    POWER_LIMIT = 'power_limit'
+
+
+HISTORY_METRICS: List[HistoryMetric] = list(HistoryMetric)
+
+
+def _to_float(value: Optional[Union[int, float]]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def get_history_values(gpu_status: GpuStatus) -> List[float]:
+    """Flatten `gpu_status` into one value per `HistoryMetric`, NaN when a value is not available."""
+    fan_duty: Optional[int] = None
+    fan_rpm: Optional[int] = None
+    if gpu_status.fan.fan_list:
+        fan_duty, fan_rpm = gpu_status.fan.fan_list[0]
+    return [
+        _to_float(gpu_status.clocks.graphic_current),
+        _to_float(gpu_status.clocks.memory_current),
+        _to_float(gpu_status.clocks.sm_current),
+        _to_float(gpu_status.clocks.video_current),
+        _to_float(gpu_status.temp.gpu),
+        _to_float(fan_duty),
+        _to_float(fan_rpm),
+        _to_float(gpu_status.info.gpu_usage),
+        _to_float(gpu_status.info.memory_usage),
+        _to_float(gpu_status.info.memory_used),
+        _to_float(gpu_status.info.encoder_usage),
+        _to_float(gpu_status.info.decoder_usage),
+        _to_float(gpu_status.power.draw),
+        _to_float(gpu_status.power.limit),
+    ]
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-from typing import Any, NewType
+from typing import Any, List, NewType
 
 from peewee import ForeignKeyField, IntegerField, DateTimeField, SQL, SqliteDatabase
 from playhouse.signals import Model, post_save, post_delete
@@ -39,6 +39,17 @@ class SpeedStep(Model):
         database: SqliteDatabase # set in injector configuration
 
 
+class SpeedStepBatch:
+    """The steps of a fan profile after they were changed together, notified as a single change.
+
+    Written by queries, which don't emit the model signals for each step.
+    """
+
+    def __init__(self, profile_id: int, steps: List[SpeedStep]) -> None:
+        self.profile_id: int = profile_id
+        self.steps: List[SpeedStep] = steps
+
+
 @post_save(sender=SpeedStep)
 def on_speed_step_added(_: Any, step: SpeedStep, created: bool) -> None:
     _LOG.debug("Step added")
@@ -53,3 +64,8 @@ def on_speed_step_deleted(_: Any, step: SpeedStep) -> None:
 
 SpeedStepChangedSubject = NewType('SpeedStepChangedSubject', Subject)
 SPEED_STEP_CHANGED_SUBJECT : SpeedStepChangedSubject # set in injector configuration
+
+
+def notify_speed_steps_replaced(profile_id: int, steps: List[SpeedStep]) -> None:
+    _LOG.debug("Steps replaced")
+    SPEED_STEP_CHANGED_SUBJECT.on_next(DbChange(SpeedStepBatch(profile_id, steps), DbChange.UPDATE))
@@ -0,0 +1,30 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from gwe.model.clocks import Clocks
+from gwe.model.gpu_status import GpuStatus
+
+
+@dataclass
+class StatusSnapshot:
+    """The last known state of the GPUs, saved at shutdown and shown at the next startup
+    until the driver is read"""
+    status: List[GpuStatus] = field(default_factory=list)
+    mem_total: Optional[int] = None
+    max_clocks: Optional[Clocks] = None
@@ -15,14 +15,18 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-from typing import Optional, Any
+from typing import Any, Callable, List, Optional, Tuple
 
-from gi.repository import Gtk
-from injector import singleton, inject
+from gi.repository import Gtk, GLib
+from injector import ProviderOf, singleton, inject
+from reactivex import operators
+from reactivex.scheduler.mainloop import GtkScheduler
 
 from gwe.conf import MIN_TEMP, FAN_MIN_DUTY
 from gwe.model.cb_change import DbChange
 from gwe.model.setting import SettingChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+from gwe.repository.profile_repository import FanCurveEditSession, ProfileRepository
 from gwe.util.view import hide_on_delete
 from gwe.model.fan_profile import FanProfile
 from gwe.model.speed_step import SpeedStep
@@ -31,7 +35,7 @@ _LOG = logging.getLogger(__name__)
 
 
 class EditFanProfileViewInterface:
-    def show(self, profile: FanProfile) -> None:
+    def show(self, profile: FanProfile, steps: List[SpeedStep]) -> None:
         raise NotImplementedError()
 
     def hide(self) -> None:
@@ -52,10 +56,11 @@ class EditFanProfileViewInterface:
     def refresh_controls(self,
                          step: Optional[SpeedStep] = None,
                          unselect_list: bool = False,
-                         profile: Optional[FanProfile] = None) -> None:
+                         profile: Optional[FanProfile] = None,
+                         steps: Optional[List[SpeedStep]] = None) -> None:
         raise NotImplementedError()
 
-    def refresh_liststore(self, profile: FanProfile) -> None:
+    def refresh_liststore(self, steps: List[SpeedStep]) -> None:
         raise NotImplementedError()
 
 
@@ -63,55 +68,67 @@ class EditFanProfileViewInterface:
 class EditFanProfilePresenter:
     @inject
     def __init__(self,
-                 setting_changed_subject: SettingChangedSubject
+                 setting_changed_subject: SettingChangedSubject,
+                 profile_repository: ProfileRepository,
+                 database_worker: DatabaseWorker,
+                 view_provider: ProviderOf[EditFanProfileViewInterface],
                  ) -> None:
         _LOG.debug("init EditFanProfilePresenter ")
         self.view: EditFanProfileViewInterface = EditFanProfileViewInterface()
+        # the dialog is only built when it's first shown
+        self._view_provider = view_provider
+        self._has_view = False
         self._setting_changed_subject = setting_changed_subject
+        self._profile_repository = profile_repository
+        self._database_worker = database_worker
         self._profile = FanProfile()
+        self._session: Optional[FanCurveEditSession] = None
         self._selected_step: Optional[SpeedStep] = None
         self._register_db_listeners()
 
     def show_add(self) -> None:
-        profile = FanProfile()
-        profile.name = 'New profile'
-        profile.save()
-        self.show_edit(profile)
+        self._submit(lambda: FanProfile.create(name='New profile'), self.show_edit)
 
     def show_edit(self, profile: FanProfile) -> None:
         self._profile = profile
-        self.view.show(profile)
+        self._session = self._profile_repository.edit_fan_curve(profile)
+        self._create_view()
+        self.view.show(profile, self._session.get_steps())
+
+    def _create_view(self) -> None:
+        if not self._has_view:
+            self.view = self._view_provider.get()
+            self._has_view = True
 
     def on_dialog_delete_event(self, widget: Gtk.Widget, *_: Any) -> Any:
         if self._profile is not None:
             name = self.view.get_profile_name()
             if name != self._profile.name:
                 self._profile.name = name
-                self._profile.save()
+                self._submit(self._profile.save)
         return hide_on_delete(widget)
 
     def refresh_controls(self, step: Optional[SpeedStep] = None, deselect_list: bool = False) -> None:
         self._selected_step = step
-        self.view.refresh_controls(step, deselect_list, self._profile)
+        self.view.refresh_controls(step, deselect_list, self._profile, self._get_steps())
 
     def vbios_silent_mode_toggled(self, widget: Gtk.ToggleButton) -> None:
         self._profile.vbios_silent_mode = widget.get_active()
-        self._profile.save()
+        self._submit(self._profile.save)
 
     def on_step_selected(self, tree_selection: Gtk.TreeSelection) -> None:
         _LOG.debug("selected")
         list_store, tree_iter = tree_selection.get_selected()
-        step = None if tree_iter is None else SpeedStep.get_or_none(id=list_store.get_value(tree_iter, 0))
+        step = None
+        if tree_iter is not None:
+            step_id = list_store.get_value(tree_iter, 0)
+            step = next((s for s in self._get_steps() if s.id == step_id), None)
         self.refresh_controls(step)
 
     def on_add_step_clicked(self, *_: Any) -> None:
         step = SpeedStep()
         step.profile = self._profile
-        last_steps = (SpeedStep
-                      .select()
-                      .where(SpeedStep.profile == step.profile)
-                      .order_by(SpeedStep.temperature.desc())
-                      .limit(1))
+        last_steps = self._get_steps()[-1:]
         if not last_steps:
             step.temperature = MIN_TEMP
             step.duty = FAN_MIN_DUTY
@@ -122,27 +139,54 @@ class EditFanProfilePresenter:
         self.refresh_controls(step, True)
 
     def on_delete_profile_clicked(self, *_: Any) -> None:
-        self._profile.delete_instance(recursive=True)
+        self._session = None
+        profile = self._profile
+        self._submit(lambda: profile.delete_instance(recursive=True))
         self.view.hide()
 
     def on_delete_step_clicked(self, *_: Any) -> None:
-        assert self._selected_step is not None
-        self._selected_step.delete_instance()
-        self.view.refresh_liststore(self._profile)
+        assert self._selected_step is not None and self._session is not None
+        self._session.delete_step(self._selected_step)
+        self._commit_steps()
 
     def on_save_step_clicked(self, *_: Any) -> None:
-        assert self._selected_step is not None
-        self._selected_step.temperature = self.view.get_temperature()
-        self._selected_step.duty = self.view.get_duty()
-        self._selected_step.save()
-        self.view.refresh_liststore(self._profile)
+        assert self._selected_step is not None and self._session is not None
+        self._selected_step = self._session.set_step(self._selected_step,
+                                                     self.view.get_temperature(),
+                                                     self.view.get_duty())
+        self._commit_steps()
+
+    def _get_steps(self) -> List[SpeedStep]:
+        return [] if self._session is None else self._session.get_steps()
+
+    def _commit_steps(self) -> None:
+        """Commit the staged steps, then show them with the ids of the new ones"""
+        assert self._session is not None
+        self._session.commit().pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_steps_committed,
+                    on_error=lambda e: _LOG.exception(f"Db error: {str(e)}"))
+
+    def _on_steps_committed(self, committed: List[Tuple[int, SpeedStep]]) -> None:
+        if self._session is not None:
+            self._session.apply_committed(committed)
+        self.view.refresh_liststore(self._get_steps())
         if not self.view.has_a_step_selected():
             self.refresh_controls()
 
+    def _submit(self, request: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """Run `request` on the database worker, then `on_done` with its result on the main loop"""
+        self._database_worker.submit(request).pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=on_done,
+                    on_error=lambda e: _LOG.exception(f"Db error: {str(e)}"))
+
     def _register_db_listeners(self) -> None:
-        self._setting_changed_subject.subscribe(on_next=self._on_setting_list_changed,
-                                                on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        self._setting_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_setting_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
 
     def _on_setting_list_changed(self, db_change: DbChange) -> None:
-        if db_change.entry.key == 'settings_hysteresis':
-            self.view.refresh_liststore(self._profile)
+        if db_change.entry.key == 'settings_hysteresis' and self._has_view:
+            self.view.refresh_liststore(self._get_steps())
@@ -15,19 +15,19 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-import multiprocessing
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from gi.repository import Gtk, GLib
-from injector import singleton, inject
+from injector import ProviderOf, singleton, inject
 from reactivex import operators
 from reactivex.disposable import CompositeDisposable
-from reactivex.scheduler import ThreadPoolScheduler
 from reactivex.scheduler.mainloop import GtkScheduler
 
 from gwe.interactor.set_overclock_interactor import SetOverclockInteractor
 from gwe.model.overclock_profile import OverclockProfile
 from gwe.model.overclock import Overclock
+from gwe.repository.database_worker import DatabaseWorker
+from gwe.util.executor import Lane, LaneExecutor
 from gwe.util.view import hide_on_delete
 
 _LOG = logging.getLogger(__name__)
@@ -55,35 +55,47 @@ class EditOverclockProfilePresenter:
     @inject
     def __init__(self,
                  set_overclock_interactor: SetOverclockInteractor,
-                 composite_disposable: CompositeDisposable
+                 database_worker: DatabaseWorker,
+                 composite_disposable: CompositeDisposable,
+                 view_provider: ProviderOf[EditOverclockProfileViewInterface],
+                 lane_executor: LaneExecutor,
                  ) -> None:
         _LOG.debug("init EditOverclockProfilePresenter")
         self._set_overclock_interactor = set_overclock_interactor
+        self._database_worker = database_worker
         self._composite_disposable: CompositeDisposable = composite_disposable
         self.view: EditOverclockProfileViewInterface = EditOverclockProfileViewInterface()
+        # the dialog is only built when it's first shown
+        self._view_provider = view_provider
+        self._has_view = False
         self._profile = OverclockProfile()
         self._overclock = Overclock()
-        self._scheduler = ThreadPoolScheduler(multiprocessing.cpu_count())
+        self._scheduler = lane_executor.get_scheduler(Lane.DEVICE_WRITES)
         self._gpu_index: int = 0
 
     def show_add(self, overclock: Overclock, gpu_index: int) -> None:
-        profile = OverclockProfile()
-        profile.name = 'New profile'
-        profile.save()
-        self.show_edit(profile, overclock, gpu_index)
+        self._submit(lambda: OverclockProfile.create(name='New profile'),
+                     lambda profile: self.show_edit(profile, overclock, gpu_index))
 
     def show_edit(self, profile: OverclockProfile, overclock: Overclock, gpu_index: int) -> None:
         self._profile = profile
         self._overclock = overclock
+        self._create_view()
         self.view.show(profile, overclock)
         self._gpu_index = gpu_index
 
+    def _create_view(self) -> None:
+        if not self._has_view:
+            self.view = self._view_provider.get()
+            self._has_view = True
+
     def on_dialog_delete_event(self, widget: Gtk.Widget, *_: Any) -> Any:
         self._save_profile_name()
         return hide_on_delete(widget)
 
     def on_delete_profile_button_clicked(self, *_: Any) -> None:
-        self._profile.delete_instance(recursive=True)
+        profile = self._profile
+        self._submit(lambda: profile.delete_instance(recursive=True))
         self.view.hide()
 
     def on_apply_offsets_button_clicked(self, *_: Any) -> None:
@@ -101,7 +113,7 @@ class EditOverclockProfilePresenter:
         self._profile.gpu = self.view.get_gpu_offset()
         self._profile.memory = self.view.get_memory_offset()
         self._profile.name = self.view.get_profile_name()
-        self._profile.save()
+        self._submit(self._profile.save)
         self.view.hide()
 
     def _save_profile_name(self) -> None:
@@ -109,7 +121,14 @@ class EditOverclockProfilePresenter:
             name = self.view.get_profile_name()
             if name != self._profile.name:
                 self._profile.name = name
-                self._profile.save()
+                self._submit(self._profile.save)
+
+    def _submit(self, request: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """Run `request` on the database worker, then `on_done` with its result on the main loop"""
+        self._database_worker.submit(request).pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=on_done,
+                    on_error=lambda e: _LOG.exception(f"Db error: {str(e)}"))
 
     @staticmethod
     def _handle_set_overclock_result(result: Optional[Any]) -> None:
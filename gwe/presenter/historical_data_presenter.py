@@ -15,20 +15,39 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
+import math
+import time
 from enum import Enum
-from typing import Any, List, Tuple, Dict
+from typing import Any, List, Optional, Sequence, Tuple, Dict
 
+import reactivex
 from gi.repository import Gtk, GLib
-from injector import singleton, inject
+from injector import ProviderOf, singleton, inject
+from reactivex import operators
+from reactivex.scheduler.mainloop import GtkScheduler
 
 from gwe.interactor.settings_interactor import SettingsInteractor
+from gwe.model.cb_change import DbChange
+from gwe.model.clocks import Clocks
 from gwe.model.gpu_status import GpuStatus
+from gwe.model.history_metric import HistoryMetric
+from gwe.model.setting import SettingChangedSubject
+from gwe.repository.history_repository import HistoryRepository, USEC_PER_DAY, USEC_PER_SEC
+from gwe.repository.history_rollup import select_resolution
 from gwe.repository.nvidia_repository import DEFAULT_MAX_GPU_CLOCK, DEFAULT_MAX_MEM_CLOCK
+from gwe.util.executor import Lane, LaneExecutor
+from gwe.util.sample_buffer import SampleBuffer
+from gwe.util.sequence import OffsetSequence, align_series
 from gwe.util.view import hide_on_delete
 
 _LOG = logging.getLogger(__name__)
 
 MONITORING_INTERVAL = 300
+# shortest range the graphs can be zoomed to, in seconds
+MIN_GRAPH_TIMESPAN = 10
+# the graphs emit a range change on every motion of a zoom or pan, the history
+#  is reloaded at most once per this many ms meanwhile
+RANGE_RELOAD_DELAY_MS = 150
 
 
 class GraphType(Enum):
@@ -64,6 +83,18 @@ GRAPH_INIT = {
     GraphType.POWER_DRAW: GraphInit( 'W', 0.0, 400),
 }
 
+GRAPH_METRICS: Dict[GraphType, HistoryMetric] = {
+    GraphType.GPU_CLOCK: HistoryMetric.GPU_CLOCK,
+    GraphType.MEMORY_CLOCK: HistoryMetric.MEMORY_CLOCK,
+    GraphType.GPU_TEMP: HistoryMetric.GPU_TEMP,
+    GraphType.FAN_DUTY: HistoryMetric.FAN_DUTY,
+    GraphType.FAN_RPM: HistoryMetric.FAN_RPM,
+    GraphType.GPU_LOAD: HistoryMetric.GPU_LOAD,
+    GraphType.MEMORY_LOAD: HistoryMetric.MEMORY_LOAD,
+    GraphType.MEMORY_USAGE: HistoryMetric.MEMORY_USAGE,
+    GraphType.POWER_DRAW: HistoryMetric.POWER_DRAW,
+}
+
 class HistoricalDataViewInterface:
     def show(self) -> None:
         raise NotImplementedError()
@@ -71,10 +102,34 @@ class HistoricalDataViewInterface:
     def hide(self) -> None:
         raise NotImplementedError()
 
-    def reset_graphs(self) -> None:
+    def reset_graphs(self, gpu_count: int) -> None:
+        raise NotImplementedError()
+
+    def set_graph_range(self, timespan: int, end_time: Optional[int]) -> None:
+        raise NotImplementedError()
+
+    def select_gpu(self, gpu_index: int) -> None:
         raise NotImplementedError()
 
-    def refresh_graphs(self, data_dict: Dict[GraphType, Tuple[int, float]]) -> None:
+    def refresh_graphs(self, data_dict: Dict[GraphType, Tuple[int, List[float]]]) -> None:
+        raise NotImplementedError()
+
+    def set_current_values(self, data_dict: Dict[GraphType, Tuple[int, List[float]]]) -> None:
+        raise NotImplementedError()
+
+    def extend_graphs(self, data_dict: Dict[GraphType, Tuple[Sequence[int], List[Sequence[float]]]]) -> None:
+        raise NotImplementedError()
+
+    def load_history(self, graph_type: GraphType, timestamps: Sequence[int], columns: List[Sequence[float]]) -> None:
+        raise NotImplementedError()
+
+    def set_scroll_fps(self, fps: int) -> None:
+        raise NotImplementedError()
+
+    def set_max_values(self, mem_total: int, max_clocks: Clocks) -> None:
+        raise NotImplementedError()
+
+    def resize_graphs(self, max_samples: int) -> None:
         raise NotImplementedError()
 
 
@@ -84,54 +139,288 @@ class HistoricalDataPresenter:
     @inject
     def __init__(self,
                  settings_interactor: SettingsInteractor,
+                 history_repository: HistoryRepository,
+                 setting_changed_subject: SettingChangedSubject,
+                 view_provider: ProviderOf[HistoricalDataViewInterface],
+                 lane_executor: LaneExecutor,
                  ) -> None:
         _LOG.debug("init HistoricalDataPresenter ")
         self._settings_interactor = settings_interactor
+        self._history_repository = history_repository
+        self._setting_changed_subject = setting_changed_subject
         self.view: HistoricalDataViewInterface = HistoricalDataViewInterface()
+        # the dialog is only built when it's first shown
+        self._view_provider = view_provider
+        self._has_view = False
         self._gpu_index: int = 0
+        # the graphs have a column per GPU, all of them are recorded and the selected one is highlighted
+        self._gpu_count: int = 0
+        self._view_gpu_index: int = 0
+        self._uuids: List[Optional[str]] = []
+        self._history_loaded: bool = False
+        # While the dialog is hidden the graphs aren't touched, samples are only
+        #  buffered, and the graphs are brought up to date when it's shown.
+        self._visible: bool = False
+        self._reset_pending: bool = False
+        self._buffers: Dict[GraphType, SampleBuffer] = {}
+        # visible range of the graphs, the end is a monotonic time, or None to follow the latest samples
+        self._timespan: int = MONITORING_INTERVAL * USEC_PER_SEC
+        self._end_time: Optional[int] = None
+        # when to query a zoomed out range again, for the latest rollups
+        self._next_query: int = 0
+        # the pending reload of a changed range, 0 if there is none
+        self._range_reload_source: int = 0
+        # the history is read on the IO lane, only the result of the latest load is shown
+        self._io_scheduler = lane_executor.get_scheduler(Lane.IO)
+        self._load_generation: int = 0
+        self._loading: bool = False
+        # the max values of the snapshot until they're read from the driver
+        self._max_values: Optional[Tuple[int, Clocks]] = None
+        self._history_repository.set_retention(self._settings_interactor.get_int('settings_history_retention_days'))
+        self._register_db_listeners()
 
     def add_status(self, new_status: List[GpuStatus], gpu_index: int) -> None:
-        if self._gpu_index != gpu_index:
-            self._gpu_index = gpu_index
-            self.view.reset_graphs()
+        self._gpu_index = gpu_index
+        if len(new_status) != self._gpu_count:
+            # the first status, or GPUs were added or removed
+            self._gpu_count = len(new_status)
+            self._reset_pending = True
+            self._history_loaded = False
+            # a load in flight has the columns of the old GPUs
+            self._load_generation += 1
+            self._loading = False
+            max_samples = self.get_live_max_samples()
+            self._buffers = {graph_type: SampleBuffer(max_samples, self._gpu_count) for graph_type in GraphType}
+        self._uuids = [gpu_status.info.uuid for gpu_status in new_status]
+
+        data = self._get_graph_data(new_status)
+        if self._visible:
+            # the history is loaded before this sample is recorded
+            self._update_graphs()
+            if self._follows_samples() and self._loading:
+                # appended after the history that's being loaded
+                self.view.set_current_values(data)
+                for graph_type, (timestamp, values) in data.items():
+                    self._buffers[graph_type].append(timestamp, values)
+            elif self._follows_samples():
+                self.view.refresh_graphs(data)
+            else:
+                self.view.set_current_values(data)
+                if (self._end_time is None and not self._loading
+                        and GLib.get_monotonic_time() >= self._next_query):
+                    self._load_history()
+        elif self._follows_samples():
+            for graph_type, (timestamp, values) in data.items():
+                self._buffers[graph_type].append(timestamp, values)
+        else:
+            self._history_loaded = False
+        self._history_repository.append(new_status)
 
-        data: Dict[GraphType, Tuple[int, float]] = {}
+    def set_max_values(self, mem_total: int, max_clocks: Clocks) -> None:
+        self._max_values = (mem_total, max_clocks)
+        if self._has_view:
+            self.view.set_max_values(mem_total, max_clocks)
+
+    def on_graph_range_changed(self, timespan: int, end_time: Optional[int]) -> None:
+        """Zoom or pan the graphs to `timespan` usec up to `end_time`, 0 resets them"""
+        if timespan == 0:
+            timespan, end_time = MONITORING_INTERVAL * USEC_PER_SEC, None
+        max_timespan = self._settings_interactor.get_int('settings_history_retention_days') * USEC_PER_DAY
+        self._timespan = max(MIN_GRAPH_TIMESPAN * USEC_PER_SEC, min(timespan, max_timespan))
+        if end_time is not None and end_time >= GLib.get_monotonic_time():
+            end_time = None
+        self._end_time = end_time
+        self.view.set_graph_range(self._timespan, self._end_time)
+        if self._gpu_count > 0 and not self._range_reload_source:
+            self._range_reload_source = GLib.timeout_add(RANGE_RELOAD_DELAY_MS, self._on_range_reload)
+
+    def _on_range_reload(self) -> bool:
+        """Load the history of the range the graphs were last zoomed or panned to"""
+        self._range_reload_source = 0
+        if self._gpu_count > 0:
+            self._history_loaded = True
+            for buffer in self._buffers.values():
+                buffer.clear()
+            self._load_history()
+        return GLib.SOURCE_REMOVE
+
+    def _follows_samples(self) -> bool:
+        """Whether the graphs show the latest samples as they are, rather than a past or a zoomed out range"""
+        return self._end_time is None and self._timespan <= MONITORING_INTERVAL * USEC_PER_SEC
+
+    def _update_graphs(self) -> None:
+        """Apply what happened while the dialog was hidden, in one batch"""
+        if self._reset_pending:
+            self._reset_pending = False
+            self.view.reset_graphs(self._gpu_count)
+            self.view.set_graph_range(self._timespan, self._end_time)
+            self._view_gpu_index = 0
+        if not self._history_loaded and self._gpu_count > 0:
+            self._history_loaded = True
+            # the history has every buffered sample
+            for buffer in self._buffers.values():
+                buffer.clear()
+            self._load_history()
+        if not self._loading:
+            pending = {graph_type: buffer.drain() for graph_type, buffer in self._buffers.items() if len(buffer) > 0}
+            if pending:
+                self.view.extend_graphs(pending)
+        if self._view_gpu_index != self._gpu_index:
+            # switching GPUs only changes which column is highlighted
+            self._view_gpu_index = self._gpu_index
+            self.view.select_gpu(self._gpu_index)
+
+    def _get_graph_data(self, status_list: List[GpuStatus]) -> Dict[GraphType, Tuple[int, List[float]]]:
+        """The values of every GPU, NaN for the GPUs without one"""
         time = GLib.get_monotonic_time()
-        gpu_status = new_status[gpu_index]
+        gpu_values = [self._get_gpu_values(gpu_status) for gpu_status in status_list]
+        data: Dict[GraphType, Tuple[int, List[float]]] = {}
+        for graph_type in GraphType:
+            if any(graph_type in values for values in gpu_values):
+                data[graph_type] = (time, [values.get(graph_type, math.nan) for values in gpu_values])
+        return data
+
+    @staticmethod
+    def _get_gpu_values(gpu_status: GpuStatus) -> Dict[GraphType, float]:
+        data: Dict[GraphType, float] = {}
         gpu_clock = gpu_status.clocks.graphic_current
         if gpu_clock is not None:
-            data[GraphType.GPU_CLOCK] = (time, float(gpu_clock))
+            data[GraphType.GPU_CLOCK] = float(gpu_clock)
         mem_clock = gpu_status.clocks.memory_current
         if mem_clock is not None:
-            data[GraphType.MEMORY_CLOCK] = (time, float(mem_clock))
+            data[GraphType.MEMORY_CLOCK] = float(mem_clock)
         gpu_temp = gpu_status.temp.gpu
         if gpu_temp is not None:
-            data[GraphType.GPU_TEMP] = (time, float(gpu_temp))
+            data[GraphType.GPU_TEMP] = float(gpu_temp)
         if gpu_status.fan.fan_list:
             fan_duty = gpu_status.fan.fan_list[0][0]
-            data[GraphType.FAN_DUTY] = (time, float(fan_duty))
+            data[GraphType.FAN_DUTY] = float(fan_duty)
             fan_rpm = gpu_status.fan.fan_list[0][1]
-            data[GraphType.FAN_RPM] = (time, float(fan_rpm))
+            data[GraphType.FAN_RPM] = float(fan_rpm)
         gpu_load = gpu_status.info.gpu_usage
         if gpu_load is not None:
-            data[GraphType.GPU_LOAD] = (time, float(gpu_load))
+            data[GraphType.GPU_LOAD] = float(gpu_load)
         mem_load = gpu_status.info.memory_usage
         if mem_load is not None:
-            data[GraphType.MEMORY_LOAD] = (time, float(mem_load))
+            data[GraphType.MEMORY_LOAD] = float(mem_load)
         mem_usage = gpu_status.info.memory_used
         if mem_usage is not None:
-            data[GraphType.MEMORY_USAGE] = (time, float(mem_usage))
+            data[GraphType.MEMORY_USAGE] = float(mem_usage)
         power_draw = gpu_status.power.draw
         if power_draw is not None:
-            data[GraphType.POWER_DRAW] = (time, power_draw)
-        self.view.refresh_graphs(data)
+            data[GraphType.POWER_DRAW] = power_draw
+        return data
+
+    def _load_history(self) -> None:
+        """Fill the graphs with the recorded history of every GPU in the visible range.
+
+        The range is found by binary search in the history, and zoomed out ranges
+        are read from the rollup with about one row per refresh of the live graph.
+        The history is read on the IO lane, the samples arriving meanwhile are
+        buffered and appended once it's loaded.
+        """
+        now = time.time_ns() // 1000
+        # the history is recorded with the wall clock, the graphs use the monotonic clock
+        offset = GLib.get_monotonic_time() - now
+        end = now if self._end_time is None else self._end_time - offset
+        begin = end - self._timespan
+        # about one point per refresh, the rollups are used when that's coarser than the samples
+        max_points = self.get_live_max_samples()
+        # the samples appended next continue the history
+        flush = self._follows_samples()
+        if not flush:
+            self._next_query = now + offset + max(select_resolution(begin, end, max_points), USEC_PER_SEC)
+        uuids = list(self._uuids)
+        self._load_generation += 1
+        generation = self._load_generation
+        self._loading = True
+        reactivex.defer(lambda _: reactivex.just(self._read_history(uuids, begin, end, max_points, flush))).pipe(
+            operators.subscribe_on(self._io_scheduler),
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=lambda history: self._on_history_loaded(generation, offset, history),
+                    on_error=lambda e: (_LOG.exception(f"History error: {str(e)}"),
+                                        self._on_history_loaded(generation, offset, {})))
+
+    def _read_history(self,
+                      uuids: List[Optional[str]],
+                      begin: int,
+                      end: int,
+                      max_points: int,
+                      flush: bool) -> Dict[GraphType, Tuple[Sequence[int], List[Sequence[float]]]]:
+        if flush:
+            self._history_repository.flush()
+        history: Dict[GraphType, Tuple[Sequence[int], List[Sequence[float]]]] = {}
+        for graph_type, metric in GRAPH_METRICS.items():
+            # mapped, not copied: the graphs only read the last samples they show
+            series = [self._history_repository.map_metric(uuid, metric, begin, end, max_points)
+                      if uuid is not None else ([], [])
+                      for uuid in uuids]
+            history[graph_type] = align_series(series)
+        return history
+
+    def _on_history_loaded(self,
+                           generation: int,
+                           offset: int,
+                           history: Dict[GraphType, Tuple[Sequence[int], List[Sequence[float]]]]) -> None:
+        if generation != self._load_generation:
+            # replaced by a later load, or the GPUs changed
+            return
+        self._loading = False
+        for graph_type, (timestamps, columns) in history.items():
+            self.view.load_history(graph_type, OffsetSequence(timestamps, offset), columns)
+        pending = {graph_type: buffer.drain() for graph_type, buffer in self._buffers.items() if len(buffer) > 0}
+        if pending:
+            self.view.extend_graphs(pending)
 
     def show(self) -> None:
+        self._create_view()
+        self._visible = True
+        self._update_graphs()
         self.view.show()
 
-    @staticmethod
-    def on_dialog_delete_event(widget: Gtk.Widget, *_: Any) -> Any:
+    def _create_view(self) -> None:
+        """Build the dialog, it's reset and the samples buffered until now are replayed into it by `_update_graphs`"""
+        if not self._has_view:
+            self.view = self._view_provider.get()
+            self._has_view = True
+            if self._max_values is not None:
+                self.view.set_max_values(*self._max_values)
+
+    def on_dialog_delete_event(self, widget: Gtk.Widget, *_: Any) -> Any:
+        self._visible = False
         return hide_on_delete(widget)
 
     def get_refresh_interval(self) -> int:
         return self._settings_interactor.get_int('settings_refresh_interval')
+
+    def get_live_max_samples(self) -> int:
+        """Samples in the range the graphs show live"""
+        return MONITORING_INTERVAL // self.get_refresh_interval() + 1
+
+    def get_scroll_fps(self) -> int:
+        return self._settings_interactor.get_int('settings_graph_scroll_fps')
+
+    def _register_db_listeners(self) -> None:
+        self._setting_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_setting_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+
+    def _on_setting_list_changed(self, db_change: DbChange) -> None:
+        if db_change.entry.key == 'settings_history_retention_days':
+            self._history_repository.set_retention(int(db_change.entry.value))
+        elif db_change.entry.key == 'settings_graph_scroll_fps' and self._has_view:
+            self.view.set_scroll_fps(int(db_change.entry.value))
+        elif db_change.entry.key == 'settings_refresh_interval':
+            self._on_refresh_interval_changed()
+
+    def _on_refresh_interval_changed(self) -> None:
+        """Size the buffers and the graphs for the new interval, keeping the latest samples that fit"""
+        max_samples = self.get_live_max_samples()
+        for buffer in self._buffers.values():
+            buffer.resize(max_samples)
+        if not self._follows_samples():
+            # a past or zoomed out range has as many rows as it needs, it's read again with the new points
+            self._history_loaded = False
+        elif self._has_view:
+            self.view.resize_graphs(max_samples)
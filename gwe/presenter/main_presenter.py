@@ -17,20 +17,19 @@
 
 
 import logging
-import multiprocessing
-from typing import Optional, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, Any, List, Tuple
 
 import reactivex
 from gi.repository import GLib
 from injector import inject, singleton
-from packaging.version import Version
 from reactivex import Observable, operators
+from reactivex.abc import DisposableBase
 from reactivex.disposable import CompositeDisposable
-from reactivex.scheduler import ThreadPoolScheduler
 from reactivex.scheduler.mainloop import GtkScheduler
 
 from gwe.conf import APP_NAME, APP_SOURCE_URL, APP_VERSION, APP_ID
 from gwe.interactor.check_new_version_interactor import CheckNewVersionInteractor
+from gwe.interactor.get_max_values_interactor import GetMaxValuesInteractor
 from gwe.interactor.get_status_interactor import GetStatusInteractor
 from gwe.interactor.has_nvidia_driver_interactor import HasNvidiaDriverInteractor, HasNvidiaDriverResult
 from gwe.interactor.set_fan_speed_interactor import SetFanSpeedInteractor
@@ -39,6 +38,7 @@ from gwe.interactor.set_power_limit_iInteractor import SetPowerLimitInteractor
 from gwe.interactor.settings_interactor import SettingsInteractor
 from gwe.model.speed_step import SpeedStep
 from gwe.model.cb_change import DbChange
+from gwe.model.clocks import Clocks
 from gwe.model.current_fan_profile import CurrentFanProfile
 from gwe.model.current_overclock_profile import CurrentOverclockProfile
 from gwe.model.gpu_status import GpuStatus
@@ -52,9 +52,16 @@ from gwe.presenter.edit_fan_profile_presenter import EditFanProfilePresenter
 from gwe.presenter.edit_overclock_profile_presenter import EditOverclockProfilePresenter
 from gwe.presenter.historical_data_presenter import HistoricalDataPresenter
 from gwe.presenter.preferences_presenter import PreferencesPresenter
+from gwe.repository.database_worker import DatabaseWorker
+from gwe.repository.profile_repository import ProfileRepository
+from gwe.repository.snapshot_repository import SnapshotRepository
 from gwe.util.deployment import is_flatpak
+from gwe.util.executor import Lane, LaneExecutor
 from gwe.util.view import show_notification, open_uri, get_default_application
 
+if TYPE_CHECKING:
+    from packaging.version import Version
+
 _LOG = logging.getLogger(__name__)
 _ADD_NEW_PROFILE_INDEX = -10
 
@@ -66,13 +73,16 @@ class MainViewInterface:
     def refresh_status(self, status: Optional[List[GpuStatus]], gpu_index: int) -> None:
         raise NotImplementedError()
 
+    def refresh_cached_status(self, status: List[GpuStatus], gpu_index: int) -> None:
+        raise NotImplementedError()
+
     def refresh_fan_profile_combobox(self, data: List[Tuple[int, str]], active: Optional[int]) -> None:
         raise NotImplementedError()
 
     def refresh_overclock_profile_combobox(self, data: List[Tuple[int, str]], active: Optional[int]) -> None:
         raise NotImplementedError()
 
-    def refresh_chart(self, profile: Optional[FanProfile] = None, reset: bool = False) -> None:
+    def refresh_chart(self, steps: Optional[List[SpeedStep]] = None, reset: bool = False) -> None:
         raise NotImplementedError()
 
     def set_apply_fan_profile_button_enabled(self, enabled: bool) -> None:
@@ -113,16 +123,21 @@ class MainPresenter:
                  preferences_presenter: PreferencesPresenter,
                  has_nvidia_driver_interactor: HasNvidiaDriverInteractor,
                  get_status_interactor: GetStatusInteractor,
+                 get_max_values_interactor: GetMaxValuesInteractor,
                  set_power_limit_interactor: SetPowerLimitInteractor,
                  set_overclock_interactor: SetOverclockInteractor,
                  set_fan_speed_interactor: SetFanSpeedInteractor,
                  settings_interactor: SettingsInteractor,
                  check_new_version_interactor: CheckNewVersionInteractor,
+                 profile_repository: ProfileRepository,
+                 snapshot_repository: SnapshotRepository,
+                 database_worker: DatabaseWorker,
                  speed_step_changed_subject: SpeedStepChangedSubject,
                  fan_profile_changed_subject: FanProfileChangedSubject,
                  overclock_profile_changed_subject: OverclockProfileChangedSubject,
                  setting_changed_subject: SettingChangedSubject,
                  composite_disposable: CompositeDisposable,
+                 lane_executor: LaneExecutor,
                  ) -> None:
         _LOG.debug("init MainPresenter ")
         self.main_view: MainViewInterface = MainViewInterface()
@@ -130,14 +145,20 @@ class MainPresenter:
         self._edit_overclock_profile_presenter = edit_overclock_profile_presenter
         self._historical_data_presenter = historical_data_presenter
         self._preferences_presenter = preferences_presenter
-        self._scheduler = ThreadPoolScheduler(multiprocessing.cpu_count())
+        self._sampling_scheduler = lane_executor.get_scheduler(Lane.SAMPLING)
+        self._device_writes_scheduler = lane_executor.get_scheduler(Lane.DEVICE_WRITES)
+        self._network_scheduler = lane_executor.get_scheduler(Lane.NETWORK)
         self._has_nvidia_driver_interactor = has_nvidia_driver_interactor
         self._get_status_interactor: GetStatusInteractor = get_status_interactor
+        self._get_max_values_interactor = get_max_values_interactor
         self._set_power_limit_interactor = set_power_limit_interactor
         self._set_overclock_interactor = set_overclock_interactor
         self._settings_interactor = settings_interactor
         self._check_new_version_interactor = check_new_version_interactor
         self._set_fan_speed_interactor = set_fan_speed_interactor
+        self._profile_repository = profile_repository
+        self._snapshot_repository = snapshot_repository
+        self._database_worker = database_worker
         self._speed_step_changed_subject = speed_step_changed_subject
         self._fan_profile_changed_subject = fan_profile_changed_subject
         self._overclock_profile_changed_subject = overclock_profile_changed_subject
@@ -150,13 +171,17 @@ class MainPresenter:
         self._latest_status: Optional[List[GpuStatus]] = None
         self._latest_update_temp: Optional[int] = None
         self._gpu_index: int = 0
+        # the status polling, restarted when the refresh interval changes
+        self._refresh_disposable: Optional[DisposableBase] = None
 
     def on_start(self) -> None:
         self._refresh_fan_profile_ui(True)
+        self._show_snapshot()
         self._register_db_listeners()
         self._check_nvidia_driver()
         if self._settings_interactor.get_int('settings_check_new_version'):
-            self._check_new_version()
+            # after the window is drawn
+            GLib.idle_add(self._check_new_version, priority=GLib.PRIORITY_LOW)
 
     def on_application_window_delete_event(self, *_: Any) -> bool:
         if self._settings_interactor.get_int('settings_minimize_to_tray'):
@@ -169,7 +194,7 @@ class MainPresenter:
 
     def on_power_limit_apply_button_clicked(self, *_: Any) -> None:
         self._composite_disposable.add(self._set_power_limit_interactor.execute(*self.main_view.get_power_limit()).pipe(
-            operators.subscribe_on(self._scheduler),
+            operators.subscribe_on(self._device_writes_scheduler),
             operators.observe_on(GtkScheduler(GLib)),
         ).subscribe(on_next=self._handle_set_power_limit_result,
                     on_error=self._handle_set_power_limit_result))
@@ -208,7 +233,7 @@ class MainPresenter:
                 self._latest_status[self._gpu_index].overclock.perf_level_max,
                 self._overclock_profile_applied.gpu,
                 self._overclock_profile_applied.memory).pipe(
-                operators.subscribe_on(self._scheduler),
+                operators.subscribe_on(self._device_writes_scheduler),
                 operators.observe_on(GtkScheduler(GLib)),
             ).subscribe(on_next=self._handle_set_overclock_result,
                         on_error=self._handle_set_overclock_result))
@@ -241,9 +266,17 @@ class MainPresenter:
     def on_toggle_app_window_clicked(self, *_: Any) -> None:
         self.main_view.toggle_window_visibility()
 
+    def _show_snapshot(self) -> None:
+        """Show the last known state until the driver is read"""
+        snapshot = self._snapshot_repository.load()
+        if snapshot.status:
+            self.main_view.refresh_cached_status(snapshot.status, self._gpu_index)
+        if snapshot.mem_total is not None and snapshot.max_clocks is not None:
+            self._historical_data_presenter.set_max_values(snapshot.mem_total, snapshot.max_clocks)
+
     def _check_nvidia_driver(self) -> None:
         self._composite_disposable.add(self._has_nvidia_driver_interactor.execute().pipe(
-            operators.subscribe_on(self._scheduler),
+            operators.subscribe_on(self._sampling_scheduler),
             operators.observe_on(GtkScheduler(GLib)),
         ).subscribe(on_next=self._handle_has_nvidia_driver_result))
 
@@ -271,20 +304,28 @@ class MainPresenter:
             self._start_refresh()
 
     def _register_db_listeners(self) -> None:
-        self._speed_step_changed_subject.subscribe(on_next=self._on_speed_step_list_changed,
-                                                   on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
-        self._fan_profile_changed_subject.subscribe(on_next=self._on_fan_profile_list_changed,
-                                                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
-        self._overclock_profile_changed_subject.subscribe(on_next=self._on_overclock_profile_list_changed,
-                                                          on_error=lambda e: _LOG.exception(
-                                                              f"Db signal error: {str(e)}"))
-        self._setting_changed_subject.subscribe(on_next=self._on_setting_list_changed,
-                                                on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        # the changes are saved by the database worker
+        self._speed_step_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_speed_step_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        self._fan_profile_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_fan_profile_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        self._overclock_profile_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_overclock_profile_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        self._setting_changed_subject.pipe(
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_setting_list_changed,
+                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
 
     def _on_speed_step_list_changed(self, db_change: DbChange) -> None:
-        profile: SpeedStep = db_change.entry.profile
-        if self._fan_profile_selected and self._fan_profile_selected.id == profile.id:
-            self.main_view.refresh_chart(profile)
+        profile_id = db_change.entry.profile_id
+        if self._fan_profile_selected and self._fan_profile_selected.id == profile_id:
+            self.main_view.refresh_chart(self._profile_repository.get_speed_steps(profile_id))
 
     def _on_fan_profile_list_changed(self, db_change: DbChange) -> None:
         profile: FanProfile = db_change.entry
@@ -293,6 +334,8 @@ class MainPresenter:
             self._fan_profile_selected = None
             self._fan_profile_applied = None
         elif db_change.type == DbChange.INSERT or db_change.type == DbChange.UPDATE:
+            if self._fan_profile_applied is not None and self._fan_profile_applied.id == profile.id:
+                self._fan_profile_applied = profile
             self._refresh_fan_profile_ui(profile_id=profile.id)
 
     def _on_overclock_profile_list_changed(self, db_change: DbChange) -> None:
@@ -302,22 +345,35 @@ class MainPresenter:
             self._overclock_profile_selected = None
             self._overclock_profile_applied = None
         elif db_change.type == DbChange.INSERT or db_change.type == DbChange.UPDATE:
+            if self._overclock_profile_applied is not None and self._overclock_profile_applied.id == profile.id:
+                self._overclock_profile_applied = profile
             self._refresh_overclock_profile_ui(profile_id=profile.id)
 
     def _on_setting_list_changed(self, db_change: DbChange) -> None:
         if db_change.entry.key == 'settings_hysteresis' and self._fan_profile_applied:
-            self.main_view.refresh_chart(self._fan_profile_applied)
+            self.main_view.refresh_chart(self._profile_repository.get_speed_steps(self._fan_profile_applied.id))
+        elif db_change.entry.key == 'settings_refresh_interval':
+            self._restart_refresh()
 
-    def _start_refresh(self) -> None:
+    def _start_refresh(self, immediately: bool = True) -> None:
         _LOG.debug("start refresh")
         refresh_interval = self._settings_interactor.get_int('settings_refresh_interval')
-        self._composite_disposable.add(reactivex.interval(refresh_interval, scheduler=self._scheduler).pipe(
-            operators.start_with(0),
-            operators.subscribe_on(self._scheduler),
+        ticks = reactivex.interval(refresh_interval, scheduler=self._sampling_scheduler)
+        if immediately:
+            ticks = ticks.pipe(operators.start_with(0))
+        self._refresh_disposable = ticks.pipe(
+            operators.subscribe_on(self._sampling_scheduler),
             operators.flat_map(lambda _: self._get_status()),
             operators.observe_on(GtkScheduler(GLib)),
         ).subscribe(on_next=self._on_status_updated,
-                    on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}")))
+                    on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}"))
+        self._composite_disposable.add(self._refresh_disposable)
+
+    def _restart_refresh(self) -> None:
+        """Poll with the new refresh interval, the first time one interval after the change"""
+        if self._refresh_disposable is not None:
+            self._composite_disposable.remove(self._refresh_disposable)
+            self._start_refresh(immediately=False)
 
     def _on_status_updated(self, status: Optional[List[GpuStatus]]) -> None:
         if status is not None:
@@ -325,28 +381,45 @@ class MainPresenter:
             self._latest_status = status
             if was_latest_status_none:
                 self._refresh_overclock_profile_ui(True)
+                self._refresh_max_values()
+            self._snapshot_repository.set_status(status)
             self._update_fan()
             self.main_view.refresh_status(status, self._gpu_index)
             self._historical_data_presenter.add_status(status, self._gpu_index)
         else:
             self._set_fan_speed(self._gpu_index, manual_control=False)
 
+    def _refresh_max_values(self) -> None:
+        """Read the max values in the background, the snapshot's are used meanwhile"""
+        self._composite_disposable.add(self._get_max_values_interactor.execute().pipe(
+            operators.subscribe_on(self._sampling_scheduler),
+            operators.observe_on(GtkScheduler(GLib)),
+        ).subscribe(on_next=self._on_max_values_updated,
+                    on_error=lambda e: _LOG.exception(f"Max values error: {str(e)}")))
+
+    def _on_max_values_updated(self, max_values: Tuple[int, Clocks]) -> None:
+        mem_total, max_clocks = max_values
+        self._snapshot_repository.set_max_values(mem_total, max_clocks)
+        self._historical_data_presenter.set_max_values(mem_total, max_clocks)
+
     def _update_fan(self) -> None:
         fan = self._latest_status[self._gpu_index].fan
         if fan.control_allowed:
             if self._fan_profile_selected is None and not fan.manual_control:
-                fan_profile = FanProfile.get(FanProfile.type == FanProfileType.AUTO.value)
+                fan_profile = self._profile_repository.get_auto_fan_profile()
+                assert fan_profile is not None
                 self._fan_profile_applied = fan_profile
                 self._refresh_fan_profile_ui(profile_id=fan_profile.id)
             elif self._fan_profile_applied and self._fan_profile_applied.type != FanProfileType.AUTO.value:
                 gpu_status = self._latest_status[self._gpu_index]
-                if not self._fan_profile_applied.steps:
+                steps = self._profile_repository.get_speed_steps(self._fan_profile_applied.id)
+                if not steps:
                     self._set_fan_speed(gpu_status.index, manual_control=False)
                 elif gpu_status.temp.gpu:
                     try:
-                        speed = round(self._get_fan_duty(self._fan_profile_applied, gpu_status.temp.gpu))
+                        speed = round(self._get_fan_duty(steps, gpu_status.temp.gpu))
                         if self._fan_profile_applied.vbios_silent_mode and \
-                                gpu_status.temp.gpu < self._fan_profile_applied.steps[0].temperature:
+                                gpu_status.temp.gpu < steps[0].temperature:
                             self._set_fan_speed(gpu_status.index, manual_control=False)
                         elif self._should_update_fan_duty(speed):
                             self._set_fan_speed(gpu_status.index, round(speed))
@@ -372,9 +445,9 @@ class MainPresenter:
         return True
 
     @staticmethod
-    def _get_fan_duty(profile: FanProfile, gpu_temperature: float) -> float:
-        p_1 = ([(i.temperature, i.duty) for i in profile.steps if i.temperature <= gpu_temperature] or [None])[-1]
-        p_2 = next(((i.temperature, i.duty) for i in profile.steps if i.temperature > gpu_temperature), None)
+    def _get_fan_duty(steps: List[SpeedStep], gpu_temperature: float) -> float:
+        p_1 = ([(i.temperature, i.duty) for i in steps if i.temperature <= gpu_temperature] or [None])[-1]
+        p_2 = next(((i.temperature, i.duty) for i in steps if i.temperature > gpu_temperature), None)
         duty = 0.0
         if p_1 and p_2:
             duty = ((p_2[1] - p_1[1]) / (p_2[0] - p_1[0])) * (gpu_temperature - p_1[0]) + p_1[1]
@@ -389,9 +462,9 @@ class MainPresenter:
         if init and self._settings_interactor.get_bool('settings_load_last_profile'):
             current = CurrentFanProfile.get_or_none()
             if current is not None:
-                self._fan_profile_applied = current.profile
+                self._fan_profile_applied = self._profile_repository.get_fan_profile(current.profile_id)
         data: List[Tuple[int, str]] = []
-        for fan_profile in FanProfile.select():
+        for fan_profile in self._profile_repository.get_fan_profiles():
             if self._fan_profile_applied is not None and self._fan_profile_applied.id == fan_profile.id:
                 name = f"<b>{fan_profile.name}</b>"
             else:
@@ -401,7 +474,7 @@ class MainPresenter:
         if profile_id is not None:
             active = next(i for i, item in enumerate(data) if item[0] == profile_id)
         elif current is not None:
-            active = next(i for i, item in enumerate(data) if item[0] == current.profile.id)
+            active = next(i for i, item in enumerate(data) if item[0] == current.profile_id)
         data.append((_ADD_NEW_PROFILE_INDEX, "<span style='italic' alpha='50%'>Add new profile...</span>"))
         self.main_view.refresh_fan_profile_combobox(data, active)
 
@@ -412,30 +485,26 @@ class MainPresenter:
             self.main_view.refresh_chart(reset=True)
             self._edit_fan_profile_presenter.show_add()
         else:
-            profile: FanProfile = FanProfile.get(id=profile_id)
+            profile = self._profile_repository.get_fan_profile(profile_id)
+            assert profile is not None
             self._fan_profile_selected = profile
             if profile.read_only:
                 self.main_view.set_edit_fan_profile_button_enabled(False)
             else:
                 self.main_view.set_edit_fan_profile_button_enabled(True)
             self.main_view.set_apply_fan_profile_button_enabled(True)
-            self.main_view.refresh_chart(profile)
+            self.main_view.refresh_chart(self._profile_repository.get_speed_steps(profile_id))
 
     def _set_fan_speed(self, gpu_index: int, speed: int = 100, manual_control: bool = True) -> None:
         _LOG.debug(f"Setting fan speed to {speed}")
         self._composite_disposable.add(self._set_fan_speed_interactor.execute(gpu_index, speed, manual_control).pipe(
-            operators.subscribe_on(self._scheduler),
+            operators.subscribe_on(self._device_writes_scheduler),
             operators.observe_on(GtkScheduler(GLib)),
         ).subscribe(on_error=lambda e: (_LOG.exception(f"Set cooling error: {str(e)}"),
                                         self.main_view.set_statusbar_text('Error applying fan profile!'))))
 
     def _update_current_fan_profile(self, profile: FanProfile) -> None:
-        current: CurrentFanProfile = CurrentFanProfile.get_or_none()
-        if current is None:
-            CurrentFanProfile.create(profile=profile)
-        else:
-            current.profile = profile
-            current.save()
+        self._database_worker.submit(lambda: _save_current_profile(CurrentFanProfile, profile))
         self.main_view.set_statusbar_text(f'{profile.name} fan profile selected')
 
     def _refresh_overclock_profile_ui(self, init: bool = False, profile_id: Optional[int] = None) -> None:
@@ -445,10 +514,10 @@ class MainPresenter:
                 and self._latest_status[self._gpu_index].overclock.available:
             current = CurrentOverclockProfile.get_or_none()
             if current is not None:
-                self._overclock_profile_selected = current.profile
+                self._overclock_profile_selected = self._profile_repository.get_overclock_profile(current.profile_id)
                 self.on_overclock_apply_button_clicked()
         data: List[Tuple[int, str]] = []
-        for overclock_profile in OverclockProfile.select():
+        for overclock_profile in self._profile_repository.get_overclock_profiles():
             name_with_freqs = "{} ({}, {})".format(overclock_profile.name,
                                                    overclock_profile.gpu,
                                                    overclock_profile.memory)
@@ -462,7 +531,7 @@ class MainPresenter:
         if profile_id is not None:
             active = next(i for i, item in enumerate(data) if item[0] == profile_id)
         elif current is not None:
-            active = next(i for i, item in enumerate(data) if item[0] == current.profile.id)
+            active = next(i for i, item in enumerate(data) if item[0] == current.profile_id)
         data.append((_ADD_NEW_PROFILE_INDEX, "<span style='italic' alpha='50%'>Add new profile...</span>"))
         self.main_view.refresh_overclock_profile_combobox(data, active)
 
@@ -474,7 +543,8 @@ class MainPresenter:
             self._edit_overclock_profile_presenter.show_add(
                 self._latest_status[self._gpu_index].overclock, self._gpu_index)
         else:
-            profile: OverclockProfile = OverclockProfile.get(id=profile_id)
+            profile = self._profile_repository.get_overclock_profile(profile_id)
+            assert profile is not None
             self._overclock_profile_selected = profile
             if profile.read_only:
                 self.main_view.set_edit_overclock_profile_button_enabled(False)
@@ -483,12 +553,7 @@ class MainPresenter:
             self.main_view.set_apply_overclock_profile_button_enabled(True)
 
     def _update_current_overclock_profile(self, profile: OverclockProfile) -> None:
-        current: CurrentOverclockProfile = CurrentOverclockProfile.get_or_none()
-        if current is None:
-            CurrentOverclockProfile.create(profile=profile)
-        else:
-            current.profile = profile
-            current.save()
+        self._database_worker.submit(lambda: _save_current_profile(CurrentOverclockProfile, profile))
         self.main_view.set_statusbar_text(f'{profile.name} overclock profile selected')
 
     def _log_exception_return_empty_observable(self, ex: Exception, _: Observable) -> Observable:
@@ -505,12 +570,13 @@ class MainPresenter:
         assert isinstance(observable, Observable)
         return observable
 
-    def _check_new_version(self) -> None:
+    def _check_new_version(self) -> bool:
         self._composite_disposable.add(self._check_new_version_interactor.execute().pipe(
-            operators.subscribe_on(self._scheduler),
+            operators.subscribe_on(self._network_scheduler),
             operators.observe_on(GtkScheduler(GLib)),
         ).subscribe(on_next=self._handle_new_version_response,
                     on_error=lambda e: _LOG.exception(f"Check new version error: {str(e)}")))
+        return GLib.SOURCE_REMOVE
 
     def _handle_set_power_limit_result(self, result: Any) -> None:
         self._handle_generic_set_result(result, "power limit")
@@ -530,7 +596,7 @@ class MainPresenter:
         self.main_view.set_statusbar_text(f'{name.capitalize()} applied')
         return True
 
-    def _handle_new_version_response(self, version: Optional[Version]) -> None:
+    def _handle_new_version_response(self, version: 'Optional[Version]') -> None:
         if version is not None:
             message = f"{APP_NAME} version <b>{version}</b> is available! " \
                       f"Click <a href=\"{self._get_changelog_uri(version)}\"><b>here</b></a> to see what's new."
@@ -542,3 +608,13 @@ class MainPresenter:
     @staticmethod
     def _get_changelog_uri(version: str = APP_VERSION) -> str:
         return f"{APP_SOURCE_URL}/blob/{version}/CHANGELOG.md"
+
+
+def _save_current_profile(model: Any, profile: Any) -> None:
+    """Point the single row of CurrentFanProfile or CurrentOverclockProfile to `profile`"""
+    current = model.get_or_none()
+    if current is None:
+        model.create(profile=profile)
+    else:
+        current.profile = profile
+        current.save()
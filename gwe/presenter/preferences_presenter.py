@@ -19,7 +19,7 @@ import re
 from typing import Any, Dict
 
 from gi.repository import Gtk
-from injector import singleton, inject
+from injector import ProviderOf, singleton, inject
 
 from gwe.conf import SETTINGS_DEFAULTS
 from gwe.interactor.settings_interactor import SettingsInteractor
@@ -45,15 +45,25 @@ class PreferencesPresenter:
     @inject
     def __init__(self,
                  settings_interactor: SettingsInteractor,
+                 view_provider: ProviderOf[PreferencesViewInterface],
                  ) -> None:
         _LOG.debug("init PreferencesPresenter ")
         self.view: PreferencesViewInterface = PreferencesViewInterface()
+        # the dialog is only built when it's first shown
+        self._view_provider = view_provider
+        self._has_view = False
         self._settings_interactor = settings_interactor
 
     def show(self) -> None:
+        self._create_view()
         self._init_settings()
         self.view.show()
 
+    def _create_view(self) -> None:
+        if not self._has_view:
+            self.view = self._view_provider.get()
+            self._has_view = True
+
     def _init_settings(self) -> None:
         settings: Dict[str, Any] = {}
         for key, default_value in SETTINGS_DEFAULTS.items():
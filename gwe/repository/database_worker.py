@@ -0,0 +1,117 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from injector import singleton, inject
+from peewee import SqliteDatabase
+from reactivex import Observable
+from reactivex.subject import AsyncSubject
+
+_LOG = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_Request = Tuple[Callable[[], Any], AsyncSubject]
+
+
+@singleton
+class DatabaseWorker:
+    """Runs the queries writing to the settings and profiles database on a thread of its own.
+
+    The worker runs everything queued since its last batch in one transaction, with
+    a savepoint for each request, so a failing request doesn't roll back the others.
+    The model signals, and so the change subjects, are emitted on the worker thread.
+    """
+
+    @inject
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._database = database
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, request: Callable[[], T]) -> Observable:
+        """Queue `request` and return an Observable of its result, emitted on the worker thread.
+
+        Observe it with `operators.observe_on(GtkScheduler(GLib))` to use the result in the UI.
+        """
+        subject: AsyncSubject = AsyncSubject()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Database worker is closed")
+            self._queue.put((request, subject))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='DatabaseWorker', daemon=True)
+                self._worker.start()
+        return subject
+
+    def flush(self) -> None:
+        """Wait until every request queued so far is committed"""
+        done = threading.Event()
+        self.submit(lambda: None).subscribe(on_completed=done.set, on_error=lambda _: done.set())
+        done.wait()
+
+    def close(self) -> None:
+        """Commit the queued requests and stop the worker"""
+        with self._lock:
+            self._closed = True
+            worker = self._worker
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch: List[_Request] = []
+            request = self._queue.get()
+            while request is not None:
+                batch.append(request)
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stop = request is None
+            if batch:
+                self._run_batch(batch)
+        self._database.close()
+
+    def _run_batch(self, batch: List[_Request]) -> None:
+        results: List[Tuple[AsyncSubject, Any, Optional[Exception]]] = []
+        try:
+            with self._database.atomic():
+                for request, subject in batch:
+                    try:
+                        with self._database.atomic():
+                            results.append((subject, request(), None))
+                    except Exception as ex:  # pylint: disable=broad-except
+                        _LOG.exception("Database request failed")
+                        results.append((subject, None, ex))
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOG.exception("Database commit failed")
+            results = [(subject, None, ex) for _, subject in batch]
+        # only once committed, so the results are visible to the other connections
+        for subject, result, error in results:
+            if error is not None:
+                subject.on_error(error)
+            else:
+                subject.on_next(result)
+                subject.on_completed()
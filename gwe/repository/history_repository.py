@@ -0,0 +1,478 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import bisect
+import logging
+import math
+import os
+import queue
+import shutil
+import struct
+import threading
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from injector import singleton, inject
+
+from gwe.conf import APP_HISTORY_DIR_NAME, SETTINGS_DEFAULTS
+from gwe.model.gpu_status import GpuStatus
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric, get_history_values
+from gwe.model.sys_paths import SysPaths
+from gwe.repository.history_rollup import RollupSeries, RollupWriter, expire_rollups, map_rollup, \
+    select_resolution
+from gwe.util.column_file import append_column, column_length, map_column
+from gwe.util.gorilla import decode_timestamps, decode_values, encode_timestamps, encode_values
+from gwe.util.sequence import chain_sequences
+
+_LOG = logging.getLogger(__name__)
+
+USEC_PER_MSEC = 1000
+USEC_PER_SEC = 1000000
+USEC_PER_DAY = 24 * 60 * 60 * USEC_PER_SEC
+MAX_TIMESTAMP = 2 ** 63 - 1
+
+# Each segment holds one hour of samples of a single GPU. The raw segment is a
+#  directory with one file per column of fixed width values in native byte order,
+#  so it can be memory mapped and handed to the graphs without copying.
+SEGMENT_USEC = 60 * 60 * USEC_PER_SEC
+_TIMESTAMP_COLUMN = 'timestamp'
+_COLUMN_SUFFIX = '.col'
+_HEADER = struct.Struct('<4sHH')
+
+# Sealed segments are compacted into blocks of Gorilla compressed samples. Timestamps
+#  are stored with millisecond precision, so that the jitter of the sampling interval
+#  still encodes in a few bits.
+BLOCK_SAMPLES = 1024
+_COMPRESSED_SUFFIX = '.gor'
+_COMPRESSED_MAGIC = b'GWEC'
+_COMPRESSED_VERSION = 1
+_BLOCK_INDEX_ENTRY = struct.Struct('<qqQI')  # first timestamp, last timestamp, offset, sample count
+_BLOCK_FOOTER = struct.Struct('<QI')  # index offset, block count
+_STREAM_LENGTH = struct.Struct('<I')
+
+# The writer wakes up this often to write everything queued since the last batch
+_FLUSH_INTERVAL_SEC = 10.0
+_COMPACTION_INTERVAL_USEC = 60 * 60 * USEC_PER_SEC
+# Raw segments stay mapped for this long before they are compressed
+RAW_RETENTION_USEC = USEC_PER_DAY
+
+HistoryRow = Tuple[int, List[float]]
+
+
+def _read_header(file: BinaryIO, magic: bytes, version: int) -> int:
+    """Returns the number of metrics stored in `file`"""
+    file_magic, file_version, metric_count = _HEADER.unpack(file.read(_HEADER.size))
+    if file_magic != magic or file_version != version:
+        raise ValueError(f"Invalid history segment {file.name}")
+    return int(metric_count)
+
+
+def _column_file_name(column: str) -> str:
+    return f"{column}{_COLUMN_SUFFIX}"
+
+
+class _MappedSegment:
+    """A read-only, memory mapped view of one raw segment directory.
+
+    Only the samples written when the segment was opened are visible. Values are
+    read straight from the page cache, and the time index inside a segment is a
+    binary search over the mapped timestamps.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        timestamps = map_column(directory / _column_file_name(_TIMESTAMP_COLUMN), 'q')
+        if timestamps is None:
+            raise FileNotFoundError(directory)
+        columns = [map_column(directory / _column_file_name(m.value), 'd') for m in HISTORY_METRICS]
+        # ignore trailing values of an interrupted write
+        self.count = min([len(timestamps)] + [len(c) for c in columns if c is not None])
+        self._timestamps = timestamps[:self.count]
+        self._columns = [c[:self.count] if c is not None else None for c in columns]
+
+    def _range(self, begin: int, end: int) -> Tuple[int, int]:
+        return bisect.bisect_left(self._timestamps, begin), bisect.bisect_right(self._timestamps, end)
+
+    def _column(self, column: int, first: int, last: int) -> Sequence[float]:
+        values = self._columns[column]
+        if values is None:
+            return array('d', [math.nan]) * (last - first)
+        return values[first:last]
+
+    def read(self, begin: int, end: int) -> Iterator[HistoryRow]:
+        first, last = self._range(begin, end)
+        for index in range(first, last):
+            yield self._timestamps[index], [math.nan if c is None else c[index] for c in self._columns]
+
+    def read_column(self, column: int, begin: int, end: int) -> Iterator[Tuple[int, float]]:
+        first, last = self._range(begin, end)
+        yield from zip(self._timestamps[first:last], self._column(column, first, last))
+
+    def map_column(self, column: int, begin: int, end: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """Zero copy views of the timestamps and values of `column` with `begin <= timestamp <= end`"""
+        first, last = self._range(begin, end)
+        return self._timestamps[first:last], self._column(column, first, last)
+
+
+class _CompressedSegment:
+    """A read-only view of a compacted segment.
+
+    The block index at the end of the file is the time index: a binary search over
+    the last timestamp of each block finds the first block to decode. Each metric is
+    its own stream inside a block, so reading one metric skips the others.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._metric_count = _read_header(file, _COMPRESSED_MAGIC, _COMPRESSED_VERSION)
+        file.seek(-_BLOCK_FOOTER.size, os.SEEK_END)
+        index_offset, block_count = _BLOCK_FOOTER.unpack(file.read(_BLOCK_FOOTER.size))
+        file.seek(index_offset)
+        self._index = list(_BLOCK_INDEX_ENTRY.iter_unpack(file.read(block_count * _BLOCK_INDEX_ENTRY.size)))
+        self._last_timestamps = [entry[1] for entry in self._index]
+
+    def _blocks(self, begin: int, end: int) -> Iterator[Tuple[int, int]]:
+        for first, _last, offset, count in self._index[bisect.bisect_left(self._last_timestamps, begin):]:
+            if first > end:
+                return
+            yield offset, count
+
+    def _read_stream(self) -> bytes:
+        length, = _STREAM_LENGTH.unpack(self._file.read(_STREAM_LENGTH.size))
+        return self._file.read(length)
+
+    def _skip_streams(self, streams: int) -> None:
+        for _ in range(streams):
+            length, = _STREAM_LENGTH.unpack(self._file.read(_STREAM_LENGTH.size))
+            self._file.seek(length, os.SEEK_CUR)
+
+    def read(self, begin: int, end: int) -> Iterator[HistoryRow]:
+        padding = [math.nan] * max(0, len(HISTORY_METRICS) - self._metric_count)
+        for offset, count in self._blocks(begin, end):
+            self._file.seek(offset)
+            timestamps = decode_timestamps(self._read_stream(), count)
+            columns = [decode_values(self._read_stream(), count) for _ in range(self._metric_count)]
+            for i, timestamp_ms in enumerate(timestamps):
+                timestamp = timestamp_ms * USEC_PER_MSEC
+                if timestamp > end:
+                    return
+                if timestamp >= begin:
+                    yield timestamp, [c[i] for c in columns[:len(HISTORY_METRICS)]] + padding
+
+    def read_column(self, column: int, begin: int, end: int) -> Iterator[Tuple[int, float]]:
+        for offset, count in self._blocks(begin, end):
+            self._file.seek(offset)
+            timestamps = decode_timestamps(self._read_stream(), count)
+            if column >= self._metric_count:
+                values = [math.nan] * count
+            else:
+                self._skip_streams(column)
+                values = decode_values(self._read_stream(), count)
+            for timestamp_ms, value in zip(timestamps, values):
+                timestamp = timestamp_ms * USEC_PER_MSEC
+                if timestamp > end:
+                    return
+                if timestamp >= begin:
+                    yield timestamp, value
+
+    def map_column(self, column: int, begin: int, end: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """Decode the timestamps and values of `column` with `begin <= timestamp <= end`"""
+        timestamps = array('q')
+        values = array('d')
+        for timestamp, value in self.read_column(column, begin, end):
+            timestamps.append(timestamp)
+            values.append(value)
+        return timestamps, values
+
+
+def write_compressed_segment(file: BinaryIO, rows: Iterable[HistoryRow]) -> int:
+    """Write `rows` to `file` as blocks of `BLOCK_SAMPLES` compressed samples, followed by the block index.
+
+    Returns:
+        int: the number of samples written
+    """
+    file.write(_HEADER.pack(_COMPRESSED_MAGIC, _COMPRESSED_VERSION, len(HISTORY_METRICS)))
+    index: List[bytes] = []
+    total = 0
+
+    def write_block(timestamps: List[int], columns: List[List[float]]) -> None:
+        offset = file.tell()
+        for stream in [encode_timestamps(timestamps)] + [encode_values(c) for c in columns]:
+            file.write(_STREAM_LENGTH.pack(len(stream)))
+            file.write(stream)
+        index.append(_BLOCK_INDEX_ENTRY.pack(timestamps[0] * USEC_PER_MSEC,
+                                             timestamps[-1] * USEC_PER_MSEC,
+                                             offset,
+                                             len(timestamps)))
+
+    timestamps: List[int] = []
+    columns: List[List[float]] = [[] for _ in HISTORY_METRICS]
+    for timestamp, values in rows:
+        timestamps.append(timestamp // USEC_PER_MSEC)
+        for column, value in zip(columns, values):
+            column.append(value)
+        if len(timestamps) == BLOCK_SAMPLES:
+            write_block(timestamps, columns)
+            total += len(timestamps)
+            timestamps = []
+            columns = [[] for _ in HISTORY_METRICS]
+    if timestamps:
+        write_block(timestamps, columns)
+        total += len(timestamps)
+
+    index_offset = file.tell()
+    file.write(b''.join(index))
+    file.write(_BLOCK_FOOTER.pack(index_offset, len(index)))
+    return total
+
+
+_Segment = Union[_MappedSegment, _CompressedSegment]
+
+
+@singleton
+class HistoryRepository:
+    """Append-only on-disk time series of every `HistoryMetric`, one directory per GPU UUID.
+
+    Samples are timestamped with the wall clock in microseconds. `append()` only
+    queues samples, a writer thread writes them in batches to hourly raw segments of
+    memory mapped column files. Raw segments older than `RAW_RETENTION_USEC` are
+    compacted into Gorilla compressed blocks, and samples older than the retention
+    period are dropped. Aggregates at every `ROLLUP_RESOLUTIONS` are maintained as
+    samples are written, for queries over long ranges.
+    """
+
+    @inject
+    def __init__(self, sys_paths: SysPaths) -> None:
+        self._root = Path(sys_paths.get_config_path(APP_HISTORY_DIR_NAME))
+        self._queue: "queue.Queue[Tuple[str, int, List[float]]]" = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_timestamp: Dict[str, int] = {}
+        self._rollups: Dict[str, RollupWriter] = {}
+        self._last_compaction: int = 0
+        self._retention_usec: int = SETTINGS_DEFAULTS['settings_history_retention_days'] * USEC_PER_DAY
+
+    def set_retention(self, days: int) -> None:
+        self._retention_usec = max(1, days) * USEC_PER_DAY
+
+    def append(self, status_list: List[GpuStatus], timestamp: Optional[int] = None) -> None:
+        """Queue one sample per GPU of `status_list`, never blocks on disk I/O"""
+        if timestamp is None:
+            timestamp = time.time_ns() // 1000
+        for gpu_status in status_list:
+            uuid = gpu_status.info.uuid
+            if uuid is not None:
+                self._queue.put((uuid, timestamp, get_history_values(gpu_status)))
+        self._ensure_writer()
+
+    def get_gpu_uuids(self) -> List[str]:
+        if not self._root.is_dir():
+            return []
+        return sorted(p.name for p in self._root.iterdir() if p.is_dir())
+
+    def query(self, uuid: str, begin: int, end: int) -> Iterator[HistoryRow]:
+        """Yield all rows of the GPU `uuid` with `begin <= timestamp <= end`, in time order"""
+        for segment in self._open_segments(uuid, begin, end):
+            yield from segment.read(begin, end)
+
+    def query_metric(self, uuid: str, metric: HistoryMetric, begin: int, end: int) -> Iterator[Tuple[int, float]]:
+        column = HISTORY_METRICS.index(metric)
+        for segment in self._open_segments(uuid, begin, end):
+            yield from segment.read_column(column, begin, end)
+
+    def map_metric(self,
+                   uuid: str,
+                   metric: HistoryMetric,
+                   begin: int,
+                   end: int,
+                   max_points: Optional[int] = None) -> Tuple[Sequence[int], Sequence[float]]:
+        """Timestamps and values of `metric` with `begin <= timestamp <= end`.
+
+        Samples of raw segments are memory mapped rather than copied, the returned
+        sequences are read-only and don't see samples appended later. With
+        `max_points`, the averages of the rollup picked by `select_resolution()`
+        are returned instead of the raw samples when the range is long enough.
+        """
+        if max_points is not None:
+            resolution = select_resolution(begin, end, max_points)
+            if resolution > 0:
+                rollup = self.map_rollup(uuid, metric, begin, end, resolution)
+                return rollup.timestamps, rollup.avg
+        column = HISTORY_METRICS.index(metric)
+        timestamp_parts: List[Sequence[int]] = []
+        value_parts: List[Sequence[float]] = []
+        for segment in self._open_segments(uuid, begin, end):
+            timestamps, values = segment.map_column(column, begin, end)
+            if len(timestamps) > 0:
+                timestamp_parts.append(timestamps)
+                value_parts.append(values)
+        return chain_sequences(timestamp_parts), chain_sequences(value_parts)
+
+    def map_rollup(self, uuid: str, metric: HistoryMetric, begin: int, end: int, resolution: int) -> RollupSeries:
+        """Memory mapped aggregates of `metric` at `resolution`, one of `ROLLUP_RESOLUTIONS`.
+
+        Only completed buckets are stored, the one of the latest sample is missing.
+        """
+        return map_rollup(self._root / uuid, resolution, HISTORY_METRICS.index(metric), begin, end)
+
+    def flush(self) -> None:
+        """Synchronously write everything queued so far"""
+        with self._write_lock:
+            self._write_pending()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None and not self._stop.is_set():
+            self._writer = threading.Thread(target=self._run_writer, name='HistoryWriter', daemon=True)
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while not self._stop.wait(_FLUSH_INTERVAL_SEC):
+            try:
+                with self._write_lock:
+                    self._write_pending()
+                    now = time.time_ns() // 1000
+                    if now - self._last_compaction >= _COMPACTION_INTERVAL_USEC:
+                        self._last_compaction = now
+                        self._compact(now - self._retention_usec, now - RAW_RETENTION_USEC)
+            except:
+                _LOG.exception("Error while writing history")
+
+    def _write_pending(self) -> None:
+        batches: Dict[Tuple[str, int], List[Tuple[int, List[float]]]] = defaultdict(list)
+        while True:
+            try:
+                uuid, timestamp, values = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            # the time index relies on sorted timestamps, drop samples from a clock going backwards
+            if timestamp <= self._last_timestamp.get(uuid, -1):
+                _LOG.debug(f"Dropping out of order history sample for {uuid}")
+                continue
+            self._last_timestamp[uuid] = timestamp
+            batches[(uuid, timestamp - timestamp % SEGMENT_USEC)].append((timestamp, values))
+
+        for (uuid, _), rows in batches.items():
+            if uuid not in self._rollups:
+                self._rollups[uuid] = self._resume_rollups(uuid, rows[0][0])
+
+        for (uuid, segment_start), rows in batches.items():
+            directory = self._raw_segment_path(uuid, segment_start)
+            directory.mkdir(parents=True, exist_ok=True)
+            timestamp_path = directory / _column_file_name(_TIMESTAMP_COLUMN)
+            count = column_length(timestamp_path, 'q')
+            # the timestamps are written last, they commit the values written before them
+            for column, metric in enumerate(HISTORY_METRICS):
+                append_column(directory / _column_file_name(metric.value), count,
+                              array('d', (values[column] for _, values in rows)))
+            append_column(timestamp_path, count, array('q', (timestamp for timestamp, _ in rows)))
+            self._rollups[uuid].add(rows)
+
+    def _resume_rollups(self, uuid: str, timestamp: int) -> RollupWriter:
+        """Aggregate the stored samples older than `timestamp` that are missing in the rollups,
+        such as the buckets that were open when the application was closed.
+        """
+        rollups = RollupWriter(self._root / uuid)
+        rollups.add(self.query(uuid, rollups.resume_time(), timestamp - 1))
+        return rollups
+
+    def _compact(self, cutoff: int, seal: int) -> None:
+        """Drop every sample older than `cutoff` and compress the segments that ended before `seal`"""
+        for uuid in self.get_gpu_uuids():
+            for segment_start in self._get_segment_starts(uuid):
+                segment_end = segment_start + SEGMENT_USEC
+                if segment_end <= cutoff:
+                    _LOG.debug(f"Removing expired history segment {uuid}/{segment_start}")
+                    self._remove_raw_segment(uuid, segment_start)
+                    self._compressed_segment_path(uuid, segment_start).unlink(missing_ok=True)
+                elif segment_start < cutoff or (segment_end <= seal
+                                                and self._raw_segment_path(uuid, segment_start).is_dir()):
+                    # the compressed segments that are already complete are left alone
+                    self._compress_segment(uuid, segment_start, cutoff)
+            expire_rollups(self._root / uuid, cutoff)
+            gpu_dir = self._root / uuid
+            if not any(gpu_dir.iterdir()):
+                gpu_dir.rmdir()
+
+    def _compress_segment(self, uuid: str, segment_start: int, cutoff: int) -> None:
+        """(Re)write the compressed segment with all samples >= `cutoff` of both tiers, then drop the raw one"""
+        path = self._compressed_segment_path(uuid, segment_start)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as dst:
+            rows = self._read_segment_files(uuid, segment_start, cutoff, MAX_TIMESTAMP)
+            count = write_compressed_segment(dst, rows)
+        if count == 0:
+            tmp_path.unlink()
+            path.unlink(missing_ok=True)
+        else:
+            # readers that already opened the old file keep reading the old inode
+            os.replace(tmp_path, path)
+        self._remove_raw_segment(uuid, segment_start)
+
+    def _remove_raw_segment(self, uuid: str, segment_start: int) -> None:
+        # mappings of the removed files stay valid until they are released
+        shutil.rmtree(self._raw_segment_path(uuid, segment_start), ignore_errors=True)
+
+    def _read_segment_files(self, uuid: str, segment_start: int, begin: int, end: int) -> Iterator[HistoryRow]:
+        for segment in self._open_segment_files(uuid, segment_start):
+            yield from segment.read(begin, end)
+
+    def _open_segments(self, uuid: str, begin: int, end: int) -> Iterator[_Segment]:
+        for segment_start in self._get_segment_starts(uuid):
+            if segment_start + SEGMENT_USEC <= begin:
+                continue
+            if segment_start > end:
+                break
+            yield from self._open_segment_files(uuid, segment_start)
+
+    def _open_segment_files(self, uuid: str, segment_start: int) -> Iterator[_Segment]:
+        # Samples written to a raw segment after its hour was compacted are always
+        #  newer than the compressed ones, so the compressed file is read first.
+        try:
+            file = open(self._compressed_segment_path(uuid, segment_start), 'rb')
+        except FileNotFoundError:
+            pass
+        else:
+            with file:
+                yield _CompressedSegment(file)
+        try:
+            segment = _MappedSegment(self._raw_segment_path(uuid, segment_start))
+        except FileNotFoundError:
+            # not written yet, or removed by the compaction meanwhile
+            return
+        yield segment
+
+    def _get_segment_starts(self, uuid: str) -> List[int]:
+        gpu_dir = self._root / uuid
+        if not gpu_dir.is_dir():
+            return []
+        return sorted({int(p.stem) for p in gpu_dir.iterdir()
+                       if p.suffix == _COMPRESSED_SUFFIX or (p.is_dir() and p.name.isdigit())})
+
+    def _raw_segment_path(self, uuid: str, segment_start: int) -> Path:
+        return self._root / uuid / str(segment_start)
+
+    def _compressed_segment_path(self, uuid: str, segment_start: int) -> Path:
+        return self._root / uuid / f"{segment_start}{_COMPRESSED_SUFFIX}"
@@ -0,0 +1,208 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import bisect
+import math
+import shutil
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from gwe.model.history_metric import HISTORY_METRICS
+from gwe.util.column_file import append_column, column_length, map_column
+from gwe.util.sequence import chain_sequences
+
+USEC_PER_SEC = 1000000
+USEC_PER_DAY = 24 * 60 * 60 * USEC_PER_SEC
+
+# Bucket widths of the maintained aggregates, finest first. There's no 1 s tier, that's
+#  the resolution of the samples themselves, which the compressed segments store in a
+#  few bytes while a bucket takes 4 doubles per metric.
+ROLLUP_RESOLUTIONS: List[int] = [60 * USEC_PER_SEC, 60 * 60 * USEC_PER_SEC]
+
+# Each partition holds one day of buckets of one resolution. Like the raw segments, it's
+#  a directory of column files: the bucket start timestamps, and for each metric a
+#  record of min, max, avg and count per bucket.
+PARTITION_USEC = USEC_PER_DAY
+_TIMESTAMP_COLUMN = 'timestamp.col'
+_AGGREGATES = 4
+_MIN, _MAX, _AVG, _COUNT = range(_AGGREGATES)
+
+
+class RollupSeries(NamedTuple):
+    """Aggregates of one metric, one entry per bucket with at least one sample"""
+    timestamps: Sequence[int]
+    min: Sequence[float]
+    max: Sequence[float]
+    avg: Sequence[float]
+    count: Sequence[float]
+
+
+def select_resolution(begin: int, end: int, max_points: int) -> int:
+    """The coarsest resolution with buckets no wider than a point, when showing
+    `begin` to `end` with `max_points` points. 0 means the raw samples.
+    """
+    point_width = (end - begin) / max(1, max_points)
+    resolution = 0
+    for r in ROLLUP_RESOLUTIONS:
+        if r <= point_width:
+            resolution = r
+    return resolution
+
+
+class _Bucket:
+    __slots__ = ('start', 'min', 'max', 'sum', 'count')
+
+    def __init__(self, start: int, metric_count: int) -> None:
+        self.start = start
+        self.min = [math.inf] * metric_count
+        self.max = [-math.inf] * metric_count
+        self.sum = [0.0] * metric_count
+        self.count = [0] * metric_count
+
+    def add(self, values: Sequence[float]) -> None:
+        for i, value in enumerate(values):
+            # NaN is a missing sample
+            if value == value:
+                if value < self.min[i]:
+                    self.min[i] = value
+                if value > self.max[i]:
+                    self.max[i] = value
+                self.sum[i] += value
+                self.count[i] += 1
+
+    def record(self, metric: int) -> Tuple[float, float, float, float]:
+        count = self.count[metric]
+        if count == 0:
+            return math.nan, math.nan, math.nan, 0.0
+        return self.min[metric], self.max[metric], self.sum[metric] / count, float(count)
+
+
+def _resolution_path(directory: Path, resolution: int) -> Path:
+    return directory / f"rollup-{resolution // USEC_PER_SEC}"
+
+
+def _partition_starts(directory: Path, resolution: int) -> List[int]:
+    path = _resolution_path(directory, resolution)
+    if not path.is_dir():
+        return []
+    return sorted(int(p.name) for p in path.iterdir() if p.name.isdigit())
+
+
+class RollupWriter:
+    """Incrementally maintains the aggregates of one GPU at every resolution.
+
+    Samples are added in time order, and a bucket is written once a sample of a
+    later bucket arrives. Buckets that are already on disk are skipped, so samples
+    can be replayed after a restart to complete the bucket that was open.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._open: Dict[int, _Bucket] = {}
+        self._last_written: Dict[int, int] = {r: self._read_last_bucket(r) for r in ROLLUP_RESOLUTIONS}
+
+    def resume_time(self) -> int:
+        """Timestamp of the first sample not covered by every resolution"""
+        return min(last + r for r, last in self._last_written.items())
+
+    def add(self, rows: Iterable[Tuple[int, Sequence[float]]]) -> None:
+        completed: Dict[int, List[_Bucket]] = defaultdict(list)
+        for timestamp, values in rows:
+            for resolution in ROLLUP_RESOLUTIONS:
+                start = timestamp - timestamp % resolution
+                bucket = self._open.get(resolution)
+                if bucket is None or bucket.start != start:
+                    if bucket is not None:
+                        completed[resolution].append(bucket)
+                    bucket = _Bucket(start, len(values))
+                    self._open[resolution] = bucket
+                bucket.add(values)
+        for resolution, buckets in completed.items():
+            self._write(resolution, [b for b in buckets if b.start > self._last_written[resolution]])
+
+    def _write(self, resolution: int, buckets: List[_Bucket]) -> None:
+        partitions: Dict[int, List[_Bucket]] = defaultdict(list)
+        for bucket in buckets:
+            partitions[bucket.start - bucket.start % PARTITION_USEC].append(bucket)
+        for partition_start, partition in partitions.items():
+            path = _resolution_path(self._directory, resolution) / str(partition_start)
+            path.mkdir(parents=True, exist_ok=True)
+            count = column_length(path / _TIMESTAMP_COLUMN, 'q')
+            for metric_index, metric in enumerate(HISTORY_METRICS):
+                records = array('d')
+                for bucket in partition:
+                    records.extend(bucket.record(metric_index))
+                append_column(path / f"{metric.value}.col", count * _AGGREGATES, records)
+            # the timestamps are written last, they commit the records written before them
+            append_column(path / _TIMESTAMP_COLUMN, count, array('q', (b.start for b in partition)))
+            self._last_written[resolution] = partition[-1].start
+
+    def _read_last_bucket(self, resolution: int) -> int:
+        path = _resolution_path(self._directory, resolution)
+        for partition_start in reversed(_partition_starts(self._directory, resolution)):
+            timestamps = map_column(path / str(partition_start) / _TIMESTAMP_COLUMN, 'q')
+            if timestamps:
+                return int(timestamps[-1])
+        return -resolution
+
+
+def map_rollup(directory: Path, resolution: int, metric: int, begin: int, end: int) -> RollupSeries:
+    """Memory mapped aggregates of the `metric`th metric of every bucket starting in `begin` to `end`"""
+    parts: List[List[Sequence]] = [[] for _ in range(_AGGREGATES + 1)]
+    for partition_start in _partition_starts(directory, resolution):
+        if partition_start + PARTITION_USEC <= begin:
+            continue
+        if partition_start > end:
+            break
+        path = _resolution_path(directory, resolution) / str(partition_start)
+        timestamps = map_column(path / _TIMESTAMP_COLUMN, 'q')
+        if timestamps is None:
+            continue
+        records = map_column(path / f"{HISTORY_METRICS[metric].value}.col", 'd')
+        # ignore trailing records of an interrupted write
+        count = len(timestamps) if records is None else min(len(timestamps), len(records) // _AGGREGATES)
+        timestamps = timestamps[:count]
+        first = bisect.bisect_left(timestamps, begin)
+        last = bisect.bisect_right(timestamps, end)
+        if first == last:
+            continue
+        parts[0].append(timestamps[first:last])
+        for aggregate in range(_AGGREGATES):
+            if records is None:
+                fill = 0.0 if aggregate == _COUNT else math.nan
+                parts[aggregate + 1].append(array('d', [fill]) * (last - first))
+            else:
+                # a strided view of the records, still not copied
+                parts[aggregate + 1].append(records[first * _AGGREGATES + aggregate:last * _AGGREGATES:_AGGREGATES])
+    return RollupSeries(*(chain_sequences(p) for p in parts))
+
+
+def expire_rollups(directory: Path, cutoff: int) -> None:
+    """Remove the partitions of every resolution that ended before `cutoff`, and the
+    resolutions that aren't maintained anymore"""
+    maintained = {_resolution_path(directory, r).name for r in ROLLUP_RESOLUTIONS}
+    for path in directory.glob('rollup-*'):
+        if path.name not in maintained:
+            shutil.rmtree(path, ignore_errors=True)
+    for resolution in ROLLUP_RESOLUTIONS:
+        for partition_start in _partition_starts(directory, resolution):
+            if partition_start + PARTITION_USEC <= cutoff:
+                shutil.rmtree(_resolution_path(directory, resolution) / str(partition_start), ignore_errors=True)
+        path = _resolution_path(directory, resolution)
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
@@ -61,6 +61,8 @@ class NvidiaRepository:
         self._gpu_count = 0
         self._gpu_setting_cache: List[Dict[str, str]] = []
         self._ctrl_display: Optional[str] = None
+        # opened by `probe` with NVML initialized, used by `get_max_values` and taken by the first `get_status`
+        self._probe_display: Optional[display.Display] = None
 
     @staticmethod
     def is_nvidia_smi_available() -> bool:
@@ -70,33 +72,65 @@ class NvidiaRepository:
         self._ctrl_display = ctrl_display
 
     @synchronized_with_attr("_lock")
-    def has_nv_control_extension(self) -> bool:
+    def probe(self) -> Tuple[bool, bool]:
+        """Check for the NV-CONTROL extension and the NVML library at the same time.
+
+        Returns whether each of them is available. When both are, the X display and
+        NVML are kept open for `get_max_values` and the first `get_status`, rather
+        than opened again.
+        """
+        has_nvml: List[bool] = []
+        nvml_thread = threading.Thread(target=lambda: has_nvml.append(self._init_nvml()), name='NvmlProbe')
+        nvml_thread.start()
+        xlib_display = self._open_nv_control_display()
+        nvml_thread.join()
+        if xlib_display is not None and has_nvml[0]:
+            self._close_probe_session()
+            self._probe_display = xlib_display
+        else:
+            if xlib_display is not None:
+                self._close_display(xlib_display)
+            if has_nvml[0]:
+                pynvml.nvmlShutdown()
+        return xlib_display is not None, has_nvml[0]
+
+    @staticmethod
+    def _init_nvml() -> bool:
+        try:
+            pynvml.nvmlInit()
+            return True
+        except:
+            _LOG.exception("Error while checking NVML Shared Library")
+        return False
+
+    def _open_nv_control_display(self) -> Optional[display.Display]:
+        """A connection to the X display, if it has the NV-CONTROL extension"""
         xlib_display = None
         try:
             xlib_display = display.Display(self._ctrl_display)
-            return bool(xlib_display.has_extension('NV-CONTROL'))
+            if xlib_display.has_extension('NV-CONTROL'):
+                return xlib_display
         except:
             _LOG.exception("Error while checking NV-CONTROL extension")
-        finally:
-            try:
-                if xlib_display:
-                    xlib_display.close()
-            except Xlib.error.DisplayConnectionError:
-                # this error seems to happen even when intentionally closed
-                pass
-            except:
-                _LOG.exception("Error while checking NV-CONTROL extension")
-        return False
+        if xlib_display is not None:
+            self._close_display(xlib_display)
+        return None
 
-    @synchronized_with_attr("_lock")
-    def has_nvml_shared_library(self) -> bool:
+    @staticmethod
+    def _close_display(xlib_display: display.Display) -> None:
         try:
-            pynvml.nvmlInit()
-            pynvml.nvmlShutdown()
-            return True
+            xlib_display.close()
+        except Xlib.error.DisplayConnectionError:
+            # this error seems to happen even when intentionally closed
+            pass
         except:
-            _LOG.exception("Error while checking NVML Shared Library")
-        return False
+            _LOG.exception("Error while closing the X display")
+
+    def _close_probe_session(self) -> None:
+        if self._probe_display is not None:
+            self._close_display(self._probe_display)
+            self._probe_display = None
+            pynvml.nvmlShutdown()
 
     @staticmethod
     def _get_item(dict: Optional[Dict[str, Union[str, int]]], key: str) -> Optional[int]:
@@ -110,8 +144,12 @@ class NvidiaRepository:
 
     @synchronized_with_attr("_lock")
     def get_max_values(self) -> Tuple[int,Clocks]:
-        pynvml.nvmlInit()
-        xlib_display = display.Display(self._ctrl_display)
+        # the session of `probe` is left open for the first `get_status`
+        xlib_display = self._probe_display
+        owned = xlib_display is None
+        if owned:
+            pynvml.nvmlInit()
+            xlib_display = display.Display(self._ctrl_display)
         try:
             gpu_count = xlib_display.nvcontrol_get_gpu_count()
 
@@ -157,9 +195,10 @@ class NvidiaRepository:
             raise
         finally:
             try:
-                if xlib_display:
-                    xlib_display.close()
-                pynvml.nvmlShutdown()
+                if owned:
+                    if xlib_display:
+                        xlib_display.close()
+                    pynvml.nvmlShutdown()
             except Xlib.error.ConnectionClosedError:
                 # this error seems to happen even when intentionally closed
                 pass
@@ -172,8 +211,10 @@ class NvidiaRepository:
         xlib_display = None
         try:
             time1 = time.time()
-            pynvml.nvmlInit()
-            xlib_display = display.Display(self._ctrl_display)
+            xlib_display, self._probe_display = self._probe_display, None
+            if xlib_display is None:
+                pynvml.nvmlInit()
+                xlib_display = display.Display(self._ctrl_display)
             self._gpu_count = xlib_display.nvcontrol_get_gpu_count()
             gpu_status_list: List[GpuStatus] = []
             for gpu_index in range(self._gpu_count):
@@ -343,6 +384,11 @@ class NvidiaRepository:
         for gpu_index in range(self._gpu_count):
             self.set_fan_speed(gpu_index, manual_control=False)
 
+    @synchronized_with_attr("_lock")
+    def close(self) -> None:
+        """Close what `probe` opened, if it wasn't used"""
+        self._close_probe_session()
+
     def set_fan_speed(self, gpu_index: int, speed: int = 100, manual_control: bool = False) -> bool:
         xlib_display = display.Display(self._ctrl_display)
         try:
@@ -0,0 +1,239 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import itertools
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from injector import singleton, inject
+from reactivex import Observable
+
+from gwe.model.cb_change import DbChange
+from gwe.model.fan_profile import FanProfile, FanProfileChangedSubject
+from gwe.model.fan_profile_type import FanProfileType
+from gwe.model.overclock_profile import OverclockProfile, OverclockProfileChangedSubject
+from gwe.model.speed_step import SpeedStep, SpeedStepBatch, SpeedStepChangedSubject, notify_speed_steps_replaced
+from gwe.repository.database_worker import DatabaseWorker
+
+_LOG = logging.getLogger(__name__)
+
+
+@singleton
+class ProfileRepository:
+    """In-memory copy of the fan profiles, their speed steps and the overclock profiles.
+
+    The tables are read once, then kept up to date from the change subjects of the
+    models, so the polling and the UI don't query SQLite. Steps are deleted with their
+    profile by a single query, without signals, so they are dropped with the profile.
+    """
+
+    @inject
+    def __init__(self,
+                 fan_profile_changed_subject: FanProfileChangedSubject,
+                 speed_step_changed_subject: SpeedStepChangedSubject,
+                 overclock_profile_changed_subject: OverclockProfileChangedSubject,
+                 database_worker: DatabaseWorker) -> None:
+        self._database_worker = database_worker
+        self._fan_profiles: Dict[int, FanProfile] = {p.id: p for p in FanProfile.select().order_by(FanProfile.id)}
+        self._steps: Dict[int, List[SpeedStep]] = {}
+        for step in SpeedStep.select():
+            self._steps.setdefault(step.profile_id, []).append(step)
+        for steps in self._steps.values():
+            steps.sort(key=_step_key)
+        self._overclock_profiles: Dict[int, OverclockProfile] = \
+            {p.id: p for p in OverclockProfile.select().order_by(OverclockProfile.id)}
+
+        # subscribed before the presenters, so they see the updated copy
+        fan_profile_changed_subject.subscribe(on_next=self._on_fan_profile_changed,
+                                              on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        speed_step_changed_subject.subscribe(on_next=self._on_speed_step_changed,
+                                             on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+        overclock_profile_changed_subject.subscribe(on_next=self._on_overclock_profile_changed,
+                                                    on_error=lambda e: _LOG.exception(f"Db signal error: {str(e)}"))
+
+    def get_fan_profiles(self) -> List[FanProfile]:
+        return list(self._fan_profiles.values())
+
+    def get_fan_profile(self, profile_id: int) -> Optional[FanProfile]:
+        return self._fan_profiles.get(profile_id)
+
+    def get_auto_fan_profile(self) -> Optional[FanProfile]:
+        return next((p for p in self._fan_profiles.values() if p.type == FanProfileType.AUTO.value), None)
+
+    def get_speed_steps(self, profile_id: int) -> List[SpeedStep]:
+        """The steps of a fan profile, by increasing temperature"""
+        return self._steps.get(profile_id, [])
+
+    def edit_fan_curve(self, profile: FanProfile) -> 'FanCurveEditSession':
+        """Start staging changes to the steps of `profile`"""
+        return FanCurveEditSession(profile.id, self.get_speed_steps(profile.id), self._database_worker)
+
+    def get_overclock_profiles(self) -> List[OverclockProfile]:
+        return list(self._overclock_profiles.values())
+
+    def get_overclock_profile(self, profile_id: int) -> Optional[OverclockProfile]:
+        return self._overclock_profiles.get(profile_id)
+
+    def _on_fan_profile_changed(self, db_change: DbChange) -> None:
+        profile: FanProfile = db_change.entry
+        if db_change.type == DbChange.DELETE:
+            self._fan_profiles.pop(profile.id, None)
+            self._steps.pop(profile.id, None)
+        else:
+            self._fan_profiles[profile.id] = profile
+
+    def _on_speed_step_changed(self, db_change: DbChange) -> None:
+        if isinstance(db_change.entry, SpeedStepBatch):
+            self._steps[db_change.entry.profile_id] = db_change.entry.steps
+            return
+        step: SpeedStep = db_change.entry
+        # a new list, so a list handed out before isn't changed while in use
+        steps = [s for s in self._steps.get(step.profile_id, []) if s.id != step.id]
+        if db_change.type != DbChange.DELETE:
+            steps.append(step)
+            steps.sort(key=_step_key)
+        self._steps[step.profile_id] = steps
+
+    def _on_overclock_profile_changed(self, db_change: DbChange) -> None:
+        profile: OverclockProfile = db_change.entry
+        if db_change.type == DbChange.DELETE:
+            self._overclock_profiles.pop(profile.id, None)
+        else:
+            self._overclock_profiles[profile.id] = profile
+
+
+class FanCurveEditSession:
+    """Changes to the speed steps of a fan profile, staged in memory until commit().
+
+    The steps are copies, those of the repository, read by the polling, are only
+    replaced once the changes are committed. A commit writes every change in one transaction and notifies them
+    as a single SpeedStepBatch, so a curve can be edited step by step, or dragged,
+    without a write and a refresh of every listener for each change.
+
+    Each staged step has a key of the session, so a new step changed again before
+    the commit that inserts it is done is updated by the next commit, rather than
+    inserted twice.
+    """
+
+    def __init__(self, profile_id: int, steps: List[SpeedStep], database_worker: DatabaseWorker) -> None:
+        self._profile_id = profile_id
+        self._database_worker = database_worker
+        self._keys = itertools.count()
+        self._steps: Dict[int, SpeedStep] = {next(self._keys): _copy_step(s) for s in steps}
+        self._deleted: Dict[int, SpeedStep] = {}
+        # ids of the new steps, by key, filled in on the database worker as they're inserted
+        self._inserted: Dict[int, int] = {}
+        self._changed = False
+
+    def get_steps(self) -> List[SpeedStep]:
+        """The staged steps, by increasing temperature"""
+        return sorted(self._steps.values(), key=_step_key)
+
+    def has_changes(self) -> bool:
+        return self._changed
+
+    def set_step(self, step: SpeedStep, temperature: int, duty: int) -> SpeedStep:
+        """Stage `step` with new values, adding it if it isn't a step of the profile yet.
+
+        Returns the staged step, which replaces `step` in get_steps().
+        """
+        key = self._find_key(step)
+        if key is None:
+            key = next(self._keys)
+        staged = SpeedStep(id=step.id, profile=self._profile_id, temperature=temperature, duty=duty)
+        self._steps[key] = staged
+        self._changed = True
+        return staged
+
+    def delete_step(self, step: SpeedStep) -> None:
+        key = self._find_key(step)
+        if key is not None:
+            self._deleted[key] = self._steps.pop(key)
+            self._changed = True
+
+    def commit(self) -> Observable:
+        """Write the staged changes on the database worker.
+
+        Returns an Observable of the committed copies of the steps, by key, emitted on the
+        worker thread once the transaction is committed. Pass them to apply_committed() on
+        the main loop, for the ids of the new steps.
+        """
+        # the worker writes copies, the staged steps are only read and changed on the main loop
+        steps = [(key, _copy_step(step)) for key, step in sorted(self._steps.items(),
+                                                                 key=lambda item: _step_key(item[1]))]
+        deleted = {key: _copy_step(step) for key, step in self._deleted.items()}
+        self._deleted = {}
+        self._changed = False
+        new_keys: List[int] = []
+        committed = self._database_worker.submit(
+            lambda: _write_steps(self._profile_id, steps, deleted, self._inserted, new_keys))
+        # subscribed first, so the repository has the steps before the caller sees them
+        committed.subscribe(on_next=lambda result: notify_speed_steps_replaced(self._profile_id,
+                                                                                [step for _, step in result]),
+                            on_error=lambda _: self._forget_inserted(new_keys))
+        return committed
+
+    def apply_committed(self, committed: List[Tuple[int, SpeedStep]]) -> None:
+        """Give the staged steps the ids they were committed with"""
+        for key, step in committed:
+            staged = self._steps.get(key)
+            if staged is not None and staged.id is None:
+                staged.id = step.id
+
+    def _forget_inserted(self, keys: List[int]) -> None:
+        """Runs on the database worker, the steps inserted by a rolled back commit are inserted again"""
+        for key in keys:
+            self._inserted.pop(key, None)
+
+    def _find_key(self, step: SpeedStep) -> Optional[int]:
+        return next((key for key, staged in self._steps.items()
+                     if staged is step or (step.id is not None and staged.id == step.id)), None)
+
+
+def _write_steps(profile_id: int,
+                 steps: List[Tuple[int, SpeedStep]],
+                 deleted: Dict[int, SpeedStep],
+                 inserted: Dict[int, int],
+                 new_keys: List[int]) -> List[Tuple[int, SpeedStep]]:
+    """Runs on the database worker, in a savepoint of its own.
+
+    `inserted` has the ids of the steps inserted by the previous commits of the
+    session, staged again before their id was known. The keys of the steps this
+    commit inserts are added to `new_keys`.
+    """
+    deleted_ids = [step.id if step.id is not None else inserted.get(key) for key, step in deleted.items()]
+    deleted_ids = [step_id for step_id in deleted_ids if step_id is not None]
+    if deleted_ids:
+        SpeedStep.delete().where(SpeedStep.id.in_(deleted_ids)).execute()
+    for key, step in steps:
+        if step.id is None and key in inserted:
+            step.id = inserted[key]
+        if step.id is None:
+            step.id = SpeedStep.insert(profile=profile_id, temperature=step.temperature, duty=step.duty).execute()
+            inserted[key] = step.id
+            new_keys.append(key)
+        else:
+            SpeedStep.update(temperature=step.temperature, duty=step.duty).where(SpeedStep.id == step.id).execute()
+    return steps
+
+
+def _copy_step(step: SpeedStep) -> SpeedStep:
+    return SpeedStep(id=step.id, profile=step.profile_id, temperature=step.temperature, duty=step.duty)
+
+
+def _step_key(step: SpeedStep) -> Tuple[int, bool, int]:
+    # new steps have no id yet, they sort after the stored ones of the same temperature
+    return step.temperature, step.id is None, step.id or 0
@@ -0,0 +1,129 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from injector import singleton, inject
+
+from gwe.conf import APP_SNAPSHOT_NAME
+from gwe.model.clocks import Clocks
+from gwe.model.fan import Fan
+from gwe.model.gpu_status import GpuStatus
+from gwe.model.info import Info
+from gwe.model.overclock import Overclock
+from gwe.model.power import Power
+from gwe.model.status_snapshot import StatusSnapshot
+from gwe.model.sys_paths import SysPaths
+from gwe.model.temp import Temp
+
+_LOG = logging.getLogger(__name__)
+
+# a snapshot of another version is ignored
+SNAPSHOT_VERSION = 1
+
+
+@singleton
+class SnapshotRepository:
+    """The last known GPU status and max values.
+
+    The snapshot is read once at startup, so the window shows real content before
+    the first driver round trip. It's updated in memory as the driver is read and
+    written when the application quits.
+    """
+    @inject
+    def __init__(self, sys_paths: SysPaths) -> None:
+        self._path = Path(sys_paths.get_config_path(APP_SNAPSHOT_NAME))
+        self._snapshot: Optional[StatusSnapshot] = None
+        self._changed = False
+
+    def load(self) -> StatusSnapshot:
+        """The snapshot saved by the last session, empty if there is none"""
+        if self._snapshot is None:
+            self._snapshot = self._read()
+        return self._snapshot
+
+    def set_status(self, status: List[GpuStatus]) -> None:
+        self.load().status = status
+        self._changed = True
+
+    def set_max_values(self, mem_total: int, max_clocks: Clocks) -> None:
+        snapshot = self.load()
+        snapshot.mem_total = mem_total
+        snapshot.max_clocks = max_clocks
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the snapshot if it changed, replacing the old one atomically"""
+        if self._snapshot is None or not self._changed:
+            return
+        data = {'version': SNAPSHOT_VERSION, **asdict(self._snapshot)}
+        temp_path = self._path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self._path)
+            self._changed = False
+        except OSError:
+            _LOG.exception(f"Unable to write {self._path}")
+
+    def _read(self) -> StatusSnapshot:
+        try:
+            with open(self._path, encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') == SNAPSHOT_VERSION:
+                return _decode_snapshot(data)
+            _LOG.info(f"Ignoring {self._path} of version {data.get('version')}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            _LOG.warning(f"Ignoring invalid {self._path}", exc_info=True)
+        return StatusSnapshot()
+
+
+def _decode_snapshot(data: Dict[str, Any]) -> StatusSnapshot:
+    max_clocks = data['max_clocks']
+    return StatusSnapshot(status=[_decode_gpu_status(gpu_status) for gpu_status in data['status']],
+                          mem_total=data['mem_total'],
+                          max_clocks=Clocks(**max_clocks) if max_clocks is not None else None)
+
+
+def _decode_gpu_status(data: Dict[str, Any]) -> GpuStatus:
+    """JSON has no tuples, the pairs are lists again"""
+    fan = dict(data['fan'])
+    if fan['fan_list'] is not None:
+        fan['fan_list'] = [_to_pair(duty_rpm) for duty_rpm in fan['fan_list']]
+    overclock = dict(data['overclock'])
+    overclock['gpu_range'] = _to_pair(overclock['gpu_range'])
+    overclock['memory_range'] = _to_pair(overclock['memory_range'])
+    return GpuStatus(index=data['index'],
+                     info=Info(**data['info']),
+                     power=Power(**data['power']),
+                     temp=Temp(**data['temp']),
+                     fan=Fan(**fan),
+                     clocks=Clocks(**data['clocks']),
+                     overclock=Overclock(**overclock))
+
+
+def _to_pair(values: Optional[List[int]]) -> Optional[Tuple[int, int]]:
+    if values is None:
+        return None
+    first, second = values
+    return first, second
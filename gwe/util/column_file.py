@@ -0,0 +1,63 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Append-only files of fixed width values in native byte order, read through `mmap`"""
+import math
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import Optional
+
+
+def map_column(path: Path, typecode: str) -> Optional[memoryview]:
+    """Map the column file at `path` read-only, None if it doesn't exist"""
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(array(typecode))
+        # the mapping stays valid after the file is closed, and is released with the last view of it
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    itemsize = array(typecode).itemsize
+    return memoryview(mapped)[:len(mapped) // itemsize * itemsize].cast(typecode)
+
+
+def append_column(path: Path, count: int, values: array) -> None:
+    """Append `values` to the column file at `path` after its first `count` values.
+
+    Values past `count`, left over by an interrupted write, are overwritten. A
+    shorter file, such as the column of a newly added metric, is padded with NaN.
+    """
+    with open(path, 'ab') as file:
+        size = file.tell()
+        expected = count * values.itemsize
+        if size > expected:
+            file.truncate(expected)
+        elif size < expected:
+            padding = array(values.typecode, [math.nan]) * ((expected - size) // values.itemsize)
+            padding.tofile(file)
+        values.tofile(file)
+
+
+def column_length(path: Path, typecode: str) -> int:
+    """Number of complete values in the column file at `path`"""
+    try:
+        return path.stat().st_size // array(typecode).itemsize
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,180 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Dict, Optional, TypeVar
+
+from injector import singleton, inject
+from reactivex import abc, typing
+from reactivex.disposable import Disposable
+from reactivex.scheduler import NewThreadScheduler
+
+_LOG = logging.getLogger(__name__)
+_TState = TypeVar('_TState')
+
+
+class Lane(Enum):
+    SAMPLING = 'sampling'
+    DEVICE_WRITES = 'device-writes'
+    IO = 'io'
+    NETWORK = 'network'
+
+
+# The driver is read and written one call at a time, behind NvidiaRepository's lock
+#  and the X connection, so more threads would only wait. The periodic timers wait
+#  on threads of their own, the second sampling thread is left for the rest of the
+#  sampling work, like disposing the refresh timer when it's restarted, while a
+#  slow read holds the first one.
+LANE_WORKERS: Dict[Lane, int] = {
+    Lane.SAMPLING: 2,
+    Lane.DEVICE_WRITES: 1,
+    Lane.IO: 1,
+    Lane.NETWORK: 1,
+}
+
+
+@dataclass
+class LaneMetrics:
+    # submitted, waiting for a thread
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    max_queued: int = 0
+
+
+class _LaneTask(abc.StartableBase):
+    """What the scheduler takes for a thread, started as a task of the lane"""
+
+    def __init__(self, lane: '_Lane', target: typing.StartableTarget) -> None:
+        self._lane = lane
+        self._target = target
+
+    def start(self) -> None:
+        self._lane.submit(self._target)
+
+
+class _LaneScheduler(NewThreadScheduler):
+    """Schedules the work as tasks of the lane.
+
+    A periodic timer waits on a thread of its own and posts each tick to the
+    lane, rather than keeping a thread of the lane for as long as it runs.
+    """
+
+    def __init__(self, lane: '_Lane', name: str) -> None:
+        super().__init__(lambda target: _LaneTask(lane, target))
+        self._name = name
+
+    def schedule_periodic(self,
+                          period: typing.RelativeTime,
+                          action: typing.ScheduledPeriodicAction[_TState],
+                          state: Optional[_TState] = None) -> abc.DisposableBase:
+        seconds = self.to_seconds(period)
+        disposed = threading.Event()
+        ticked = threading.Event()
+
+        def tick(*_) -> None:
+            nonlocal state
+            try:
+                if not disposed.is_set():
+                    state = action(state)
+            finally:
+                ticked.set()
+
+        def run() -> None:
+            deadline = time.monotonic()
+            while True:
+                deadline += seconds
+                if disposed.wait(max(0.0, deadline - time.monotonic())):
+                    return
+                ticked.clear()
+                try:
+                    self.schedule(tick)
+                except RuntimeError:
+                    # the lane is shut down
+                    return
+                # the ticks don't overlap, a late one delays the next
+                ticked.wait()
+                deadline = max(deadline, time.monotonic() - seconds)
+
+        threading.Thread(target=run, name=f'{self._name}-timer', daemon=True).start()
+        return Disposable(disposed.set)
+
+
+class _Lane:
+    def __init__(self, lane: Lane, workers: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'gwe-{lane.value}')
+        self._lock = threading.Lock()
+        self._metrics = LaneMetrics()
+        self.scheduler = _LaneScheduler(self, f'gwe-{lane.value}')
+
+    def submit(self, target: typing.StartableTarget) -> None:
+        with self._lock:
+            self._metrics.queued += 1
+            self._metrics.max_queued = max(self._metrics.max_queued, self._metrics.queued)
+        self._executor.submit(self._run, target)
+
+    def get_metrics(self) -> LaneMetrics:
+        with self._lock:
+            return replace(self._metrics)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _run(self, target: typing.StartableTarget) -> None:
+        with self._lock:
+            self._metrics.queued -= 1
+            self._metrics.running += 1
+        try:
+            target()
+        except Exception:  # pylint: disable=broad-except
+            _LOG.exception("Task failed")
+        finally:
+            with self._lock:
+                self._metrics.running -= 1
+                self._metrics.completed += 1
+
+
+@singleton
+class LaneExecutor:
+    """The threads the background work runs on, a few per kind of work.
+
+    Each lane is a bounded thread pool with a reactivex scheduler on top, for
+    `operators.subscribe_on` and `reactivex.interval`. Work queues up in its lane
+    rather than starting more threads, the lane metrics tell how far behind it is.
+    """
+
+    @inject
+    def __init__(self) -> None:
+        self._lanes = {lane: _Lane(lane, LANE_WORKERS[lane]) for lane in Lane}
+
+    def get_scheduler(self, lane: Lane) -> abc.SchedulerBase:
+        return self._lanes[lane].scheduler
+
+    def get_metrics(self) -> Dict[Lane, LaneMetrics]:
+        return {lane: executor_lane.get_metrics() for lane, executor_lane in self._lanes.items()}
+
+    def shutdown(self) -> None:
+        """Stop accepting work. The queued tasks still run, disposing a subscription
+        made with `subscribe_on` is one of them."""
+        for lane, metrics in self.get_metrics().items():
+            _LOG.debug(f"Lane {lane.value}: {metrics}")
+        for executor_lane in self._lanes.values():
+            executor_lane.shutdown()
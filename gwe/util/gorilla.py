@@ -0,0 +1,193 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Time series compression as described in "Gorilla: A Fast, Scalable, In-Memory
+#  Time Series Database" (Pelkonen et al., VLDB 2015): delta-of-delta encoded
+#  timestamps and XOR encoded float values.
+#
+from array import array
+from typing import List, Sequence
+
+# (prefix, prefix bit length, value bit length) for delta-of-deltas that don't fit in fewer bits
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+_DOD_LARGE_PREFIX = 0b1111
+_MASK_64 = (1 << 64) - 1
+
+
+class BitWriter:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._acc: int = 0
+        self._count: int = 0
+
+    def write(self, value: int, bits: int) -> None:
+        self._acc = (self._acc << bits) | (value & ((1 << bits) - 1))
+        self._count += bits
+        if self._count >= 64:
+            remainder = self._count & 7
+            self._buffer += (self._acc >> remainder).to_bytes(self._count >> 3, 'big')
+            self._acc &= (1 << remainder) - 1
+            self._count = remainder
+
+    def getvalue(self) -> bytes:
+        """Returns the written bits, zero padded to the next byte"""
+        padding = -self._count & 7
+        tail = (self._acc << padding).to_bytes((self._count + padding) >> 3, 'big')
+        return bytes(self._buffer) + tail
+
+
+class BitReader:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._offset: int = 0
+        self._acc: int = 0
+        self._count: int = 0
+
+    def read(self, bits: int) -> int:
+        """
+        Raises:
+            EOFError: if there are less than `bits` bits left
+        """
+        while self._count < bits:
+            chunk = self._data[self._offset:self._offset + 8]
+            if not chunk:
+                raise EOFError("Not enough bits left")
+            self._offset += len(chunk)
+            self._acc = (self._acc << (len(chunk) << 3)) | int.from_bytes(chunk, 'big')
+            self._count += len(chunk) << 3
+        self._count -= bits
+        value = self._acc >> self._count
+        self._acc &= (1 << self._count) - 1
+        return value
+
+
+def _write_signed(writer: BitWriter, value: int) -> None:
+    if value == 0:
+        writer.write(0, 1)
+        return
+    for prefix, prefix_bits, value_bits in _DOD_BUCKETS:
+        if -(1 << (value_bits - 1)) <= value < (1 << (value_bits - 1)):
+            writer.write(prefix, prefix_bits)
+            writer.write(value, value_bits)
+            return
+    writer.write(_DOD_LARGE_PREFIX, 4)
+    writer.write(value, 64)
+
+
+def _read_signed(reader: BitReader) -> int:
+    if reader.read(1) == 0:
+        return 0
+    value_bits = 64
+    for _prefix, prefix_bits, bucket_bits in _DOD_BUCKETS:
+        if reader.read(1) == 0:
+            value_bits = bucket_bits
+            break
+    value = reader.read(value_bits)
+    if value >= 1 << (value_bits - 1):
+        value -= 1 << value_bits
+    return value
+
+
+def encode_timestamps(timestamps: Sequence[int]) -> bytes:
+    """Encode increasing integer timestamps as delta-of-deltas, 1 bit per sample for a steady interval"""
+    writer = BitWriter()
+    previous = 0
+    previous_delta = 0
+    for i, timestamp in enumerate(timestamps):
+        if i == 0:
+            writer.write(timestamp, 64)
+        else:
+            delta = timestamp - previous
+            _write_signed(writer, delta - previous_delta)
+            previous_delta = delta
+        previous = timestamp
+    return writer.getvalue()
+
+
+def decode_timestamps(data: bytes, count: int) -> List[int]:
+    reader = BitReader(data)
+    timestamps: List[int] = []
+    if count == 0:
+        return timestamps
+    timestamp = reader.read(64)
+    if timestamp >= 1 << 63:
+        timestamp -= 1 << 64
+    timestamps.append(timestamp)
+    delta = 0
+    for _ in range(count - 1):
+        delta += _read_signed(reader)
+        timestamp += delta
+        timestamps.append(timestamp)
+    return timestamps
+
+
+def encode_values(values: Sequence[float]) -> bytes:
+    """XOR encode float values, 1 bit per sample for an unchanged value"""
+    writer = BitWriter()
+    previous = 0
+    leading = 65  # no previous meaningful window
+    trailing = 0
+    for i, bits in enumerate(array('Q', array('d', values).tobytes())):
+        if i == 0:
+            writer.write(bits, 64)
+            previous = bits
+            continue
+        xor = bits ^ previous
+        previous = bits
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        new_leading = min(64 - xor.bit_length(), 31)
+        new_trailing = (xor & -xor).bit_length() - 1
+        if new_leading >= leading and new_trailing >= trailing:
+            # fits in the previous meaningful window
+            writer.write(0b10, 2)
+            writer.write(xor >> trailing, 64 - leading - trailing)
+        else:
+            leading = new_leading
+            trailing = new_trailing
+            meaningful = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            # 64 meaningful bits are written as 0
+            writer.write(meaningful & 63, 6)
+            writer.write(xor >> trailing, meaningful)
+    return writer.getvalue()
+
+
+def decode_values(data: bytes, count: int) -> List[float]:
+    reader = BitReader(data)
+    result = array('Q')
+    if count == 0:
+        return []
+    previous = reader.read(64)
+    result.append(previous)
+    leading = 0
+    trailing = 0
+    for _ in range(count - 1):
+        if reader.read(1) == 1:
+            if reader.read(1) == 1:
+                leading = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trailing = 64 - leading - meaningful
+            previous ^= (reader.read(64 - leading - trailing) << trailing) & _MASK_64
+        result.append(previous)
+    return array('d', result.tobytes()).tolist()
@@ -0,0 +1,166 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Streaming writers of GPU telemetry rows, one row per GPU and sample.
+
+Rows are consumed one by one and written as they come, so the memory used doesn't
+depend on the number of rows. Missing samples (NaN) are written as empty CSV
+fields and JSON/Parquet nulls.
+"""
+import csv
+import importlib
+import json
+import math
+from datetime import datetime, timezone
+from enum import Enum
+from itertools import islice
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric
+
+USEC_PER_SEC = 1000000
+
+# GPU UUID, wall clock timestamp in microseconds, values of every `HistoryMetric`
+ExportRow = Tuple[str, int, Sequence[float]]
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 65536
+
+
+class ExportFormat(Enum):
+    CSV = 'csv'
+    JSONL = 'jsonl'
+    PARQUET = 'parquet'
+
+    @property
+    def is_binary(self) -> bool:
+        return self is ExportFormat.PARQUET
+
+    @staticmethod
+    def from_path(path: str) -> 'ExportFormat':
+        """The format matching the extension of `path`, CSV if there is none"""
+        extension = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+        for export_format in ExportFormat:
+            if export_format.value == extension:
+                return export_format
+        return ExportFormat.CSV
+
+
+def parse_metrics(names: str) -> List[HistoryMetric]:
+    """Parse a comma separated list of metric names, such as `gpu_temp,fan_rpm`.
+
+    Raises:
+        ValueError: if a name isn't a `HistoryMetric`
+    """
+    metrics = []
+    for name in names.split(','):
+        try:
+            metrics.append(HistoryMetric(name.strip()))
+        except ValueError:
+            choices = ', '.join(m.value for m in HISTORY_METRICS)
+            raise ValueError(f"Unknown metric '{name.strip()}', expected one of: {choices}") from None
+    return metrics
+
+
+def parse_timestamp(value: str) -> int:
+    """Parse an ISO 8601 date and time, local unless it has an offset, into a wall clock timestamp in µs
+
+    Raises:
+        ValueError: if `value` isn't a valid date and time
+    """
+    return int(datetime.fromisoformat(value).timestamp() * USEC_PER_SEC)
+
+
+def select_metrics(rows: Iterable[ExportRow], metrics: Sequence[HistoryMetric]) -> Iterator[ExportRow]:
+    """Keep only the values of `metrics`, in that order"""
+    columns = [HISTORY_METRICS.index(m) for m in metrics]
+    for uuid, timestamp, values in rows:
+        yield uuid, timestamp, [values[c] for c in columns]
+
+
+def _format_timestamp(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp / USEC_PER_SEC, timezone.utc).isoformat()
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def write_csv(file: TextIO, metrics: Sequence[HistoryMetric], rows: Iterable[ExportRow]) -> int:
+    writer = csv.writer(file)
+    writer.writerow(['timestamp', 'gpu_uuid'] + [m.value for m in metrics])
+    count = 0
+    for uuid, timestamp, values in rows:
+        writer.writerow([_format_timestamp(timestamp), uuid] + ['' if math.isnan(v) else v for v in values])
+        count += 1
+    return count
+
+
+def write_jsonl(file: TextIO, metrics: Sequence[HistoryMetric], rows: Iterable[ExportRow]) -> int:
+    names = [m.value for m in metrics]
+    count = 0
+    for uuid, timestamp, values in rows:
+        record = {'timestamp': _format_timestamp(timestamp), 'gpu_uuid': uuid}
+        record.update(zip(names, map(_optional, values)))
+        file.write(json.dumps(record))
+        file.write('\n')
+        count += 1
+    return count
+
+
+def write_parquet(file: BinaryIO, metrics: Sequence[HistoryMetric], rows: Iterable[ExportRow]) -> int:
+    """Write `rows` in row groups of `PARQUET_BATCH_ROWS`, needs the optional `pyarrow` package
+
+    Raises:
+        ImportError: if `pyarrow` isn't installed
+    """
+    try:
+        pa: Any = importlib.import_module('pyarrow')
+        pq: Any = importlib.import_module('pyarrow.parquet')
+    except ImportError:
+        raise ImportError("Exporting to Parquet requires the pyarrow package") from None
+
+    schema = pa.schema([('timestamp', pa.timestamp('us', tz='UTC')), ('gpu_uuid', pa.string())]
+                       + [(m.value, pa.float64()) for m in metrics])
+    count = 0
+    rows = iter(rows)
+    with pq.ParquetWriter(file, schema) as writer:
+        while True:
+            batch = list(islice(rows, PARQUET_BATCH_ROWS))
+            if not batch:
+                break
+            columns = [[r[1] for r in batch], [r[0] for r in batch]]
+            columns += [[_optional(r[2][i]) for r in batch] for i in range(len(metrics))]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            count += len(batch)
+    return count
+
+
+def write_export(file: Any, export_format: ExportFormat, metrics: Sequence[HistoryMetric],
+                 rows: Iterable[ExportRow]) -> int:
+    """Write `rows`, with the values of every `HistoryMetric`, to `file`
+
+    `file` is a binary file for Parquet, a text file otherwise.
+
+    Returns:
+        int: the number of rows written
+    """
+    rows = select_metrics(rows, metrics)
+    if export_format is ExportFormat.CSV:
+        return write_csv(file, metrics, rows)
+    if export_format is ExportFormat.JSONL:
+        return write_jsonl(file, metrics, rows)
+    return write_parquet(file, metrics, rows)
@@ -0,0 +1,65 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+from array import array
+from typing import List, Sequence, Tuple
+
+
+class SampleBuffer:
+    """Compact buffer of the last `max_len` samples, each a timestamp and a value per column.
+
+    Samples are stored unboxed in arrays, and trimmed in batches once twice as
+    many are stored, so appending is cheap enough to do on every poll.
+    """
+
+    def __init__(self, max_len: int, columns: int = 1) -> None:
+        self._max_len = max(1, max_len)
+        self._columns = columns
+        self._timestamps = array('q')
+        self._values: List[array] = [array('d') for _ in range(columns)]
+
+    def __len__(self) -> int:
+        return min(len(self._timestamps), self._max_len)
+
+    def append(self, timestamp: int, values: Sequence[float]) -> None:
+        if len(values) != self._columns:
+            raise ValueError("Invalid Argument: values length does not match number of columns")
+        self._timestamps.append(timestamp)
+        for column, value in zip(self._values, values):
+            column.append(value)
+        if len(self._timestamps) >= 2 * self._max_len:
+            del self._timestamps[:-self._max_len]
+            for column in self._values:
+                del column[:-self._max_len]
+
+    def resize(self, max_len: int) -> None:
+        """Keep the last `max_len` samples from now on, the stored ones are kept as far as they fit"""
+        self._max_len = max(1, max_len)
+        if len(self._timestamps) > self._max_len:
+            del self._timestamps[:-self._max_len]
+            for column in self._values:
+                del column[:-self._max_len]
+
+    def drain(self) -> Tuple[array, List[array]]:
+        """Remove and return the timestamps and the values of each column of the last `max_len` samples"""
+        timestamps = self._timestamps[-self._max_len:]
+        values = [column[-self._max_len:] for column in self._values]
+        self.clear()
+        return timestamps, values
+
+    def clear(self) -> None:
+        self._timestamps = array('q')
+        self._values = [array('d') for _ in range(self._columns)]
@@ -0,0 +1,136 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar, Union, overload
+
+T = TypeVar('T')
+
+
+class ChainedSequence(Sequence[T]):
+    """Read-only concatenation of sequences, without copying them.
+
+    Slicing returns another view, so chunks of memory mapped files can be joined and
+    trimmed while staying in the page cache. Chained sequences among the parts are
+    flattened into their own parts.
+    """
+
+    def __init__(self, parts: Iterable[Sequence[T]]) -> None:
+        self._parts: List[Sequence[T]] = []
+        for part in parts:
+            if isinstance(part, ChainedSequence):
+                self._parts.extend(part.parts)
+            elif len(part) > 0:
+                self._parts.append(part)
+        # end offset of each part
+        self._offsets: List[int] = list(accumulate(len(p) for p in self._parts))
+
+    @property
+    def parts(self) -> List[Sequence[T]]:
+        """The non-empty parts, in order"""
+        return list(self._parts)
+
+    def __len__(self) -> int:
+        return self._offsets[-1] if self._offsets else 0
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, Sequence[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            parts: List[Sequence[T]] = []
+            for part, end in zip(self._parts, self._offsets):
+                begin = end - len(part)
+                if begin < stop and start < end:
+                    parts.append(part[max(start, begin) - begin:min(stop, end) - begin])
+            return ChainedSequence(parts)
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("ChainedSequence index out of range")
+        part = bisect_right(self._offsets, index)
+        return self._parts[part][index - (self._offsets[part] - len(self._parts[part]))]
+
+    def __iter__(self) -> Iterator[T]:
+        for part in self._parts:
+            yield from part
+
+
+def chain_sequences(parts: Iterable[Sequence[T]]) -> Sequence[T]:
+    """Join `parts` without copying, returning the only part directly when there is just one"""
+    chained = ChainedSequence(parts)
+    if len(chained.parts) == 1:
+        return chained.parts[0]
+    return chained
+
+
+class OffsetSequence(Sequence[int]):
+    """Read-only view adding `offset` to every value of `base`"""
+
+    def __init__(self, base: Sequence[int], offset: int) -> None:
+        self._base = base
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[int]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, Sequence[int]]:
+        if isinstance(index, slice):
+            return OffsetSequence(self._base[index], self._offset)
+        return self._base[index] + self._offset
+
+    def __iter__(self) -> Iterator[int]:
+        offset = self._offset
+        for value in self._base:
+            yield value + offset
+
+
+def align_series(series: List[Tuple[Sequence[int], Sequence[float]]]) -> Tuple[Sequence[int], List[Sequence[float]]]:
+    """Join the (timestamps, values) of several series into shared timestamps and a column each.
+
+    Series recorded together, with the same number of samples from the same first
+    to the same last timestamp, share the timestamps of the first one and aren't
+    copied. Otherwise the samples are merged by timestamp, with NaN where a series
+    has none.
+    """
+    recorded = [timestamps for timestamps, _ in series if len(timestamps) > 0]
+    if not recorded:
+        return [], [[] for _ in series]
+    first = recorded[0]
+    if all(len(timestamps) == len(first) and timestamps[0] == first[0] and timestamps[-1] == first[-1]
+           for timestamps, _ in series):
+        return first, [values for _, values in series]
+
+    merged = sorted(set().union(*recorded))
+    columns: List[Sequence[float]] = []
+    for timestamps, values in series:
+        by_time: Dict[int, float] = dict(zip(timestamps, values))
+        columns.append([by_time.get(timestamp, math.nan) for timestamp in merged])
+    return merged, columns
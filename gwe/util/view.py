@@ -15,11 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Optional, Any, Dict, Tuple
+from typing import Optional, Any, Dict, Iterable, Tuple
 from gi.repository import Gio, GLib, Gtk, Gdk
 
 from gwe.conf import MIN_TEMP, MAX_TEMP, FAN_MAX_DUTY, GRAPH_COLOR_HEX
-from gwe.model.fan_profile import FanProfile
+from gwe.model.speed_step import SpeedStep
 
 
 def build_glib_option(long_name: str,
@@ -52,8 +52,8 @@ def rgba_to_hex(color: Gdk.RGBA) -> str:
                                                   int(color.blue * 255),
                                                   int(color.alpha * 255))
 
-def get_fan_profile_data(profile: FanProfile) -> Dict[int, int]:
-    data = {p.temperature: p.duty for p in profile.steps}
+def get_fan_profile_data(steps: Iterable[SpeedStep]) -> Dict[int, int]:
+    data = {p.temperature: p.duty for p in steps}
     if data:
         # if profile.single_step:
         #     data.update({MAX_TEMP: profile.steps[0].duty})
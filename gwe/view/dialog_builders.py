@@ -0,0 +1,27 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""The builders of the dialogs, apart from their views, so they can be provided
+without loading the views, which are only imported when a dialog is first shown.
+"""
+from typing import NewType
+
+from gi.repository import Gtk
+
+EditFanProfileBuilder = NewType('EditFanProfileBuilder', Gtk.Builder)
+EditOverclockProfileBuilder = NewType('EditOverclockProfileBuilder', Gtk.Builder)
+HistoricalDataBuilder = NewType('HistoricalDataBuilder', Gtk.Builder)
+PreferencesBuilder = NewType('PreferencesBuilder', Gtk.Builder)
@@ -16,7 +16,7 @@
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
 from collections import OrderedDict
-from typing import NewType, Optional, Dict, cast
+from typing import Optional, Dict, List, cast
 
 from gi.repository import Gtk
 from injector import singleton, inject
@@ -25,13 +25,14 @@ from gwe.conf import MIN_TEMP, FAN_MIN_DUTY, MAX_TEMP, FAN_MAX_DUTY
 from gwe.interactor.settings_interactor import SettingsInteractor
 from gwe.presenter.edit_fan_profile_presenter import EditFanProfileViewInterface, EditFanProfilePresenter
 from gwe.util.view import get_fan_profile_data
+from gwe.view.dialog_builders import EditFanProfileBuilder
+from gwe.view.main_view import MainBuilder
 from gwe.model.fan_profile import FanProfile
 from gwe.model.speed_step import SpeedStep
 from .widget.fan_profile_chart import FanProfileChart
 
 _LOG = logging.getLogger(__name__)
 
-EditFanProfileBuilder = NewType('EditFanProfileBuilder', Gtk.Builder)
 
 @singleton
 class EditFanProfileView(EditFanProfileViewInterface):
@@ -39,7 +40,8 @@ class EditFanProfileView(EditFanProfileViewInterface):
     def __init__(self,
                  presenter: EditFanProfilePresenter,
                  builder: EditFanProfileBuilder,
-                 settings_interactor: SettingsInteractor
+                 settings_interactor: SettingsInteractor,
+                 main_builder: MainBuilder,
                  ) -> None:
         _LOG.debug('init EditFanProfileView')
         self._presenter: EditFanProfilePresenter = presenter
@@ -48,6 +50,7 @@ class EditFanProfileView(EditFanProfileViewInterface):
         self._builder.connect_signals(self._presenter)
         self._settings_interactor = settings_interactor
         self._init_widgets()
+        self._dialog.set_transient_for(cast(Gtk.Window, main_builder.get_object('application_window')))
 
     def _init_widgets(self) -> None:
         self._dialog = cast(Gtk.Dialog, self._builder.get_object('dialog'))
@@ -76,9 +79,6 @@ class EditFanProfileView(EditFanProfileViewInterface):
             .get_object('delete_step_button'))
         self._init_plot_charts()
 
-    def set_transient_for(self, window: Gtk.Window) -> None:
-        self._dialog.set_transient_for(window)
-
     # pylint: disable=attribute-defined-outside-init
     def _init_plot_charts(self, ) -> None:
         scrolled_window = cast(Gtk.ScrolledWindow, self._builder.get_object('scrolled_window'))
@@ -89,11 +89,11 @@ class EditFanProfileView(EditFanProfileViewInterface):
         hysteresis = self._settings_interactor.get_int('settings_hysteresis')
         self._fan_chart.set_data(data, hysteresis)
 
-    def show(self, profile: FanProfile) -> None:
+    def show(self, profile: FanProfile, steps: List[SpeedStep]) -> None:
         self._treeselection.unselect_all()
         self._profile_name_entry.set_text(profile.name)
-        self.refresh_liststore(profile)
-        self.refresh_controls(profile=profile)
+        self.refresh_liststore(steps)
+        self.refresh_controls(profile=profile, steps=steps)
         self._dialog.show_all()
 
     def hide(self) -> None:
@@ -111,43 +111,38 @@ class EditFanProfileView(EditFanProfileViewInterface):
     def has_a_step_selected(self) -> bool:
         return self._treeselection.get_selected()[1] is not None
 
-    def refresh_liststore(self, profile: FanProfile) -> None:
+    def refresh_liststore(self, steps: List[SpeedStep]) -> None:
         self._liststore.clear()
-        for step in profile.steps:
+        for step in steps:
             self._liststore.append([step.id, step.temperature, step.duty])
-        if profile.steps:
-            if profile.steps[-1].temperature == MAX_TEMP or profile.steps[-1].duty == FAN_MAX_DUTY:
+        if steps:
+            if steps[-1].temperature == MAX_TEMP or steps[-1].duty == FAN_MAX_DUTY:
                 self._add_step_button.set_sensitive(False)
             else:
                 self._add_step_button.set_sensitive(True)
         else:
             self._add_step_button.set_sensitive(True)
 
-        self._plot_chart(get_fan_profile_data(profile))
+        self._plot_chart(get_fan_profile_data(steps))
 
     def refresh_controls(self,
                          step: Optional[SpeedStep] = None,
                          unselect_list: bool = False,
-                         profile: Optional[FanProfile] = None) -> None:
+                         profile: Optional[FanProfile] = None,
+                         steps: Optional[List[SpeedStep]] = None) -> None:
+        if steps is None:
+            steps = []
         if profile:
             self._vbios_silent_mode.set_active(profile.vbios_silent_mode)
-            self._vbios_silent_mode.set_sensitive(profile.steps)
+            self._vbios_silent_mode.set_sensitive(bool(steps))
 
         if unselect_list:
             self._treeselection.unselect_all()
         if step is None:
             self._controls_grid.set_sensitive(False)
         else:
-            prev_steps = (SpeedStep
-                          .select()
-                          .where(SpeedStep.profile == step.profile, SpeedStep.temperature < step.temperature)
-                          .order_by(SpeedStep.temperature.desc())
-                          .limit(1))
-            next_steps = (SpeedStep
-                          .select()
-                          .where(SpeedStep.profile == step.profile, SpeedStep.temperature > step.temperature)
-                          .order_by(SpeedStep.temperature)
-                          .limit(1))
+            prev_steps = [s for s in steps if s.temperature < step.temperature][-1:]
+            next_steps = [s for s in steps if s.temperature > step.temperature][:1]
             if not prev_steps:
                 self._temperature_adjustment.set_lower(MIN_TEMP)
                 self._duty_adjustment.set_lower(FAN_MIN_DUTY)
@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-from typing import NewType
 
 from gi.repository import Gtk
 from injector import singleton, inject
@@ -24,9 +23,10 @@ from gwe.model.overclock_profile import OverclockProfile
 from gwe.model.overclock import Overclock
 from gwe.presenter.edit_overclock_profile_presenter import EditOverclockProfileViewInterface, \
     EditOverclockProfilePresenter
+from gwe.view.dialog_builders import EditOverclockProfileBuilder
+from gwe.view.main_view import MainBuilder
 
 _LOG = logging.getLogger(__name__)
-EditOverclockProfileBuilder = NewType('EditOverclockProfileBuilder', Gtk.Builder)
 
 
 @singleton
@@ -35,6 +35,7 @@ class EditOverclockProfileView(EditOverclockProfileViewInterface):
     def __init__(self,
                  presenter: EditOverclockProfilePresenter,
                  builder: EditOverclockProfileBuilder,
+                 main_builder: MainBuilder,
                  ) -> None:
         _LOG.debug('init EditOverclockProfileView')
         self._presenter: EditOverclockProfilePresenter = presenter
@@ -42,6 +43,7 @@ class EditOverclockProfileView(EditOverclockProfileViewInterface):
         self._builder: Gtk.Builder = builder
         self._builder.connect_signals(self._presenter)
         self._init_widgets()
+        self._dialog.set_transient_for(main_builder.get_object('application_window'))
 
     def _init_widgets(self) -> None:
         self._dialog: Gtk.Dialog = self._builder.get_object('dialog')
@@ -56,9 +58,6 @@ class EditOverclockProfileView(EditOverclockProfileViewInterface):
         self._memory_offset_adjustment: Gtk.Adjustment = self._builder.get_object(
             'memory_offset_adjustment')
 
-    def set_transient_for(self, window: Gtk.Window) -> None:
-        self._dialog.set_transient_for(window)
-
     def show(self, profile: OverclockProfile, overclock: Overclock) -> None:
         self._update_ui(profile, overclock)
         self._dialog.show_all()
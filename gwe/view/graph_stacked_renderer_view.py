@@ -18,20 +18,20 @@
 # Code based on GNOME Usage from Petr Štětka
 #
 
-from typing import Optional
+import math
 import cairo
 
 from gi.repository import GObject, Gdk
 
-from ..model.graph_model import GraphModel, GraphModelIter
+from ..model.graph_snapshot import GraphSnapshot
 from .widget.graph_renderer import GraphRenderer
 
 
 class GraphStackedRenderer(GraphRenderer):
 
-    def __init__(self) -> None:
+    def __init__(self, column: int = 0) -> None:
         GraphRenderer.__init__(self)
-        self._column = 0
+        self._column = column
         self._line_width = 1.0
         self._stroke_color_rgba: Gdk.RGBA = Gdk.RGBA(0.5, 0.5, 0.5, 1)
         self._stacked_color_rgba: Gdk.RGBA = Gdk.RGBA(0.5, 0.5, 0.5, 0.5)
@@ -46,7 +46,7 @@ class GraphStackedRenderer(GraphRenderer):
         self._line_width = width
 
     def render(self,
-                  table: GraphModel,
+                  table: GraphSnapshot,
                   begin_time: int,
                   end_time: int,
                   y_begin: float,
@@ -55,24 +55,27 @@ class GraphStackedRenderer(GraphRenderer):
                   area: Gdk.Rectangle) -> None:
         cairo_context.save()
 
-        timespan = float(end_time - begin_time)
-        model_iter: Optional[GraphModelIter] = table.get_iter_first()
-        if model_iter is not None:
-            model_iter.next()
-            chunk = area.width / (table.max_samples - 1) / 2.0
-            last_x = self._calc_x(model_iter, begin_time, timespan, area.width)
-            last_y = float(area.height)
+        xs, ys = self._get_points(table, begin_time, end_time, y_begin, y_end, area, self._column)
+        if not xs:
+            cairo_context.restore()
+            return
+        chunk = self._get_chunk(table, area)
+        last_x = xs[0]
+        last_y = float(area.height)
 
-            cairo_context.move_to(last_x, last_y)
+        cairo_context.move_to(last_x, last_y)
 
-            while model_iter.next():
-                x = self._calc_x(model_iter, begin_time, timespan, area.width)
-                y = self._calc_y(model_iter, y_begin, y_end, area.height, self._column)
+        for x, y in zip(xs[1:], ys[1:]):
+            if math.isnan(y):
+                # missing sample, drop to the baseline
+                y = float(area.height)
 
-                cairo_context.curve_to(last_x + chunk, last_y, last_x + chunk, y, x, y)
+            # decimated points can be closer than the samples spacing
+            control = min(chunk, (x - last_x) / 2.0)
+            cairo_context.curve_to(last_x + control, last_y, last_x + control, y, x, y)
 
-                last_x = x
-                last_y = y
+            last_x = x
+            last_y = y
 
         # save path for stroke color
         stroke_path = cairo_context.copy_path()
@@ -96,23 +99,3 @@ class GraphStackedRenderer(GraphRenderer):
                                       self._stacked_color_rgba.alpha)
         cairo_context.stroke()
         cairo_context.restore()
-
-    @staticmethod
-    def _calc_x(model_iter: GraphModelIter, begin: int, timespan: float, width: int) -> float:
-        timestamp: int = model_iter.timestamp
-        return (timestamp - begin) / timespan * width
-
-    @staticmethod
-    def _calc_y(model_iter: GraphModelIter,
-                range_begin: float,
-                range_end: float,
-                height: int,
-                column: int) -> float:
-        y = 0.0
-        y = float( model_iter.get_value(column) )
-
-        y -= range_begin
-        y /= (range_end - range_begin)
-        y = height - (y * height)
-
-        return y
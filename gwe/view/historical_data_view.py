@@ -17,19 +17,24 @@
 from enum import Enum
 import time
 import logging
-from typing import Dict, NewType, Tuple, Any, cast
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Any, cast
 
 from gi.repository import Gtk, GLib, Gdk, GObject
 from gi.repository.GObject import TYPE_DOUBLE
 from injector import singleton, inject
 
-from gwe.conf import GRAPH_COLOR_HEX
+from gwe.conf import GRAPH_GPU_COLORS_HEX
 from gwe.model.clocks import Clocks
 from gwe.presenter.historical_data_presenter import GRAPH_INIT, HistoricalDataViewInterface, HistoricalDataPresenter, MONITORING_INTERVAL, \
     GraphType
 from ..model.graph_model import GraphModel
+from .widget.graph_rasterizer import GraphRasterizer
+from .widget.graph_renderer import GraphLineRenderer, GraphRenderer
+from .widget.graph_scroll_driver import GraphScrollDriver
 from .widget.graph_view import GraphView
-from gwe.repository.nvidia_repository import NvidiaRepository
+from gwe.view.dialog_builders import HistoricalDataBuilder
+from gwe.view.main_view import MainBuilder
 from gwe.view.graph_stacked_renderer_view import GraphStackedRenderer
 
 _LOG = logging.getLogger(__name__)
@@ -38,7 +43,6 @@ GV_MIN_VALUE = 0
 GV_MAX_VALUE = 1
 GV_CUR_VALUE = 2
 
-HistoricalDataBuilder = NewType('HistoricalDataBuilder', Gtk.Builder)
 
 @singleton
 class HistoricalDataView(HistoricalDataViewInterface):
@@ -46,28 +50,33 @@ class HistoricalDataView(HistoricalDataViewInterface):
     def __init__(self,
                  presenter: HistoricalDataPresenter,
                  builder: HistoricalDataBuilder,
-                 nvidia_repository: NvidiaRepository,
+                 main_builder: MainBuilder,
                  ) -> None:
         _LOG.debug('init HistoricalDataView')
         self._presenter: HistoricalDataPresenter = presenter
         self._presenter.view = self
         self._builder: Gtk.Builder = builder
         self._builder.connect_signals(self._presenter)
-        self._nvidia_repository = nvidia_repository
         self._graphs: Dict[GraphType, Dict[str, Any]] = {}
-        self._initial_show = True
+        self._max_values: Optional[Tuple[int, Clocks]] = None
+        # all the graphs are rendered on the same worker thread
+        self._rasterizer = GraphRasterizer()
         self._init_widgets()
+        self._dialog.set_transient_for(cast(Gtk.Window, main_builder.get_object('application_window')))
 
     def _init_widgets(self) -> None:
         self._dialog = cast(Gtk.Dialog, self._builder.get_object('dialog'))
         assert self._dialog is not None
         self._init_graphs()
 
-    def set_transient_for(self, window: Gtk.Window) -> None:
-        self._dialog.set_transient_for(window)
+    def set_max_values(self, mem_total: int, max_clocks: Clocks) -> None:
+        self._max_values = (mem_total, max_clocks)
+        self._init_max_values()
 
     def _init_max_values(self) -> None:
-        mem_total, max_clocks = self._nvidia_repository.get_max_values()
+        if self._max_values is None:
+            return
+        mem_total, max_clocks = self._max_values
 
         if max_clocks.graphic_max is not None:
             self._graph_models[GraphType.GPU_CLOCK].value_max = max_clocks.graphic_max
@@ -79,9 +88,14 @@ class HistoricalDataView(HistoricalDataViewInterface):
 
 
     # pylint: disable=attribute-defined-outside-init
-    def _init_graphs(self) -> None:
+    def _init_graphs(self, gpu_count: int = 1) -> None:
         self._graph_views: Dict[GraphType, Tuple[Gtk.Label, Gtk.Label, Gtk.Label]] = {}
         self._graph_models: Dict[GraphType, GraphModel] = {}
+        self._graph_widgets: Dict[GraphType, GraphView] = {}
+        self._gpu_count = max(1, gpu_count)
+        self._gpu_index = 0
+        # all the graphs scroll together, on the same frames
+        self._scroll_driver = GraphScrollDriver(self._presenter.get_scroll_fps())
 
         for graph_type in GraphType:
             self._graph_container = cast(Gtk.Frame, self._builder.get_object(f'graph_container_{graph_type.value}'))
@@ -89,12 +103,13 @@ class HistoricalDataView(HistoricalDataViewInterface):
                                                 cast(Gtk.Label, self._builder.get_object(f'graph_max_value_{graph_type.value}')),
                                                 cast(Gtk.Label, self._builder.get_object(f'graph_max_axis_{graph_type.value}')))
 
-            max_samples: float = int( MONITORING_INTERVAL / self._presenter.get_refresh_interval() + 1 )
+            max_samples = self._get_live_max_samples()
             timespan: int = MONITORING_INTERVAL * 1000 * 1000
             init = GRAPH_INIT[graph_type]
 
+            # a column per GPU
             graph_model = GraphModel(
-                column_names=["Col0"],
+                column_names=[f"Col{i}" for i in range(self._gpu_count)],
                 max_samples=max_samples,
                 timespan=timespan,
                 value_min=init.min_value,
@@ -112,26 +127,45 @@ class HistoricalDataView(HistoricalDataViewInterface):
                                 type(self)._on_notify_min,
                                 self._graph_views[graph_type][GV_MIN_VALUE])
 
-            graph_view = GraphView(graph_model)
-            graph_renderer = GraphStackedRenderer()
+            graph_view = GraphView(graph_model, self._scroll_driver, self._rasterizer)
             graph_view.set_hexpand(True)
             graph_view.props.height_request = 80
-            graph_renderer.set_line_width(1.5)
-            stroke_color = Gdk.RGBA()
-            stroke_color.parse(GRAPH_COLOR_HEX)
-            stacked_color = Gdk.RGBA()
-            stacked_color.parse(GRAPH_COLOR_HEX)
-            stacked_color.alpha = 0.5
-            graph_renderer.set_stroke_color_rgba(stroke_color)
-            graph_renderer.set_stacked_color_rgba(stacked_color)
-
-            graph_view.add_renderer(graph_renderer)
+            graph_view.set_renderers(self._create_renderers())
+            graph_view.connect("range-changed", self._on_graph_range_changed)
 
+            old_view = self._graph_container.get_child()
+            if old_view is not None:
+                old_view.destroy()
             self._graph_container.add(graph_view)
 
-            graph_model.append(GLib.get_monotonic_time(), 0.0)
+            graph_model.append(GLib.get_monotonic_time(), *([0.0] * self._gpu_count))
 
             self._graph_models[graph_type] = graph_model
+            self._graph_widgets[graph_type] = graph_view
+
+    def _get_live_max_samples(self) -> int:
+        return self._presenter.get_live_max_samples()
+
+    def _create_renderers(self) -> List[GraphRenderer]:
+        """The other GPUs as lines, under the selected one drawn as a filled area"""
+        renderers: List[GraphRenderer] = []
+        for column in range(self._gpu_count):
+            if column != self._gpu_index:
+                renderers.append(GraphLineRenderer(self._get_gpu_color(column, 0.8), 1.0, column))
+
+        graph_renderer = GraphStackedRenderer(self._gpu_index)
+        graph_renderer.set_line_width(1.5)
+        graph_renderer.set_stroke_color_rgba(self._get_gpu_color(self._gpu_index))
+        graph_renderer.set_stacked_color_rgba(self._get_gpu_color(self._gpu_index, 0.5))
+        renderers.append(graph_renderer)
+        return renderers
+
+    @staticmethod
+    def _get_gpu_color(gpu_index: int, alpha: float = 1.0) -> Gdk.RGBA:
+        color = Gdk.RGBA()
+        color.parse(GRAPH_GPU_COLORS_HEX[gpu_index % len(GRAPH_GPU_COLORS_HEX)])
+        color.alpha = alpha
+        return color
 
     @staticmethod
     def _on_notify_min(model: GraphModel, _pspec: GObject.ParamSpec, label: Gtk.Label) -> None:
@@ -141,26 +175,72 @@ class HistoricalDataView(HistoricalDataViewInterface):
     def _on_notify_max(model: GraphModel, _pspec: GObject.ParamSpec, label: Gtk.Label) -> None:
         label.set_text(f"{model.value_max:.0f}")
 
-    def reset_graphs(self) -> None:
-        self._init_graphs()
+    def _on_graph_range_changed(self, _graph_view: GraphView, timespan: int, end_time: int) -> None:
+        self._presenter.on_graph_range_changed(timespan, end_time if end_time != 0 else None)
+
+    def set_graph_range(self, timespan: int, end_time: Optional[int]) -> None:
+        """Zoom and pan all the graphs together"""
+        for graph_type, graph_view in self._graph_widgets.items():
+            self._graph_models[graph_type].timespan = timespan
+            graph_view.set_end_time(end_time)
+
+    def reset_graphs(self, gpu_count: int) -> None:
+        self._init_graphs(gpu_count)
         self._init_max_values()
 
-    def refresh_graphs(self, data_dict: Dict[GraphType, Tuple[int, float]]) -> None:
+    def select_gpu(self, gpu_index: int) -> None:
+        """Highlight the GPU `gpu_index`, the graphs keep the data of every GPU"""
+        self._gpu_index = gpu_index
+        for graph_type, graph_view in self._graph_widgets.items():
+            graph_view.set_renderers(self._create_renderers())
+            last_row = self._graph_models[graph_type].get_iter_last()
+            if last_row.next():
+                self._set_current_value(graph_type, last_row.get_value(gpu_index))
+
+    def _set_current_value(self, graph_type: GraphType, value: float) -> None:
+        if not math.isnan(value):
+            self._graph_views[graph_type][GV_CUR_VALUE].set_text(f"{value} {GRAPH_INIT[graph_type].unit}")
+
+    def set_current_values(self, data_dict: Dict[GraphType, Tuple[int, List[float]]]) -> None:
+        for graph_type, (_, values) in data_dict.items():
+            self._set_current_value(graph_type, values[self._gpu_index])
+
+    def refresh_graphs(self, data_dict: Dict[GraphType, Tuple[int, List[float]]]) -> None:
         time1 = time.time()
-        for graph_type, data in data_dict.items():
-            unit = GRAPH_INIT[graph_type].unit
-            self._graph_views[graph_type][GV_CUR_VALUE].set_text(f"{data[1]} {unit}")
+        for graph_type, (timestamp, values) in data_dict.items():
+            self._set_current_value(graph_type, values[self._gpu_index])
 
             model = self._graph_models[graph_type]
-            model.append(data[0], data[1])
+            model.append(timestamp, *values)
 
         time2 = time.time()
         _LOG.debug(f'Refresh graph took {((time2 - time1) * 1000.0):.3f} ms')
 
+    def extend_graphs(self, data_dict: Dict[GraphType, Tuple[Sequence[int], List[Sequence[float]]]]) -> None:
+        """Append the samples buffered while the dialog was hidden, with one `changed` per graph"""
+        for graph_type, (timestamps, columns) in data_dict.items():
+            if len(timestamps) == 0:
+                continue
+            self._set_current_value(graph_type, columns[self._gpu_index][-1])
+            self._graph_models[graph_type].extend(zip(timestamps, zip(*columns)))
+
+    def load_history(self, graph_type: GraphType, timestamps: Sequence[int], columns: List[Sequence[float]]) -> None:
+        model = self._graph_models[graph_type]
+        # a zoomed out range can have more rows than the graph shows live
+        model.max_samples = max(self._get_live_max_samples(), len(timestamps))
+        model.wrap(timestamps, *columns)
+        if len(model) == 0:
+            model.append(GLib.get_monotonic_time(), *([0.0] * len(columns)))
+
+    def resize_graphs(self, max_samples: int) -> None:
+        """Change how many samples the graphs keep live, the oldest ones are dropped when it's less"""
+        for model in self._graph_models.values():
+            model.max_samples = max_samples
+
+    def set_scroll_fps(self, fps: int) -> None:
+        self._scroll_driver.set_max_fps(fps)
+
     def show(self) -> None:
-        if self._initial_show:
-            self._initial_show
-            self._init_max_values()
         self._dialog.show_all()
 
     def hide(self) -> None:
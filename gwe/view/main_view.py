@@ -29,7 +29,7 @@ from injector import inject, singleton
 from gi.repository import Gtk
 
 from gwe.interactor.settings_interactor import SettingsInteractor
-from gwe.model.fan_profile import FanProfile
+from gwe.model.speed_step import SpeedStep
 from gwe.model.gpu_status import GpuStatus
 from .widget.fan_profile_chart import FanProfileChart
 _LOG = logging.getLogger(__name__)
@@ -53,11 +53,7 @@ except (ImportError, ValueError):
     except (ImportError, ValueError):
         HAS_MODULE_INDICATOR = False
 
-from gwe.view.edit_fan_profile_view import EditFanProfileView
 from gwe.util.view import hide_on_delete, get_fan_profile_data
-from gwe.view.edit_overclock_profile_view import EditOverclockProfileView
-from gwe.view.historical_data_view import HistoricalDataView
-from gwe.view.preferences_view import PreferencesView
 from gwe.conf import APP_PACKAGE_NAME, APP_ID, APP_NAME, APP_VERSION, APP_SOURCE_URL, APP_ICON_NAME_SYMBOLIC
 from gwe.presenter.main_presenter import MainPresenter, MainViewInterface
 
@@ -73,19 +69,11 @@ class MainView(MainViewInterface):
     @inject
     def __init__(self,
                  presenter: MainPresenter,
-                 edit_fan_profile_view: EditFanProfileView,
-                 edit_overclock_profile_view: EditOverclockProfileView,
-                 historical_data_view: HistoricalDataView,
-                 preferences_view: PreferencesView,
                  builder: MainBuilder,
                  settings_interactor: SettingsInteractor,
                  ) -> None:
         _LOG.debug('init MainView')
         self._presenter: MainPresenter = presenter
-        self._edit_fan_profile_view = edit_fan_profile_view
-        self._edit_overclock_profile_view = edit_overclock_profile_view
-        self._historical_data_view = historical_data_view
-        self._preferences_view = preferences_view
         self._presenter.main_view = self
         self._builder: Gtk.Builder = builder
         self._settings_interactor = settings_interactor
@@ -95,10 +83,6 @@ class MainView(MainViewInterface):
     def _init_widgets(self) -> None:
         self._app_indicator: Optional[AppIndicator3.Indicator] = None
         self._window = cast(Gtk.ApplicationWindow, self._builder.get_object("application_window"))
-        self._edit_fan_profile_view.set_transient_for(self._window)
-        self._edit_overclock_profile_view.set_transient_for(self._window)
-        self._historical_data_view.set_transient_for(self._window)
-        self._preferences_view.set_transient_for(self._window)
         self._main_menu = cast(Gtk.Menu, self._builder.get_object("main_menu"))
         self._main_infobar = cast(Gtk.InfoBar, self._builder.get_object("main_infobar"))
         self._main_infobar.connect("response", lambda b, _: b.set_revealed(False))
@@ -239,88 +223,9 @@ class MainView(MainViewInterface):
             gpu_status = status[gpu_index]
             if self._first_refresh:
                 self._first_refresh = False
-                self._set_entry_text(self._info_name_entry, gpu_status.info.name)
-                self._set_entry_text(self._info_vbios_entry, gpu_status.info.vbios)
-                self._set_entry_text(self._info_driver_entry, gpu_status.info.driver)
-                self._set_entry_text(self._info_cuda_entry, "{}", gpu_status.info.cuda_cores)
-                self._set_entry_text(self._info_uuid_entry, gpu_status.info.uuid)
-                self._set_entry_text(self._info_memory_interface_entry, "{} bit", gpu_status.info.memory_interface)
-                self._set_entry_text(self._power_min_entry, "{} W", gpu_status.power.minimum)
-                self._set_entry_text(self._power_max_entry, "{} W", gpu_status.power.maximum)
-                self._set_label_markup(self._temp_max_gpu_value,
-                                       "<span size=\"large\">{}</span> °C", gpu_status.temp.maximum)
-                self._set_label_markup(self._temp_slowdown_value,
-                                       "<span size=\"large\">{}</span> °C", gpu_status.temp.slowdown)
-                self._set_label_markup(self._temp_shutdown_value,
-                                       "<span size=\"large\">{}</span> °C", gpu_status.temp.shutdown)
-                self._overclock_frame.set_sensitive(gpu_status.overclock.available)
-                self._overclock_warning_label.set_visible(not gpu_status.overclock.available)
-                self._fan_profile_frame.set_sensitive(gpu_status.fan.control_allowed)
-                self._fan_warning_label.set_visible(not gpu_status.fan.control_allowed)
-                self._remove_level_bar_offsets(self._info_gpu_usage_levelbar)
-                self._remove_level_bar_offsets(self._info_memory_usage_levelbar)
-                self._remove_level_bar_offsets(self._info_encoder_usage_levelbar)
-                self._remove_level_bar_offsets(self._info_decoder_usage_levelbar)
-                minimum = gpu_status.power.minimum
-                maximum = gpu_status.power.maximum
-                default = gpu_status.power.default
-                limit = gpu_status.power.limit
-                if (minimum is not None and maximum is not None
-                        and default is not None and limit is not None
-                        and minimum != maximum):
-                    self._power_limit_adjustment.set_lower(minimum)
-                    self._power_limit_adjustment.set_upper(maximum)
-                    self._power_limit_adjustment.set_value(limit)
-                    self._power_limit_scale.clear_marks()
-                    self._power_limit_scale.add_mark(default, Gtk.PositionType.BOTTOM, f"{default:.0f}")
-                    self._power_limit_scale.set_sensitive(True)
-                    self._power_limit_apply_button.set_sensitive(True)
-                else:
-                    self._power_limit_scale.set_sensitive(False)
-                    self._power_limit_apply_button.set_sensitive(False)
-
-            self._set_entry_text(self._info_pcie_entry, "{}x Gen{} @ {}x Gen{}",
-                                 gpu_status.info.pcie_max_link,
-                                 gpu_status.info.pcie_max_generation,
-                                 gpu_status.info.pcie_current_link,
-                                 gpu_status.info.pcie_current_generation)
-            self._set_entry_text(self._info_memory_entry, "{} MiB / {} MiB",
-                                 gpu_status.info.memory_used,
-                                 gpu_status.info.memory_total)
-            self._set_entry_text(self._info_memory_usage_entry, "{}%", gpu_status.info.memory_usage)
-            self._set_entry_text(self._info_gpu_usage_entry, "{}%", gpu_status.info.gpu_usage)
-            self._set_entry_text(self._info_encoder_usage_entry, "{}%", gpu_status.info.encoder_usage)
-            self._set_entry_text(self._info_decoder_usage_entry, "{}%", gpu_status.info.decoder_usage)
-            self._set_entry_text(self._power_draw_entry, "{:.2f} W", gpu_status.power.draw)
-            self._set_entry_text(self._power_limit_entry, "{:.0f} W", gpu_status.power.limit)
-            self._set_entry_text(self._power_default_entry, "{:.0f} W", gpu_status.power.default)
-            self._set_entry_text(self._power_enforced_entry, "{:.0f} W", gpu_status.power.enforced)
-            self._set_entry_text(self._clocks_graphics_current_entry, "{} MHz", gpu_status.clocks.graphic_current)
-            self._set_entry_text(self._clocks_graphics_max_entry, "{} MHz", gpu_status.clocks.graphic_max)
-            self._set_entry_text(self._clocks_sm_current_entry, "{} MHz", gpu_status.clocks.sm_current)
-            self._set_entry_text(self._clocks_sm_max_entry, "{} MHz", gpu_status.clocks.sm_max)
-            self._set_entry_text(self._clocks_memory_current_entry, "{} MHz", gpu_status.clocks.memory_current)
-            self._set_entry_text(self._clocks_memory_max_entry, "{} MHz", gpu_status.clocks.memory_max)
-            self._set_entry_text(self._clocks_video_current_entry, "{} MHz", gpu_status.clocks.video_current)
-            self._set_entry_text(self._clocks_video_max_entry, "{} MHz", gpu_status.clocks.video_max)
-            self._set_level_bar(self._info_gpu_usage_levelbar, gpu_status.info.gpu_usage)
-            self._set_level_bar(self._info_memory_usage_levelbar, gpu_status.info.memory_usage)
-            self._set_level_bar(self._info_encoder_usage_levelbar, gpu_status.info.encoder_usage)
-            self._set_level_bar(self._info_decoder_usage_levelbar, gpu_status.info.decoder_usage)
-            if gpu_status.overclock.available:
-                self._set_entry_text(self._overclock_gpu_offset_entry, "{} MHz", gpu_status.overclock.gpu_offset)
-                self._set_entry_text(self._overclock_mem_offset_entry, "{} MHz", gpu_status.overclock.memory_offset)
-            self._set_label_markup(self._temp_gpu_value,
-                                   "<span size=\"xx-large\">{}</span> °C", gpu_status.temp.gpu)
-            for index, value in enumerate(self._fan_duty):
-                if gpu_status.fan.fan_list and index < len(gpu_status.fan.fan_list):
-                    self._set_label_markup(value,
-                                           "<span size=\"large\">{}</span> %", gpu_status.fan.fan_list[index][0])
-                    self._set_label_markup(self._fan_rpm[index],
-                                           "<span size=\"large\">{}</span> RPM", gpu_status.fan.fan_list[index][1])
-                else:
-                    value.set_visible(False)
-                    self._fan_rpm[index].set_visible(False)
+                self._refresh_info(gpu_status)
+                self._refresh_controls(gpu_status)
+            self._refresh_values(gpu_status)
 
             if HAS_MODULE_INDICATOR and self._app_indicator:
                 if self._settings_interactor.get_bool('settings_show_app_indicator'):
@@ -332,6 +237,100 @@ class MainView(MainViewInterface):
                 else:
                     self._app_indicator.set_label("", "")
 
+    def refresh_cached_status(self, status: List[GpuStatus], gpu_index: int) -> None:
+        """Show the status saved by the last session until the first one is read, the controls stay insensitive"""
+        if gpu_index < len(status):
+            self._refresh_info(status[gpu_index])
+            self._refresh_values(status[gpu_index])
+
+    def _refresh_info(self, gpu_status: GpuStatus) -> None:
+        self._set_entry_text(self._info_name_entry, gpu_status.info.name)
+        self._set_entry_text(self._info_vbios_entry, gpu_status.info.vbios)
+        self._set_entry_text(self._info_driver_entry, gpu_status.info.driver)
+        self._set_entry_text(self._info_cuda_entry, "{}", gpu_status.info.cuda_cores)
+        self._set_entry_text(self._info_uuid_entry, gpu_status.info.uuid)
+        self._set_entry_text(self._info_memory_interface_entry, "{} bit", gpu_status.info.memory_interface)
+        self._set_entry_text(self._power_min_entry, "{} W", gpu_status.power.minimum)
+        self._set_entry_text(self._power_max_entry, "{} W", gpu_status.power.maximum)
+        self._set_label_markup(self._temp_max_gpu_value,
+                               "<span size=\"large\">{}</span> °C", gpu_status.temp.maximum)
+        self._set_label_markup(self._temp_slowdown_value,
+                               "<span size=\"large\">{}</span> °C", gpu_status.temp.slowdown)
+        self._set_label_markup(self._temp_shutdown_value,
+                               "<span size=\"large\">{}</span> °C", gpu_status.temp.shutdown)
+
+    def _refresh_controls(self, gpu_status: GpuStatus) -> None:
+        self._overclock_frame.set_sensitive(gpu_status.overclock.available)
+        self._overclock_warning_label.set_visible(not gpu_status.overclock.available)
+        self._fan_profile_frame.set_sensitive(gpu_status.fan.control_allowed)
+        self._fan_warning_label.set_visible(not gpu_status.fan.control_allowed)
+        self._remove_level_bar_offsets(self._info_gpu_usage_levelbar)
+        self._remove_level_bar_offsets(self._info_memory_usage_levelbar)
+        self._remove_level_bar_offsets(self._info_encoder_usage_levelbar)
+        self._remove_level_bar_offsets(self._info_decoder_usage_levelbar)
+        minimum = gpu_status.power.minimum
+        maximum = gpu_status.power.maximum
+        default = gpu_status.power.default
+        limit = gpu_status.power.limit
+        if (minimum is not None and maximum is not None
+                and default is not None and limit is not None
+                and minimum != maximum):
+            self._power_limit_adjustment.set_lower(minimum)
+            self._power_limit_adjustment.set_upper(maximum)
+            self._power_limit_adjustment.set_value(limit)
+            self._power_limit_scale.clear_marks()
+            self._power_limit_scale.add_mark(default, Gtk.PositionType.BOTTOM, f"{default:.0f}")
+            self._power_limit_scale.set_sensitive(True)
+            self._power_limit_apply_button.set_sensitive(True)
+        else:
+            self._power_limit_scale.set_sensitive(False)
+            self._power_limit_apply_button.set_sensitive(False)
+
+    def _refresh_values(self, gpu_status: GpuStatus) -> None:
+        self._set_entry_text(self._info_pcie_entry, "{}x Gen{} @ {}x Gen{}",
+                             gpu_status.info.pcie_max_link,
+                             gpu_status.info.pcie_max_generation,
+                             gpu_status.info.pcie_current_link,
+                             gpu_status.info.pcie_current_generation)
+        self._set_entry_text(self._info_memory_entry, "{} MiB / {} MiB",
+                             gpu_status.info.memory_used,
+                             gpu_status.info.memory_total)
+        self._set_entry_text(self._info_memory_usage_entry, "{}%", gpu_status.info.memory_usage)
+        self._set_entry_text(self._info_gpu_usage_entry, "{}%", gpu_status.info.gpu_usage)
+        self._set_entry_text(self._info_encoder_usage_entry, "{}%", gpu_status.info.encoder_usage)
+        self._set_entry_text(self._info_decoder_usage_entry, "{}%", gpu_status.info.decoder_usage)
+        self._set_entry_text(self._power_draw_entry, "{:.2f} W", gpu_status.power.draw)
+        self._set_entry_text(self._power_limit_entry, "{:.0f} W", gpu_status.power.limit)
+        self._set_entry_text(self._power_default_entry, "{:.0f} W", gpu_status.power.default)
+        self._set_entry_text(self._power_enforced_entry, "{:.0f} W", gpu_status.power.enforced)
+        self._set_entry_text(self._clocks_graphics_current_entry, "{} MHz", gpu_status.clocks.graphic_current)
+        self._set_entry_text(self._clocks_graphics_max_entry, "{} MHz", gpu_status.clocks.graphic_max)
+        self._set_entry_text(self._clocks_sm_current_entry, "{} MHz", gpu_status.clocks.sm_current)
+        self._set_entry_text(self._clocks_sm_max_entry, "{} MHz", gpu_status.clocks.sm_max)
+        self._set_entry_text(self._clocks_memory_current_entry, "{} MHz", gpu_status.clocks.memory_current)
+        self._set_entry_text(self._clocks_memory_max_entry, "{} MHz", gpu_status.clocks.memory_max)
+        self._set_entry_text(self._clocks_video_current_entry, "{} MHz", gpu_status.clocks.video_current)
+        self._set_entry_text(self._clocks_video_max_entry, "{} MHz", gpu_status.clocks.video_max)
+        self._set_level_bar(self._info_gpu_usage_levelbar, gpu_status.info.gpu_usage)
+        self._set_level_bar(self._info_memory_usage_levelbar, gpu_status.info.memory_usage)
+        self._set_level_bar(self._info_encoder_usage_levelbar, gpu_status.info.encoder_usage)
+        self._set_level_bar(self._info_decoder_usage_levelbar, gpu_status.info.decoder_usage)
+        if gpu_status.overclock.available:
+            self._set_entry_text(self._overclock_gpu_offset_entry, "{} MHz", gpu_status.overclock.gpu_offset)
+            self._set_entry_text(self._overclock_mem_offset_entry, "{} MHz", gpu_status.overclock.memory_offset)
+        self._set_label_markup(self._temp_gpu_value,
+                               "<span size=\"xx-large\">{}</span> °C", gpu_status.temp.gpu)
+        self._fan_chart.set_temperature(gpu_status.temp.gpu)
+        for index, value in enumerate(self._fan_duty):
+            if gpu_status.fan.fan_list and index < len(gpu_status.fan.fan_list):
+                self._set_label_markup(value,
+                                       "<span size=\"large\">{}</span> %", gpu_status.fan.fan_list[index][0])
+                self._set_label_markup(self._fan_rpm[index],
+                                       "<span size=\"large\">{}</span> RPM", gpu_status.fan.fan_list[index][1])
+            else:
+                value.set_visible(False)
+                self._fan_rpm[index].set_visible(False)
+
     @staticmethod
     def _set_entry_text(label: Gtk.Entry, text: Optional[str], *args: Any) -> None:
         if text is not None and None not in args:
@@ -366,14 +365,14 @@ class MainView(MainViewInterface):
             levelbar.set_value(0)
             levelbar.set_sensitive(False)
 
-    def refresh_chart(self, profile: Optional[FanProfile] = None, reset: bool = False) -> None:
-        if profile is None and reset is None:
+    def refresh_chart(self, steps: Optional[List[SpeedStep]] = None, reset: bool = False) -> None:
+        if steps is None and reset is None:
             raise ValueError("Both parameters are note!")
 
         if reset:
             self._plot_chart({})
         else:
-            self._plot_chart(get_fan_profile_data(profile))
+            self._plot_chart(get_fan_profile_data(steps))
 
     def refresh_fan_profile_combobox(self, data: List[Tuple[int, str]], active: Optional[int]) -> None:
         self._fan_liststore.clear()
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-from typing import Dict, Any, NewType
+from typing import Dict, Any
 
 from gi.repository import Gtk
 from injector import singleton, inject
@@ -23,9 +23,10 @@ from injector import singleton, inject
 from gwe.presenter.preferences_presenter import PreferencesViewInterface, PreferencesPresenter
 from gwe.util.deployment import is_flatpak
 from gwe.util.view import hide_on_delete
+from gwe.view.dialog_builders import PreferencesBuilder
+from gwe.view.main_view import MainBuilder
 
 _LOG = logging.getLogger(__name__)
-PreferencesBuilder = NewType('PreferencesBuilder', Gtk.Builder)
 
 
 @singleton
@@ -34,6 +35,7 @@ class PreferencesView(PreferencesViewInterface):
     def __init__(self,
                  presenter: PreferencesPresenter,
                  builder: PreferencesBuilder,
+                 main_builder: MainBuilder,
                  ) -> None:
         _LOG.debug('init PreferencesView')
         self._presenter: PreferencesPresenter = presenter
@@ -41,6 +43,7 @@ class PreferencesView(PreferencesViewInterface):
         self._builder: Gtk.Builder = builder
         self._builder.connect_signals(self._presenter)
         self._init_widgets()
+        self._dialog.set_transient_for(main_builder.get_object('application_window'))
 
     def _init_widgets(self) -> None:
         self._dialog: Gtk.Dialog = self._builder.get_object('dialog')
@@ -50,9 +53,6 @@ class PreferencesView(PreferencesViewInterface):
             self._builder.get_object('settings_launch_on_login_description_label')\
                 .set_text("Not supported by Flatpak (see https://github.com/flatpak/flatpak/issues/118)")
 
-    def set_transient_for(self, window: Gtk.Window) -> None:
-        self._dialog.set_transient_for(window)
-
     def show(self) -> None:
         self._dialog.show_all()
 
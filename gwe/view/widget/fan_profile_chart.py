@@ -15,48 +15,46 @@
 # You should have received a copy of the GNU General Public License
 # along with gwe.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Dict, OrderedDict, cast
+from typing import Dict, Optional, OrderedDict, Tuple, cast
 import cairo
 from gi.repository import Gtk, Gdk, GObject
 
 from gwe.conf import GRAPH_COLOR_HEX
 
-class FanProfileChart(Gtk.DrawingArea):
-    """Custom widget for plotting fan speed profiles."""
-    __gtype_name__ = "FanProfileChart"
+class FanProfilePlot:
+    """Draws a fan speed profile with cairo only, so it can be rendered off-screen.
 
-    def __init__(self) -> None:
-        super().__init__()
+    The grid and labels only change with the size, colour and scale, they're
+    drawn once into a cached surface. Data changes only redraw the curves on top
+    of it, and the current temperature marker is just a line.
+    """
+
+    def __init__(self, plot_colour: Gdk.RGBA) -> None:
         self._data: Dict[int, int] = {}
         self._hysteresis = 0
-        self.set_size_request(400, 300)
-        self.set_margin_end(20)
-        self.connect("draw", self._on_draw)
-
-        self._plot_colour = Gdk.RGBA()
-        self._plot_colour.parse(GRAPH_COLOR_HEX)
-
-
+        self._temperature: Optional[float] = None
+        self._plot_colour = plot_colour
+        self._static_layer: Optional[cairo.Surface] = None
+        # width, height, device scale and foreground colour of the static layer
+        self._static_key: Optional[Tuple[int, int, Tuple[float, float], Tuple[float, float, float, float]]] = None
 
     def set_data(self, data: Dict[int, int], hysteresis: int = 0) -> None:
-        """Set the fan profile data to be plotted."""
         self._data = data
         self._hysteresis = hysteresis
-        self.queue_draw()
 
-    def _on_draw(self, widget: Gtk.Widget, cr: cairo.Context) -> None:
-        """Handle the drawing of the chart."""
+    def set_temperature(self, temperature: Optional[float]) -> bool:
+        """Mark the current temperature on the chart, hidden when None.
 
-        style = self.get_style_context()
-
-        allocation = self.get_allocation()
-        width = allocation.width
-        height = allocation.height
+        Returns:
+            bool: whether the marker moved
+        """
+        if temperature == self._temperature:
+            return False
+        self._temperature = temperature
+        return True
 
-        # Clear background
-        Gtk.render_background(style, cr, 0, 0, width, height)
-
-        fg_colour: Gdk.RGBA = cast(Gdk.RGBA, style.get_color(Gtk.StateType.NORMAL)) # type:ignore [call-arg, attr-defined] # incorrect stub
+    def draw(self, cr: cairo.Context, width: int, height: int, fg_colour: Gdk.RGBA) -> None:
+        """Draw the chart, without background, into a `width` x `height` area."""
 
         # Chart margins
         margin_left = 60
@@ -73,17 +71,27 @@ class FanProfileChart(Gtk.DrawingArea):
         vertical_padding = chart_height / 30
 
         # Draw grid and labels
-        self._draw_grid(cr,
-                        fg_colour,
-                        width,
-                        height,
-                        chart_width,
-                        chart_height,
-                        vertical_padding,
-                        margin_left,
-                        margin_bottom,
-                        margin_top,
-                        margin_right)
+        key = (width, height, cr.get_target().get_device_scale(),
+               (fg_colour.red, fg_colour.green, fg_colour.blue, fg_colour.alpha))
+        if self._static_layer is None or key != self._static_key:
+            # a similar surface has the device scale of the target
+            self._static_layer = cr.get_target().create_similar(cairo.CONTENT_COLOR_ALPHA, width, height)
+            self._static_key = key
+            self._draw_grid(cairo.Context(self._static_layer),
+                            fg_colour,
+                            width,
+                            height,
+                            chart_width,
+                            chart_height,
+                            vertical_padding,
+                            margin_left,
+                            margin_bottom,
+                            margin_top,
+                            margin_right)
+        cr.save()
+        cr.set_source_surface(self._static_layer, 0, 0)
+        cr.paint()
+        cr.restore()
 
         # Draw data lines
         self._draw_data_lines(cr,
@@ -97,6 +105,26 @@ class FanProfileChart(Gtk.DrawingArea):
                               margin_top,
                               margin_right)
 
+        if self._temperature is not None:
+            self._draw_marker(cr, fg_colour, height, chart_width, margin_left, margin_bottom, margin_top)
+
+    def _draw_marker(self,
+                     cr: cairo.Context,
+                     colour: Gdk.RGBA,
+                     height: int,
+                     chart_width: int,
+                     margin_left: int,
+                     margin_bottom: int,
+                     margin_top: int) -> None:
+        """Draw a vertical line at the current temperature."""
+        assert self._temperature is not None
+        x = margin_left + (min(max(self._temperature, 0), 100) / 100) * chart_width
+        cr.set_source_rgba(colour.red, colour.green, colour.blue, 0.6)
+        cr.set_line_width(2)
+        cr.move_to(x, margin_top)
+        cr.line_to(x, height - margin_bottom)
+        cr.stroke()
+
     def _draw_grid(self,
                    cr: cairo.Context,
                    colour: Gdk.RGBA,
@@ -255,4 +283,45 @@ class FanProfileChart(Gtk.DrawingArea):
                     cr.line_to(point[0], point[1])
 
                 cr.stroke()
-                cr.set_dash([])  # Reset dash
\ No newline at end of file
+                cr.set_dash([])  # Reset dash
+
+
+class FanProfileChart(Gtk.DrawingArea):
+    """Custom widget for plotting fan speed profiles."""
+    __gtype_name__ = "FanProfileChart"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.set_size_request(400, 300)
+        self.set_margin_end(20)
+        self.connect("draw", self._on_draw)
+
+        plot_colour = Gdk.RGBA()
+        plot_colour.parse(GRAPH_COLOR_HEX)
+        self._plot = FanProfilePlot(plot_colour)
+
+    def set_data(self, data: Dict[int, int], hysteresis: int = 0) -> None:
+        """Set the fan profile data to be plotted."""
+        self._plot.set_data(data, hysteresis)
+        self.queue_draw()
+
+    def set_temperature(self, temperature: Optional[float]) -> None:
+        """Mark the current temperature, hidden when None."""
+        if self._plot.set_temperature(temperature):
+            self.queue_draw()
+
+    def _on_draw(self, widget: Gtk.Widget, cr: cairo.Context) -> None:
+        """Handle the drawing of the chart."""
+
+        style = self.get_style_context()
+
+        allocation = self.get_allocation()
+        width = allocation.width
+        height = allocation.height
+
+        # Clear background
+        Gtk.render_background(style, cr, 0, 0, width, height)
+
+        fg_colour: Gdk.RGBA = cast(Gdk.RGBA, style.get_color(Gtk.StateType.NORMAL)) # type:ignore [call-arg, attr-defined] # incorrect stub
+
+        self._plot.draw(cr, width, height, fg_colour)
@@ -0,0 +1,80 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+"""Turns the rows of a graph into the points of its path"""
+import math
+from typing import List, Sequence, Tuple
+
+
+def transform_points(timestamps: Sequence[int],
+                     values: Sequence[float],
+                     begin_time: int,
+                     end_time: int,
+                     y_begin: float,
+                     y_end: float,
+                     width: int,
+                     height: int) -> Tuple[List[float], List[float]]:
+    """Pixel coordinates of every row, in one pass over each column.
+
+    The time and value ranges map to `width` and `height`, with the y axis pointing
+    down. NaN values stay NaN.
+    """
+    x_scale = width / float(end_time - begin_time)
+    y_scale = -height / float(y_end - y_begin)
+    y_offset = height - y_begin * y_scale
+    xs = [(t - begin_time) * x_scale for t in timestamps]
+    ys = [v * y_scale + y_offset for v in values]
+    return xs, ys
+
+
+def decimate_min_max(xs: Sequence[float], ys: Sequence[float]) -> Tuple[List[float], List[float]]:
+    """Reduce the points of a graph to at most the lowest and highest point of each pixel column.
+
+    `xs` are pixel coordinates in ascending order. The kept points stay in their
+    original order, so peaks are drawn where they happened. A NaN `y` marks a gap,
+    it's kept and ends the column it's in.
+
+    Returns:
+        Tuple[List[float], List[float]]: the x and y coordinates of the kept points
+    """
+    out_x: List[float] = []
+    out_y: List[float] = []
+    count = len(xs)
+    i = 0
+    while i < count:
+        y = ys[i]
+        if y != y:
+            out_x.append(xs[i])
+            out_y.append(y)
+            i += 1
+            continue
+        column = math.floor(xs[i])
+        low = high = i
+        j = i + 1
+        while j < count and math.floor(xs[j]) == column:
+            y = ys[j]
+            if y != y:
+                break
+            if y < ys[low]:
+                low = j
+            elif y > ys[high]:
+                high = j
+            j += 1
+        for k in ((low, high) if low < high else (high, low) if high < low else (low,)):
+            out_x.append(xs[k])
+            out_y.append(ys[k])
+        i = j
+    return out_x, out_y
@@ -0,0 +1,163 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+import cairo
+from gi.repository import Gdk, GLib
+
+from ...model.graph_snapshot import GraphSnapshot
+from .graph_renderer import GraphRenderer
+
+_LOG = logging.getLogger(__name__)
+
+# Number of composited frames the latency is averaged over
+_LATENCY_SAMPLES = 100
+
+
+def create_surface(width: int, height: int, scale: int) -> cairo.ImageSurface:
+    """An image surface of `width` x `height` logical pixels, at the `scale` of the display"""
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width * scale, height * scale)
+    surface.set_device_scale(scale, scale)
+    return surface
+
+
+class RasterJob:
+    """Renders a snapshot into `target` on the rasterizer thread.
+
+    With a `source`, it's first copied to `target`, moved `shift` pixels to the
+    left, and only the area right of `x` is rendered again. Otherwise the whole
+    target is rendered.
+    """
+
+    def __init__(self,
+                 snapshot: GraphSnapshot,
+                 renderers: List[GraphRenderer],
+                 target: cairo.ImageSurface,
+                 source: Optional[cairo.ImageSurface],
+                 shift: int,
+                 x: int,
+                 begin_time: int,
+                 end_time: int,
+                 area: Gdk.Rectangle) -> None:
+        self.snapshot = snapshot
+        self.renderers = renderers
+        self.target = target
+        self.source = source
+        self.shift = shift
+        self.x = x
+        self.begin_time = begin_time
+        self.end_time = end_time
+        self.area = area
+        # monotonic time of the submission, the latency is measured from there
+        self.submitted: int = GLib.get_monotonic_time()
+        self.started: bool = False
+        self.succeeded: bool = False
+        self.render_time: float = 0.0
+        self._cancelled: bool = False
+
+    def cancel(self) -> None:
+        """Drop the job if it didn't start yet, or stop it after the current renderer"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        self.started = True
+        start = time.perf_counter()
+        width, height = self.area.width, self.area.height
+        cr = cairo.Context(self.target)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        if self.source is not None:
+            cr.set_source_surface(self.source, -self.shift, 0)
+            cr.paint()
+        cr.rectangle(self.x, 0, width - self.x, height)
+        cr.clip()
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+
+        # the renderers draw the same timespan from `x`, skipping the rows before it
+        cr.translate(self.x, 0)
+        y_begin = int(self.snapshot.value_min)
+        y_end = int(self.snapshot.value_max)
+        for renderer in self.renderers:
+            if self._cancelled:
+                return
+            cr.save()
+            renderer.render(self.snapshot, self.begin_time, self.end_time, y_begin, y_end, cr, self.area)
+            cr.restore()
+        self.target.flush()
+        self.render_time = time.perf_counter() - start
+        self.succeeded = True
+
+
+class GraphRasterizer:
+    """Renders graphs on a worker thread, share one between the views of a window.
+
+    Jobs run one at a time in submission order, so a view can render into one of
+    its surfaces while compositing the other. Each finished job is handed back
+    on the main loop. Cancelled jobs are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Deque[Tuple[RasterJob, Callable[[RasterJob], None]]] = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._latencies: Deque[int] = deque(maxlen=_LATENCY_SAMPLES)
+
+    def submit(self, job: RasterJob, on_done: Callable[[RasterJob], None]) -> None:
+        """Queue `job`, `on_done` is called on the main loop once it's done, unless it was cancelled"""
+        with self._condition:
+            self._jobs.append((job, on_done))
+            self._condition.notify()
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='GraphRasterizer', daemon=True)
+            self._worker.start()
+
+    def record_latency(self, job: RasterJob) -> None:
+        """Called when the result of `job` is on screen"""
+        latency = GLib.get_monotonic_time() - job.submitted
+        self._latencies.append(latency)
+        _LOG.debug(f'Graph rendered in {job.render_time * 1000.0:.3f} ms, '
+                   f'on screen {latency / 1000.0:.3f} ms after new data')
+
+    def get_latency(self) -> Tuple[float, float]:
+        """Average and maximum time in ms from new data to the graph on screen, over the last frames"""
+        if not self._latencies:
+            return 0.0, 0.0
+        return sum(self._latencies) / len(self._latencies) / 1000.0, max(self._latencies) / 1000.0
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                job, on_done = self._jobs.popleft()
+            if job.is_cancelled():
+                continue
+            try:
+                job.run()
+            except:
+                _LOG.exception("Error while rendering graph")
+            if not job.is_cancelled():
+                GLib.idle_add(on_done, job, priority=GLib.PRIORITY_HIGH_IDLE)
@@ -19,33 +19,56 @@
 #    Christian Hergert
 #
 
+import math
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from typing import List, Optional, Tuple
 import typing
 
 import cairo
 from gi.repository.Gdk import RGBA
 from gi.repository import Gdk
-from ...model.graph_model import GraphModel, GraphModelIter
+from ...model.graph_snapshot import GraphSnapshot
+from .graph_points import decimate_min_max, transform_points
 
 class GraphRenderer(metaclass=ABCMeta):
+    @staticmethod
+    def _get_points(table: GraphSnapshot,
+                    begin_time: int,
+                    end_time: int,
+                    y_begin: float,
+                    y_end: float,
+                    area: Gdk.Rectangle,
+                    column: int) -> Tuple[List[float], List[float]]:
+        """Pixel coordinates of the rows from `begin_time` to `end_time`, decimated to at most
+        a min/max pair per pixel column. Missing samples have a NaN y.
+        """
+        timestamps, values = table.get_window(begin_time, end_time, column)
+        xs, ys = transform_points(timestamps, values, begin_time, end_time, y_begin, y_end, area.width, area.height)
+        return decimate_min_max(xs, ys)
+
+    @staticmethod
+    def _get_chunk(table: GraphSnapshot, area: Gdk.Rectangle) -> float:
+        """Horizontal distance of the curve control points: half the spacing of the samples"""
+        return area.width / float( table.max_samples - 1 ) / 2.0
+
     @abstractmethod
     def render(self,
-               table : GraphModel,
+               table : GraphSnapshot,
                begin_time : int,
                end_time : int,
                y_begin : int,
                y_end : int,
                cairo_context : cairo.Context,
                area : Gdk.Rectangle) -> None:
+        """Called on the rasterizer thread, must not touch any widget"""
         raise NotImplementedError
 
 
 class GraphLineRenderer(GraphRenderer):
-    def __init__(self, stroke_color: Optional[RGBA]=None, line_width: float = 2.0) -> None:
+    def __init__(self, stroke_color: Optional[RGBA]=None, line_width: float = 2.0, column: int = 0) -> None:
         GraphRenderer.__init__(self)
         self._line_width = line_width
-        self._column: int = 0
+        self._column: int = column
         self._stroke_color: Optional[RGBA] = stroke_color
 
     def set_line_width(self, width: float) -> None:
@@ -64,7 +87,7 @@ class GraphLineRenderer(GraphRenderer):
     stroke_color_rgba = property(get_stroke_color_rgba, set_stroke_color_rgba)
 
     def render(self,
-               table : GraphModel,
+               table : GraphSnapshot,
                begin_time : int,
                end_time : int,
                y_begin : int,
@@ -73,35 +96,33 @@ class GraphLineRenderer(GraphRenderer):
                area : Gdk.Rectangle) -> None:
         cairo_context.save()
 
-        model_iter: Optional[GraphModelIter] = table.get_iter_first()
-
+        xs, ys = self._get_points(table, begin_time, end_time, y_begin, y_end, area, self._column)
+        chunk = self._get_chunk(table, area)
 
-        if model_iter is not None:
-            model_iter.next()
-            max_samples = table.max_samples
+        last_x = 0.0
+        # None at the start, and after missing (NaN) samples to break the line
+        last_y: Optional[float] = None
 
-            chunk = area.width / float( max_samples - 1 ) / 2.0
-            timespan = float(end_time - begin_time)
-
-            last_x = self._calc_x(model_iter, begin_time, timespan, area.width)
-            last_y = self._calc_y(model_iter, y_begin, y_end, area.height, self._column)
-
-            cairo_context.move_to(last_x, last_y)
-
-            while model_iter.next():
-                x = self._calc_x(model_iter, begin_time, timespan, area.width)
-                y = self._calc_y(model_iter, y_begin, y_end, area.height, self._column)
+        for x, y in zip(xs, ys):
+            if math.isnan(y):
+                last_y = None
+                continue
 
+            if last_y is None:
+                cairo_context.move_to(x, y)
+            else:
+                # decimated points can be closer than the samples spacing
+                control = min(chunk, (x - last_x) / 2.0)
                 cairo_context.curve_to(
-                    last_x + chunk,
+                    last_x + control,
                     last_y,
-                    last_x + chunk,
+                    last_x + control,
                     y,
                     x,
                     y
                 )
-                last_x = x
-                last_y = y
+            last_x = x
+            last_y = y
 
         cairo_context.set_line_width(self._line_width)
 
@@ -111,28 +132,3 @@ class GraphLineRenderer(GraphRenderer):
         cairo_context.stroke()
 
         cairo_context.restore()
-
-
-    @staticmethod
-    def _calc_x(model_iter: GraphModelIter, begin: float, timespan: float, width: int) -> float:
-        timestamp: int = model_iter.timestamp
-        assert timestamp != 0
-        return (timestamp - begin) / float(timespan) * width
-
-    @staticmethod
-    def _calc_y(model_iter: GraphModelIter,
-                range_begin: float,
-                range_end: float,
-                height: int,
-                column: int) -> float:
-        y = 0.0
-        y = float( model_iter.get_value(column) )
-
-        y -= range_begin
-        assert y != 0
-        y /= (range_end - range_begin)
-        y = height - (y * height)
-
-        return y
-
-
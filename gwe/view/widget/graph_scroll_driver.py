@@ -0,0 +1,99 @@
+# This file is part of gwe.
+#
+# Copyright (c) 2025 Ryan Bloomfield
+#
+# gwe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gwe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gwe.  If not, see <http://www.gnu.org/licenses/>.
+from typing import TYPE_CHECKING, Dict, Optional
+
+from gi.repository import Gdk
+
+if TYPE_CHECKING:
+    from .graph_view import GraphView
+
+USEC_PER_SEC = 1000000
+DEFAULT_SCROLL_FPS = 30
+# A view that queued this many draws without being drawn is most likely not on
+#  screen, it's dropped until it draws again.
+_MAX_MISSED_DRAWS = 10
+
+
+def scroll_offset(frame_time: int, end_time: int, timespan: int) -> float:
+    """Offset, as a fraction of the width, of a graph rendered up to `end_time` at `frame_time`"""
+    return -((frame_time - end_time) / float(timespan))
+
+
+def moved_a_pixel(old_offset: float, new_offset: float, width: int, scale_factor: int) -> bool:
+    """Whether scrolling from `old_offset` to `new_offset` moves the graph by at least one device pixel"""
+    return abs(new_offset - old_offset) * width * scale_factor >= 1.0
+
+
+class GraphScrollDriver:
+    """Scrolls a group of `GraphView`s from a single frame clock.
+
+    Instead of one tick callback per view redrawing at the display refresh rate, the
+    driver handles every view on the same frame clock update, at most `max_fps`
+    times per second, and only redraws a view once its offset moved by a device pixel.
+    """
+
+    def __init__(self, max_fps: int = DEFAULT_SCROLL_FPS) -> None:
+        self._frame_interval: int = USEC_PER_SEC // max(1, max_fps)
+        self._views: Dict["GraphView", int] = {}  # view -> missed draws
+        self._frame_clock: Optional[Gdk.FrameClock] = None
+        self._update_handler: int = 0
+        self._last_frame_time: int = 0
+
+    def set_max_fps(self, max_fps: int) -> None:
+        self._frame_interval = USEC_PER_SEC // max(1, max_fps)
+
+    def start(self, view: "GraphView") -> None:
+        """Scroll `view` until it's hidden or stops being drawn"""
+        self._views[view] = 0
+        if self._frame_clock is None:
+            frame_clock = view.get_frame_clock()
+            if frame_clock is None:
+                return
+            self._frame_clock = frame_clock
+            self._update_handler = frame_clock.connect("update", self._on_update)
+            frame_clock.begin_updating()
+
+    def stop(self, view: "GraphView") -> None:
+        self._views.pop(view, None)
+        if not self._views:
+            self._stop_updating()
+
+    def on_drawn(self, view: "GraphView") -> None:
+        if view in self._views:
+            self._views[view] = 0
+
+    def _stop_updating(self) -> None:
+        if self._frame_clock is not None:
+            self._frame_clock.disconnect(self._update_handler)
+            self._frame_clock.end_updating()
+            self._frame_clock = None
+            self._update_handler = 0
+
+    def _on_update(self, frame_clock: Gdk.FrameClock) -> None:
+        frame_time = frame_clock.get_frame_time()
+        if frame_time - self._last_frame_time < self._frame_interval:
+            return
+        self._last_frame_time = frame_time
+
+        for view, missed in list(self._views.items()):
+            redraw = view.scroll(frame_time) if missed <= _MAX_MISSED_DRAWS else None
+            if redraw is None:
+                del self._views[view]
+            elif redraw:
+                self._views[view] = missed + 1
+        if not self._views:
+            self._stop_updating()
@@ -19,27 +19,79 @@
 #    Christian Hergert
 #
 
-from hmac import new
-from typing import Any, List, Optional, cast
+import math
+from typing import Any, List, Optional, Tuple
 import cairo
 from gi.repository import GObject, Gdk, Gtk, GLib
-from gi.repository.GLib import SOURCE_CONTINUE, SOURCE_REMOVE
 from ...model.graph_model import GraphModel
+from .graph_rasterizer import GraphRasterizer, RasterJob, create_surface
 from .graph_renderer import GraphRenderer
+from .graph_scroll_driver import GraphScrollDriver, moved_a_pixel, scroll_offset
+
+# Pixels rendered again left of the last row when rendering new rows, to redraw the
+#  end of its line (the stroke width and anti-aliasing)
+_STRIP_MARGIN = 4
+
+# Zoom factor of one mouse wheel step
+_ZOOM_STEP = 1.25
+
+# What a surface was rendered for: width, height, scale, value min and max, timespan, reset serial
+#  and fixed end time
+_SurfaceKey = Tuple[int, int, int, int, int, int, int, int]
 
 
 class GraphView(Gtk.DrawingArea):
+    """Scrolling graph of a `GraphModel`.
+
+    The mouse wheel zooms and dragging pans, the view only emits `range-changed`
+    for them, its owner applies the range with the model's `timespan` and
+    `set_end_time()`, to query the data of the new range first.
+
+    Signals:
+        range-changed (int, int): the timespan and fixed end time asked for. An end
+            time of 0 follows the latest rows, a timespan of 0 resets the range.
+    """
     table: GObject.Property
 
-    def __init__(self, table: GraphModel, **props: Any) -> None:
+    def __init__(self,
+                 table: GraphModel,
+                 scroll_driver: Optional[GraphScrollDriver] = None,
+                 rasterizer: Optional[GraphRasterizer] = None,
+                 **props: Any) -> None:
+        """
+        Args:
+            table (GraphModel): the model to draw
+            scroll_driver (Optional[GraphScrollDriver]): scrolls the graph, share one between the
+                views of a window. The view has its own when None.
+            rasterizer (Optional[GraphRasterizer]): renders the graph on a worker thread, share one
+                between the views of a window. The view has its own when None.
+        """
         super().__init__(**props)
         self._model: GraphModel = table
         self._surface_dirty: bool = True
-        self._tick_handler: int = 0
+        self._scroll_driver: GraphScrollDriver = scroll_driver if scroll_driver is not None else GraphScrollDriver()
+        self._rasterizer: GraphRasterizer = rasterizer if rasterizer is not None else GraphRasterizer()
         self._renderers: List[GraphRenderer] = []
-        self._missed_count: int = 0
-        self._surface: Optional[cairo.XlibSurface] = None
+        # Double buffering: _surface is composited on the main thread while the
+        #  rasterizer renders the next frame into _back_surface, then they're swapped.
+        self._surface: Optional[cairo.ImageSurface] = None
+        self._back_surface: Optional[cairo.ImageSurface] = None
+        # time at the right edge of the surface, and of the last row rendered
+        self._surface_end_time: float = 0.0
+        self._rendered_end_time: int = 0
+        self._rendered_key: Optional[_SurfaceKey] = None
+        # the job rendering the next frame, with the key, last row and right edge time it renders
+        self._job: Optional[RasterJob] = None
+        self._job_target: Tuple[Optional[_SurfaceKey], int, float] = (None, 0, 0.0)
+        # a job that failed isn't submitted again until the model changes
+        self._failed_target: Optional[Tuple[_SurfaceKey, int]] = None
+        # the job composited on the next draw, for the latency metric
+        self._composited_job: Optional[RasterJob] = None
         self._x_offset: float = 0.0
+        # right edge of a panned graph, None follows the latest rows
+        self._fixed_end_time: Optional[int] = None
+        # pointer x and right edge time when dragging started
+        self._drag_start: Optional[Tuple[float, int]] = None
 
         # Connect signals
         table.connect("notify::value-max", type(self)._on_notify_value_min_max, self)
@@ -51,15 +103,43 @@ class GraphView(Gtk.DrawingArea):
         self.connect("draw", type(self)._on_draw)
         self.connect("size-allocate", type(self)._on_size_allocate)
         self.connect("destroy", type(self)._on_destroy)
+        self.add_events(Gdk.EventMask.SCROLL_MASK
+                        | Gdk.EventMask.SMOOTH_SCROLL_MASK
+                        | Gdk.EventMask.BUTTON_PRESS_MASK
+                        | Gdk.EventMask.BUTTON_RELEASE_MASK
+                        | Gdk.EventMask.BUTTON1_MOTION_MASK)
+        self.connect("scroll-event", type(self)._on_scroll_event)
+        self.connect("button-press-event", type(self)._on_button_press_event)
+        self.connect("button-release-event", type(self)._on_button_release_event)
+        self.connect("motion-notify-event", type(self)._on_motion_notify_event)
 
         self.queue_allocate()
 
     def _clear_surface(self) -> None:
+        self._cancel_job()
         self._surface_dirty = True
 
     def get_model(self) -> Optional[GraphModel]:
         return self._model
 
+    @GObject.Signal(flags=GObject.SignalFlags.RUN_LAST, arg_types=(GObject.TYPE_INT64, GObject.TYPE_INT64))
+    def range_changed(self, timespan: int, end_time: int) -> None:
+        """Emitted when zooming or panning, see the class documentation"""
+        pass
+
+    def set_end_time(self, end_time: Optional[int]) -> None:
+        """Stop the graph at `end_time`, or follow the latest rows when None"""
+        if end_time == self._fixed_end_time:
+            return
+        self._fixed_end_time = end_time
+        self.queue_draw()
+
+    def get_end_time(self) -> int:
+        """Time at the right edge of the graph"""
+        if self._fixed_end_time is not None:
+            return self._fixed_end_time
+        return self._model.get_end_time()
+
     table = GObject.Property(getter=get_model)
 
     def set_css_name(self, name: str) -> None:
@@ -70,10 +150,19 @@ class GraphView(Gtk.DrawingArea):
         self._renderers.append(renderer)
         self._clear_surface()
 
+    def set_renderers(self, renderers: List[GraphRenderer]) -> None:
+        """Replace all renderers, they're drawn in order"""
+        self._renderers = list(renderers)
+        self._clear_surface()
+        self.queue_draw()
+
     @staticmethod
     def _on_model_changed(_model: GraphModel, self: "GraphView") -> None:
-        self._x_offset = 0
-        self._clear_surface()
+        # Start rendering the new rows right away, the latency is measured from here.
+        #  The scrolling only redraws once the graph moved a pixel, so queue a draw as well.
+        if self.get_mapped():
+            self._update_surface()
+        self.queue_draw()
 
     @staticmethod
     def _on_notify_value_min_max(_obj: GObject.Object,
@@ -92,14 +181,15 @@ class GraphView(Gtk.DrawingArea):
         old_alloc = self.get_allocation()
 
         if allocation.width != old_alloc.width or allocation.height != old_alloc.height:
-            self._surface = None  # Will be recreated on next draw
+            # the old surface is composited until the rasterizer rendered one of the new size
+            self._back_surface = None
             self._clear_surface()
             self.queue_draw()
 
     def _on_draw(self, cr: cairo.Context) -> bool:
-        self._missed_count = 0
+        self._scroll_driver.on_drawn(self)
         alloc = self.get_allocation()
-        self._ensure_surface()
+        self._update_surface()
         # Draw background (optional, for styling)
         style_context: Gtk.StyleContext = self.get_style_context()
         style_context.save()
@@ -108,99 +198,185 @@ class GraphView(Gtk.DrawingArea):
         style_context.restore()
         # Draw the graph surface
         cr.save()
-        if self._surface is not None:
+        if self._surface is not None and self._model is not None:
+            if self._fixed_end_time is None:
+                self._x_offset = scroll_offset(GLib.get_monotonic_time(), int(self._surface_end_time), self._model.timespan)
+            else:
+                self._x_offset = 0.0
             cr.set_source_surface(self._surface, self._x_offset * alloc.width, 0)
             cr.rectangle(0, 0, alloc.width, alloc.height)
             cr.fill()
+            if self._composited_job is not None:
+                self._rasterizer.record_latency(self._composited_job)
+                self._composited_job = None
         cr.restore()
+
+        # scrolling stops when the view isn't drawn anymore, and restarts from here
+        if self._surface is not None:
+            self._scroll_driver.start(self)
         return Gdk.EVENT_PROPAGATE
 
     def _on_destroy(self) -> None:
-        if self._tick_handler != 0:
-            self.remove_tick_callback(self._tick_handler)
-            self._tick_handler = 0
+        self._scroll_driver.stop(self)
+        self._cancel_job()
         self._surface = None
+        self._back_surface = None
 
-    def _ensure_surface(self) -> None:
-        alloc = self.get_allocation()
-        if self._surface is None or self._surface.get_width() != alloc.width or self._surface.get_height() != alloc.height:
-            self._surface_dirty = True
-            window = self.get_window()
-            assert window is not None
-            self._surface = cast( cairo.XlibSurface, window.create_similar_surface(
-                cairo.CONTENT_COLOR_ALPHA,
-                alloc.width,
-                alloc.height) )
+    def _cancel_job(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def _update_surface(self) -> None:
+        """Submit a job rendering what's missing from the surface, unless one is already on it"""
         if self._model is None:
             return
-        if self._surface_dirty:
-            self._surface_dirty = False
-            cr = cairo.Context(self._surface)
-            cr.save()
-            cr.rectangle(0, 0, alloc.width, alloc.height)
-            cr.set_operator(cairo.OPERATOR_CLEAR)
-            cr.fill()
-            cr.restore()
-
-            y_begin: int = int( self._model.value_min )
-            y_end: int = int ( self._model.value_max )
-            end_time = self._model.get_end_time()
-            begin_time: int = end_time - self._model.timespan
-            for renderer in self._renderers:
-                cr.save()
-                renderer.render(self._model,
-                                begin_time,
-                                end_time,
-                                y_begin,
-                                y_end,
-                                cr,
-                                alloc)
-                cr.restore()
-        if self._tick_handler == 0:
-            self._tick_handler = self.add_tick_callback(self._tick_cb, None)
-
+        alloc = self.get_allocation()
+        scale = self.get_scale_factor()
+        timespan = self._model.timespan
+        end_time = self.get_end_time()
+        key = (alloc.width, alloc.height, scale, int(self._model.value_min), int(self._model.value_max),
+               timespan, self._model.get_reset_serial(), self._fixed_end_time or 0)
+
+        if self._job is not None:
+            job_key, job_end_time, _ = self._job_target
+            if job_key == key and (job_end_time >= end_time or self._job.started):
+                # a running job isn't cancelled by new rows, they're rendered once it's done
+                return
+            # new data replaces the job, the next one starts again from the current surface
+            self._cancel_job()
+        if self._failed_target == (key, end_time):
+            return
 
-    @staticmethod
-    def _tick_cb(view: "GraphView",
-                 frame_clock: Gdk.FrameClock,
-                 user_data: Any) -> bool:
-
-        def remove_handler() -> None:
-            if view._tick_handler != 0:
-                view.remove_tick_callback(view._tick_handler)
-                view._tick_handler = 0
-
-        if view._surface is None or view._model is None or not view.get_visible():
-            remove_handler()
-            return SOURCE_REMOVE
-
-        # If we've missed drawings for the last 10 tick callbacks, chances are we're
-        # visible, but not being displayed to the user because we're not top-most.
-        # Disable ourselves in that case too so that we don't spin the frame-clock.
-        #
-        # We'll be re-enabled when the next ensure_surface() is called (upon a real
-        # draw by the system).
-        #
-        # The missed_count is reset on draw().
-        if view._missed_count > 10:
-            remove_handler()
-            return SOURCE_REMOVE
+        source = self._surface
+        shift = x = 0
+        surface_end_time = float(end_time)
+        if self._surface_dirty or source is None or key != self._rendered_key:
+            self._surface_dirty = False
+            source = None
+        elif end_time > self._rendered_end_time:
+            # Scroll what's already rendered by whole pixels, then render the new rows
+            #  from a bit before the last rendered one, to cover the end of its line.
+            usec_per_px = timespan / alloc.width
+            shift = max(0, math.ceil((end_time - self._surface_end_time) / usec_per_px))
+            surface_end_time = self._surface_end_time + shift * usec_per_px
+            strip_x = alloc.width - (surface_end_time - self._rendered_end_time) / usec_per_px - _STRIP_MARGIN
+            if strip_x <= 0:
+                surface_end_time = float(end_time)
+                source = None
+                shift = 0
+            else:
+                x = math.floor(strip_x)
         else:
-            view._missed_count = view._missed_count + 1
+            return
 
-        timespan = float( view._model.timespan )
+        target = self._back_surface
+        if target is None or (target.get_width(), target.get_height()) != (alloc.width * scale, alloc.height * scale):
+            target = create_surface(alloc.width, alloc.height, scale)
+        self._back_surface = None
+
+        begin_time = int(surface_end_time - timespan + x * timespan / alloc.width)
+        area = Gdk.Rectangle()
+        area.x, area.y, area.width, area.height = 0, 0, alloc.width, alloc.height
+        self._job = RasterJob(self._model.snapshot(begin_time, begin_time + timespan),
+                              list(self._renderers),
+                              target,
+                              source,
+                              shift,
+                              x,
+                              begin_time,
+                              begin_time + timespan,
+                              area)
+        self._job_target = (key, end_time, surface_end_time)
+        self._rasterizer.submit(self._job, self._on_rasterized)
+
+    def _on_rasterized(self, job: RasterJob) -> None:
+        if job is not self._job:
+            return  # cancelled after it finished
+        self._job = None
+        key, end_time, surface_end_time = self._job_target
+        if not job.succeeded:
+            assert key is not None
+            self._failed_target = (key, end_time)
+            return
+        self._failed_target = None
+        self._back_surface, self._surface = self._surface, job.target
+        self._rendered_key = key
+        self._rendered_end_time = end_time
+        self._surface_end_time = surface_end_time
+        self._composited_job = job
+        self.queue_draw()
+        # rows that arrived while rendering
+        self._update_surface()
+
+    def scroll(self, frame_time: int) -> Optional[bool]:
+        """Called by the scroll driver on each frame.
+
+        Returns:
+            Optional[bool]: None to stop scrolling, otherwise whether a redraw was queued
+        """
+        if self._surface is None or self._model is None or not self.get_visible() or self._fixed_end_time is not None:
+            return None
+        timespan = self._model.timespan
         if timespan == 0:
-            remove_handler()
-            return SOURCE_REMOVE
-
-        alloc = view.get_allocation()
-
-        frame_time = GLib.get_monotonic_time()
-        end_time = view._model.get_end_time()
-
-        x_offset = -((frame_time - end_time) / timespan)
-        if x_offset != view._x_offset:
-            view._x_offset = x_offset
-            view.queue_draw()
-
-        return SOURCE_CONTINUE
+            return None
+
+        x_offset = scroll_offset(frame_time, int(self._surface_end_time), timespan)
+        if not moved_a_pixel(self._x_offset, x_offset, self.get_allocated_width(), self.get_scale_factor()):
+            return False
+        self._x_offset = x_offset
+        self.queue_draw()
+        return True
+
+    def _on_scroll_event(self, event: Gdk.EventScroll) -> bool:
+        if event.direction == Gdk.ScrollDirection.UP:
+            delta = -1.0
+        elif event.direction == Gdk.ScrollDirection.DOWN:
+            delta = 1.0
+        elif event.direction == Gdk.ScrollDirection.SMOOTH:
+            delta = event.delta_y
+        else:
+            return Gdk.EVENT_PROPAGATE
+        if delta == 0 or self._model is None:
+            return Gdk.EVENT_STOP
+
+        timespan = self._model.timespan
+        new_timespan = int(timespan * _ZOOM_STEP ** delta)
+        if self._fixed_end_time is None:
+            # zoom around the latest rows, and keep following them
+            self.emit("range-changed", new_timespan, 0)
+        else:
+            # keep the time under the pointer in place
+            width = max(1, self.get_allocated_width())
+            right = (width - event.x) / width
+            pointer_time = self._fixed_end_time - right * timespan
+            self.emit("range-changed", new_timespan, int(pointer_time + right * new_timespan))
+        return Gdk.EVENT_STOP
+
+    def _on_button_press_event(self, event: Gdk.EventButton) -> bool:
+        if event.button != Gdk.BUTTON_PRIMARY:
+            return Gdk.EVENT_PROPAGATE
+        if event.type == Gdk.EventType._2BUTTON_PRESS:
+            self._drag_start = None
+            self.emit("range-changed", 0, 0)
+        else:
+            self._drag_start = (event.x, self.get_end_time())
+        return Gdk.EVENT_STOP
+
+    def _on_button_release_event(self, event: Gdk.EventButton) -> bool:
+        if event.button != Gdk.BUTTON_PRIMARY:
+            return Gdk.EVENT_PROPAGATE
+        self._drag_start = None
+        return Gdk.EVENT_STOP
+
+    def _on_motion_notify_event(self, event: Gdk.EventMotion) -> bool:
+        if self._drag_start is None or self._model is None:
+            return Gdk.EVENT_PROPAGATE
+        start_x, start_end_time = self._drag_start
+        width = max(1, self.get_allocated_width())
+        end_time = int(start_end_time - (event.x - start_x) * self._model.timespan / width)
+        if end_time >= self._model.get_end_time():
+            end_time = 0  # dragged back to the latest rows
+        if end_time != (self._fixed_end_time or 0):
+            self.emit("range-changed", self._model.timespan, end_time)
+        return Gdk.EVENT_STOP
@@ -0,0 +1,78 @@
+import threading
+from typing import Iterator, List
+
+import pytest
+from peewee import SqliteDatabase
+from reactivex import Subject
+
+from gwe.conf import SETTINGS_DEFAULTS
+from gwe.interactor.settings_interactor import SettingsInteractor
+from gwe.model import setting
+from gwe.model.setting import Setting, SettingChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Iterator[SqliteDatabase]:
+    database = SqliteDatabase(str(tmp_path / 'gwe.db'))
+    monkeypatch.setattr(setting, 'SPEED_STEP_CHANGED_SUBJECT', SettingChangedSubject(Subject()), raising=False)
+    # bound for this test only
+    with database.bind_ctx([Setting]):
+        database.create_tables([Setting])
+        yield database
+    database.close()
+
+
+@pytest.fixture
+def worker(database: SqliteDatabase) -> Iterator[DatabaseWorker]:
+    worker = DatabaseWorker(database)
+    yield worker
+    worker.close()
+
+
+def _interactor(worker: DatabaseWorker) -> SettingsInteractor:
+    return SettingsInteractor(setting.SPEED_STEP_CHANGED_SUBJECT, worker)
+
+
+def test_settings_interactor_loads_saved_values(worker: DatabaseWorker) -> None:
+    Setting.create(key='settings_refresh_interval', value=5)
+    Setting.create(key='settings_minimize_to_tray', value=True)
+    interactor = _interactor(worker)
+    assert interactor.get_int('settings_refresh_interval') == 5
+    assert interactor.get_bool('settings_minimize_to_tray') is True
+    assert interactor.get_int('settings_hysteresis') == SETTINGS_DEFAULTS['settings_hysteresis']
+
+
+def test_settings_interactor_writes_through(worker: DatabaseWorker) -> None:
+    interactor = _interactor(worker)
+    interactor.set_int('settings_refresh_interval', 7)
+    interactor.set_str('some_text', 'café')
+    assert interactor.get_int('settings_refresh_interval') == 7
+    assert interactor.get_str('some_text') == 'café'
+    worker.flush()
+    assert int(Setting.get(key='settings_refresh_interval').value) == 7
+    assert _interactor(worker).get_str('some_text') == 'café'
+
+
+def test_settings_interactor_follows_changes_made_elsewhere(worker: DatabaseWorker) -> None:
+    interactor = _interactor(worker)
+    Setting.create(key='settings_refresh_interval', value=4)
+    assert interactor.get_int('settings_refresh_interval') == 4
+    Setting.get(key='settings_refresh_interval').delete_instance()
+    assert interactor.get_int('settings_refresh_interval', 2) == 2
+
+
+def test_settings_interactor_keeps_the_latest_value(worker: DatabaseWorker) -> None:
+    interactor = _interactor(worker)
+    release = threading.Event()
+    worker.submit(release.wait)
+    seen: List[int] = []
+    interactor.set_int('settings_refresh_interval', 3)
+    worker.submit(lambda: seen.append(interactor.get_int('settings_refresh_interval')))
+    interactor.set_int('settings_refresh_interval', 4)
+    release.set()
+    worker.flush()
+    # the echo of the first write didn't replace the second value
+    assert seen == [4]
+    assert interactor.get_int('settings_refresh_interval') == 4
+    assert int(Setting.get(key='settings_refresh_interval').value) == 4
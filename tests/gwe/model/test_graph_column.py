@@ -1,4 +1,6 @@
+import math
 import pytest
+from array import array
 from collections import deque
 from gwe.model.graph_column import GraphColumn
 
@@ -145,4 +147,78 @@ def test_graph_column_min_value_floats() -> None:
 def test_graph_column_min_value_raises_on_empty() -> None:
     col = GraphColumn[int]("Empty", 2)
     with pytest.raises(RuntimeError):
-        col.min_value()
\ No newline at end of file
+        col.min_value()
+def test_graph_column_clear() -> None:
+    col = GraphColumn[int]("Clear", 3)
+    col.append(1)
+    col.append(2)
+    col.clear()
+    assert len(col) == 0
+    assert col.max_len == 3
+
+#
+# wrap()
+#
+
+def test_graph_column_wrap_keeps_last_values() -> None:
+    col = GraphColumn[int]("Wrap", 3)
+    col.append(99)
+    backing = memoryview(array('q', [1, 2, 3, 4]))
+    col.wrap(backing)
+    assert len(col) == 3
+    assert [col[i] for i in range(3)] == [2, 3, 4]
+    assert col[-1] == 4
+
+def test_graph_column_wrap_append_trims_backing_first() -> None:
+    col = GraphColumn[int]("Wrap", 3)
+    col.wrap([1, 2])
+    col.append(3)
+    assert [col[i] for i in range(len(col))] == [1, 2, 3]
+    col.append(4)
+    assert [col[i] for i in range(len(col))] == [2, 3, 4]
+    col.append(5)
+    col.append(6)
+    assert [col[i] for i in range(len(col))] == [4, 5, 6]
+    assert list(col._values) == [4, 5, 6]
+
+def test_graph_column_wrap_is_read_only() -> None:
+    col = GraphColumn[int]("Wrap", 3)
+    col.wrap([1, 2])
+    col.append(3)
+    with pytest.raises(RuntimeError):
+        col.set_value(0, 10)
+    col.set_value(2, 30)
+    assert col[2] == 30
+
+def test_graph_column_wrap_resize_trims_backing_first() -> None:
+    col = GraphColumn[int]("Wrap", 5)
+    col.wrap([1, 2, 3])
+    col.append(4)
+    col.resize(2)
+    assert [col[i] for i in range(len(col))] == [3, 4]
+
+def test_graph_column_wrap_min_max_skip_nan() -> None:
+    col = GraphColumn[float]("Wrap", 5)
+    col.wrap(memoryview(array('d', [math.nan, 3.0, math.nan, -1.0])))
+    assert col.max_value() == 3.0
+    assert col.min_value() == -1.0
+    col.wrap([math.nan])
+    with pytest.raises(RuntimeError):
+        col.max_value()
+
+#
+# get_slice()
+#
+
+def test_graph_column_get_slice() -> None:
+    col = GraphColumn[int]("Slice", 5)
+    backing = memoryview(array('q', [1, 2, 3]))
+    col.wrap(backing)
+    col.append(4)
+    col.append(5)
+    assert list(col.get_slice(0, 5)) == [1, 2, 3, 4, 5]
+    assert list(col.get_slice(1, 4)) == [2, 3, 4]
+    assert list(col.get_slice(3, 10)) == [4, 5]
+    assert list(col.get_slice(-2, 2)) == [1, 2]
+    # the backing part isn't copied
+    assert isinstance(col.get_slice(0, 2), memoryview)
@@ -1,3 +1,4 @@
+from array import array
 import pytest
 from gwe.model.graph_model import GraphModel, GraphModelIter, USEC_PER_SEC
 from gwe.model.graph_column import GraphColumn
@@ -189,3 +190,95 @@ def test_graph_model_iter_runtime_exceptions():
         t = iter_no_next.timestamp
     with pytest.raises(RuntimeError):
         iter_no_next.get_value(0)
+
+def test_graph_model_extend_keeps_last_rows_and_emits_once():
+    model = GraphModel(['col1', 'col2'], max_samples=3)
+    emitted = []
+    model.connect("changed", lambda _: emitted.append(True))
+    model.extend((i, (float(i), float(i * 2))) for i in range(10))
+    assert len(emitted) == 1
+    assert len(model) == 3
+    iter = model.get_iter_first()
+    assert iter.next() is True
+    assert iter.timestamp == 7
+    assert iter.get_value(1) == 14.0
+
+def test_graph_model_extend_invalid_row():
+    model = GraphModel(['col1'], max_samples=3)
+    with pytest.raises(ValueError):
+        model.extend([(1, (1.0, 2.0))])
+
+def test_graph_model_clear():
+    model = GraphModel(['col1'], max_samples=3)
+    model.append(1, 5.0)
+    model.clear()
+    assert len(model) == 0
+    assert model.get_iter_first().next() is False
+
+def test_graph_model_wrap_keeps_last_rows_without_copy():
+    model = GraphModel(['col1'], max_samples=3, value_max=10.0)
+    emitted = []
+    model.connect("changed", lambda _: emitted.append(True))
+    values = memoryview(array('d', [1.0, 2.0, float('nan'), 40.0]))
+    model.wrap(memoryview(array('q', [1, 2, 3, 4])), values)
+    assert len(emitted) == 1
+    assert len(model) == 3
+    assert model._columns[0]._backing is values
+    assert model.value_max == 40.0
+    model.append(5, 5.0)
+    assert len(model) == 3
+    assert model.get_column_min(0) == 5.0
+    assert model.get_end_time() == 5
+
+def test_graph_model_wrap_invalid_columns():
+    model = GraphModel(['col1'], max_samples=3)
+    with pytest.raises(ValueError):
+        model.wrap([1, 2], [1.0])
+
+def test_graph_model_get_iter_at():
+    model = GraphModel(['col1'], max_samples=5)
+    for t in (10, 20, 30, 40):
+        model.append(t, float(t))
+    iter = model.get_iter_at(25)
+    assert iter.next() is True
+    assert iter.timestamp == 20
+    iter = model.get_iter_at(5)
+    assert iter.next() is True
+    assert iter.timestamp == 10
+    iter = model.get_iter_at(50)
+    assert iter.next() is True
+    assert iter.timestamp == 40
+    assert iter.next() is False
+
+def test_graph_model_reset_serial():
+    model = GraphModel(['col1'], max_samples=5)
+    model.append(1, 1.0)
+    serial = model.get_reset_serial()
+    model.extend([(2, (2.0,))])
+    assert model.get_reset_serial() == serial
+    model.clear()
+    assert model.get_reset_serial() == serial + 1
+
+def test_graph_model_get_window():
+    model = GraphModel(['col1'], max_samples=10)
+    for t in (10, 20, 30, 40, 50):
+        model.append(t, float(t))
+    timestamps, values = model.get_window(25, 35, 0)
+    assert list(timestamps) == [20, 30, 40]
+    assert list(values) == [20.0, 30.0, 40.0]
+    timestamps, _ = model.get_window(0, 100, 0)
+    assert list(timestamps) == [10, 20, 30, 40, 50]
+
+def test_graph_model_snapshot():
+    model = GraphModel(['col1', 'col2'], max_samples=10, value_max=50.0)
+    for t in (10, 20, 30, 40, 50):
+        model.append(t, float(t), -float(t))
+    snapshot = model.snapshot(25, 35)
+    model.append(60, 60.0, -60.0)
+    model.clear()
+    assert len(snapshot) == 3
+    assert snapshot.max_samples == 10
+    assert snapshot.value_max == 50.0
+    timestamps, values = snapshot.get_window(0, 100, 1)
+    assert list(timestamps) == [20, 30, 40]
+    assert list(values) == [-20.0, -30.0, -40.0]
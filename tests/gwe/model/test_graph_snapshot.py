@@ -0,0 +1,32 @@
+import pytest
+from gwe.model.graph_snapshot import GraphSnapshot
+
+
+def _snapshot():
+    return GraphSnapshot([10, 20, 30, 40, 50], [[1.0, 2.0, 3.0, 4.0, 5.0]], 60, 0.0, 100.0, 40)
+
+
+def test_graph_snapshot_get_window():
+    snapshot = _snapshot()
+    timestamps, values = snapshot.get_window(25, 35, 0)
+    assert list(timestamps) == [20, 30, 40]
+    assert list(values) == [2.0, 3.0, 4.0]
+    timestamps, _ = snapshot.get_window(0, 100, 0)
+    assert list(timestamps) == [10, 20, 30, 40, 50]
+
+
+def test_graph_snapshot_properties():
+    snapshot = _snapshot()
+    assert len(snapshot) == 5
+    assert snapshot.max_samples == 60
+    assert snapshot.timespan == 40
+    assert snapshot.get_end_time() == 50
+    with pytest.raises(ValueError):
+        snapshot.get_window(0, 100, 1)
+    with pytest.raises(RuntimeError):
+        GraphSnapshot([], [[]], 60, 0.0, 100.0, 40).get_end_time()
+
+
+def test_graph_snapshot_column_length():
+    with pytest.raises(ValueError):
+        GraphSnapshot([10, 20], [[1.0]], 60, 0.0, 100.0, 40)
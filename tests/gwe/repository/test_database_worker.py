@@ -0,0 +1,51 @@
+import threading
+from typing import Any, Iterator, List
+
+import pytest
+from peewee import SqliteDatabase
+from reactivex import Subject
+
+from gwe.model import setting
+from gwe.model.setting import Setting, SettingChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Iterator[SqliteDatabase]:
+    database = SqliteDatabase(str(tmp_path / 'gwe.db'), pragmas={'journal_mode': 'wal'})
+    monkeypatch.setattr(setting, 'SPEED_STEP_CHANGED_SUBJECT', SettingChangedSubject(Subject()), raising=False)
+    # bound for this test only
+    with database.bind_ctx([Setting]):
+        database.create_tables([Setting])
+        yield database
+    database.close()
+
+
+def test_database_worker_runs_requests_off_the_calling_thread(database: SqliteDatabase) -> None:
+    worker = DatabaseWorker(database)
+    threads: List[str] = []
+    results: List[Any] = []
+
+    def create() -> str:
+        threads.append(threading.current_thread().name)
+        return str(Setting.create(key='a', value=1).key)
+
+    worker.submit(create).subscribe(on_next=results.append)
+    worker.flush()
+    assert threads == ['DatabaseWorker']
+    assert results == ['a']
+    assert Setting.get(key='a').value == 1
+    worker.close()
+
+
+def test_database_worker_failing_request_keeps_the_others(database: SqliteDatabase) -> None:
+    worker = DatabaseWorker(database)
+    errors: List[Exception] = []
+    worker.submit(lambda: Setting.create(key='a', value=1))
+    worker.submit(lambda: Setting.create(key='a', value=2)).subscribe(on_error=errors.append)
+    worker.submit(lambda: Setting.create(key='b', value=3))
+    worker.close()
+    assert len(errors) == 1
+    assert [(s.key, s.value) for s in Setting.select().order_by(Setting.key)] == [('a', 1), ('b', 3)]
+    with pytest.raises(RuntimeError):
+        worker.submit(lambda: None)
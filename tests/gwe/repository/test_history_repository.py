@@ -0,0 +1,186 @@
+import math
+from typing import Iterator, List
+
+import pytest
+
+from gwe.model.clocks import Clocks
+from gwe.model.fan import Fan
+from gwe.model.gpu_status import GpuStatus
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric
+from gwe.model.info import Info
+from gwe.model.overclock import Overclock
+from gwe.model.power import Power
+from gwe.model.sys_paths import SysPaths
+from gwe.model.temp import Temp
+from gwe.repository.history_repository import HistoryRepository, SEGMENT_USEC, USEC_PER_DAY, USEC_PER_SEC
+
+
+def _status(uuid: str, temp: int, index: int = 0) -> GpuStatus:
+    return GpuStatus(index=index,
+                     info=Info(uuid=uuid, gpu_usage=50),
+                     power=Power(draw=42.5),
+                     temp=Temp(gpu=temp),
+                     fan=Fan(fan_list=[(30, 1200)]),
+                     clocks=Clocks(),
+                     overclock=Overclock())
+
+
+@pytest.fixture
+def repository(tmp_path) -> Iterator[HistoryRepository]:
+    repo = HistoryRepository(SysPaths('', '', str(tmp_path)))
+    yield repo
+    repo.close()
+
+
+def _temps(repository: HistoryRepository, uuid: str, begin: int, end: int) -> List[float]:
+    return [v for _, v in repository.query_metric(uuid, HistoryMetric.GPU_TEMP, begin, end)]
+
+
+def test_history_repository_append_and_query(repository: HistoryRepository) -> None:
+    for i in range(10):
+        repository.append([_status('GPU-a', 40 + i), _status('GPU-b', 60 + i, 1)], timestamp=1000 + i)
+    repository.flush()
+
+    assert repository.get_gpu_uuids() == ['GPU-a', 'GPU-b']
+    assert _temps(repository, 'GPU-a', 1003, 1005) == [43.0, 44.0, 45.0]
+    assert _temps(repository, 'GPU-b', 0, 2000) == [float(60 + i) for i in range(10)]
+
+    timestamp, values = next(repository.query('GPU-a', 0, 2000))
+    assert timestamp == 1000
+    assert len(values) == len(HISTORY_METRICS)
+    assert values[HISTORY_METRICS.index(HistoryMetric.FAN_RPM)] == 1200.0
+    assert values[HISTORY_METRICS.index(HistoryMetric.POWER_DRAW)] == 42.5
+    assert math.isnan(values[HISTORY_METRICS.index(HistoryMetric.GPU_CLOCK)])
+
+
+def test_history_repository_query_spans_segments(repository: HistoryRepository) -> None:
+    timestamps = [SEGMENT_USEC - 2, SEGMENT_USEC - 1, SEGMENT_USEC, 3 * SEGMENT_USEC + 5]
+    for i, timestamp in enumerate(timestamps):
+        repository.append([_status('GPU-a', i)], timestamp=timestamp)
+    repository.flush()
+
+    assert [t for t, _ in repository.query('GPU-a', 0, 4 * SEGMENT_USEC)] == timestamps
+    assert _temps(repository, 'GPU-a', SEGMENT_USEC - 1, SEGMENT_USEC) == [1.0, 2.0]
+    assert _temps(repository, 'GPU-a', SEGMENT_USEC + 1, 3 * SEGMENT_USEC) == []
+
+
+def test_history_repository_drops_out_of_order_samples(repository: HistoryRepository) -> None:
+    repository.append([_status('GPU-a', 1)], timestamp=2000)
+    repository.append([_status('GPU-a', 2)], timestamp=1000)
+    repository.append([_status('GPU-a', 3)], timestamp=3000)
+    repository.flush()
+
+    assert _temps(repository, 'GPU-a', 0, 5000) == [1.0, 3.0]
+
+
+def test_history_repository_compaction_drops_expired_samples(repository: HistoryRepository) -> None:
+    timestamps = [10000, SEGMENT_USEC + 10000, SEGMENT_USEC + 20000, 2 * SEGMENT_USEC]
+    for i, timestamp in enumerate(timestamps):
+        repository.append([_status('GPU-a', i)], timestamp=timestamp)
+    repository.flush()
+
+    repository._compact(SEGMENT_USEC + 15000, SEGMENT_USEC)
+
+    assert [t for t, _ in repository.query('GPU-a', 0, 3 * SEGMENT_USEC)] == timestamps[2:]
+
+    # rollups expire a day at a time
+    repository._compact(3 * SEGMENT_USEC, 3 * SEGMENT_USEC)
+    assert [t for t, _ in repository.query('GPU-a', 0, 3 * SEGMENT_USEC)] == []
+    repository._compact(USEC_PER_DAY, USEC_PER_DAY)
+    assert repository.get_gpu_uuids() == []
+
+
+def test_history_repository_compresses_sealed_segments(repository: HistoryRepository, tmp_path) -> None:
+    timestamps = [SEGMENT_USEC + i * USEC_PER_SEC + (i % 3) * 1000 for i in range(3000)]
+    timestamps.append(2 * SEGMENT_USEC + 5000)
+    for i, timestamp in enumerate(timestamps):
+        repository.append([_status('GPU-a', 40 + i % 7)], timestamp=timestamp)
+    repository.flush()
+
+    repository._compact(0, 2 * SEGMENT_USEC + 10000)
+
+    files = sorted(p.name for p in (tmp_path / 'history' / 'GPU-a').iterdir() if not p.name.startswith('rollup'))
+    assert files == [f'{SEGMENT_USEC}.gor', f'{2 * SEGMENT_USEC}']
+    assert [t for t, _ in repository.query('GPU-a', 0, 3 * SEGMENT_USEC)] == timestamps
+    assert _temps(repository, 'GPU-a', timestamps[1000], timestamps[1002]) == [46.0, 40.0, 41.0]
+
+    # late samples of a compacted hour end up in a new raw segment, read after the compressed one
+    repository._last_timestamp.clear()
+    repository.append([_status('GPU-a', 98)], timestamp=SEGMENT_USEC + 3500 * USEC_PER_SEC)
+    repository.flush()
+    temps = _temps(repository, 'GPU-a', 0, 3 * SEGMENT_USEC)
+    assert temps[-3:] == [40.0 + 2999 % 7, 98.0, 40.0 + 3000 % 7]
+
+    repository._compact(0, 2 * SEGMENT_USEC + 10000)
+    assert _temps(repository, 'GPU-a', 0, 3 * SEGMENT_USEC) == temps
+
+    # without new raw samples the compressed segment isn't written again
+    compressed = tmp_path / 'history' / 'GPU-a' / f'{SEGMENT_USEC}.gor'
+    inode = compressed.stat().st_ino
+    repository._compact(0, 2 * SEGMENT_USEC + 10000)
+    assert compressed.stat().st_ino == inode
+
+
+def test_history_repository_map_metric(repository: HistoryRepository) -> None:
+    timestamps = [SEGMENT_USEC - 2000, SEGMENT_USEC - 1000, SEGMENT_USEC, SEGMENT_USEC + 1000]
+    for i, timestamp in enumerate(timestamps):
+        repository.append([_status('GPU-a', 40 + i)], timestamp=timestamp)
+    repository.flush()
+
+    mapped_timestamps, temps = repository.map_metric('GPU-a', HistoryMetric.GPU_TEMP, SEGMENT_USEC, SEGMENT_USEC + 1000)
+    # a single raw segment is handed out as a view of the mapped file
+    assert isinstance(temps, memoryview) and temps.readonly
+    assert list(mapped_timestamps) == timestamps[2:]
+    assert list(temps) == [42.0, 43.0]
+
+    mapped_timestamps, temps = repository.map_metric('GPU-a', HistoryMetric.GPU_TEMP, 0, 2 * SEGMENT_USEC)
+    assert list(mapped_timestamps) == timestamps
+    assert list(temps[1:3]) == [41.0, 42.0]
+    assert math.isnan(repository.map_metric('GPU-a', HistoryMetric.GPU_CLOCK, 0, SEGMENT_USEC)[1][0])
+
+    repository._compact(0, 2 * SEGMENT_USEC)
+    mapped_timestamps, temps = repository.map_metric('GPU-a', HistoryMetric.GPU_TEMP, 0, 2 * SEGMENT_USEC)
+    assert list(mapped_timestamps) == timestamps
+    assert list(temps) == [40.0, 41.0, 42.0, 43.0]
+
+
+def test_history_repository_ignores_partial_writes(repository: HistoryRepository, tmp_path) -> None:
+    for i in range(3):
+        repository.append([_status('GPU-a', 40 + i)], timestamp=1000 + i)
+    repository.flush()
+    segment_dir = tmp_path / 'history' / 'GPU-a' / '0'
+    with open(segment_dir / 'gpu_temp.col', 'ab') as file:
+        file.write(b'\0' * 12)
+
+    assert _temps(repository, 'GPU-a', 0, 2000) == [40.0, 41.0, 42.0]
+
+    repository.append([_status('GPU-a', 50)], timestamp=2000)
+    repository.flush()
+    assert _temps(repository, 'GPU-a', 0, 3000) == [40.0, 41.0, 42.0, 50.0]
+
+
+def test_history_repository_rollups(repository: HistoryRepository, tmp_path) -> None:
+    for i in range(40):
+        repository.append([_status('GPU-a', 40 + i % 2)], timestamp=i * 3 * USEC_PER_SEC)
+    repository.flush()
+
+    rollup = repository.map_rollup('GPU-a', HistoryMetric.GPU_TEMP, 0, SEGMENT_USEC, 60 * USEC_PER_SEC)
+    assert list(rollup.timestamps) == [0]
+    assert (rollup.min[0], rollup.max[0], rollup.avg[0], rollup.count[0]) == (40.0, 41.0, 40.5, 20.0)
+
+    # long ranges are read from the rollups
+    timestamps, temps = repository.map_metric('GPU-a', HistoryMetric.GPU_TEMP, 0, SEGMENT_USEC, max_points=10)
+    assert list(timestamps) == [0] and list(temps) == [40.5]
+
+    # the bucket that was open is completed from the raw samples after a restart
+    restarted = HistoryRepository(SysPaths('', '', str(tmp_path)))
+    restarted.append([_status('GPU-a', 50)], timestamp=3 * 60 * USEC_PER_SEC)
+    restarted.close()
+    rollup = repository.map_rollup('GPU-a', HistoryMetric.GPU_TEMP, 0, SEGMENT_USEC, 60 * USEC_PER_SEC)
+    assert list(rollup.timestamps) == [0, 60 * USEC_PER_SEC]
+    assert list(rollup.count) == [20.0, 20.0]
+
+
+def test_history_repository_retention(repository: HistoryRepository) -> None:
+    repository.set_retention(7)
+    assert repository._retention_usec == 7 * USEC_PER_DAY
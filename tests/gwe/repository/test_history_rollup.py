@@ -0,0 +1,74 @@
+import math
+from typing import List, Sequence, Tuple
+
+from gwe.model.history_metric import HISTORY_METRICS
+from gwe.repository.history_rollup import PARTITION_USEC, RollupWriter, expire_rollups, \
+    map_rollup, select_resolution
+
+SEC = 1000000
+MINUTE = 60 * SEC
+
+
+def _rows(timestamps: Sequence[int], first: float = 0.0) -> List[Tuple[int, List[float]]]:
+    rows = []
+    for i, timestamp in enumerate(timestamps):
+        values = [math.nan] * len(HISTORY_METRICS)
+        values[0] = first + i
+        rows.append((timestamp, values))
+    return rows
+
+
+def test_select_resolution() -> None:
+    assert select_resolution(0, 300 * SEC, 301) == 0
+    # the samples are read rather than a rollup of the same resolution
+    assert select_resolution(0, 300 * SEC, 101) == 0
+    assert select_resolution(0, 300 * MINUTE, 300) == MINUTE
+    assert select_resolution(0, 7 * 24 * 60 * MINUTE, 1000) == MINUTE
+    assert select_resolution(0, 365 * 24 * 60 * MINUTE, 1000) == 60 * MINUTE
+
+
+def test_rollup_writes_completed_buckets(tmp_path) -> None:
+    writer = RollupWriter(tmp_path)
+    # 3 s samples over 2 minutes
+    writer.add(_rows([i * 3 * SEC for i in range(41)]))
+
+    rollup = map_rollup(tmp_path, MINUTE, 0, 0, 10 * MINUTE)
+    assert list(rollup.timestamps) == [0, MINUTE]
+    assert list(rollup.min) == [0.0, 20.0]
+    assert list(rollup.max) == [19.0, 39.0]
+    assert list(rollup.avg) == [9.5, 29.5]
+    assert list(rollup.count) == [20.0, 20.0]
+
+    # metrics without samples
+    empty = map_rollup(tmp_path, MINUTE, 1, 0, 10 * MINUTE)
+    assert math.isnan(empty.avg[0]) and list(empty.count) == [0.0, 0.0]
+    assert len(map_rollup(tmp_path, 60 * MINUTE, 0, 0, 10 * MINUTE).timestamps) == 0
+
+
+def test_rollup_resume_skips_written_buckets(tmp_path) -> None:
+    writer = RollupWriter(tmp_path)
+    writer.add(_rows([0, 30 * SEC, MINUTE, MINUTE + 30 * SEC]))
+
+    # a new writer replays the samples since the bucket that was open
+    writer = RollupWriter(tmp_path)
+    # nothing was written at the hour resolution yet
+    assert writer.resume_time() == 0
+    writer.add(_rows([0, 30 * SEC, MINUTE, MINUTE + 30 * SEC, 2 * MINUTE]))
+
+    rollup = map_rollup(tmp_path, MINUTE, 0, 0, 10 * MINUTE)
+    assert list(rollup.timestamps) == [0, MINUTE]
+    assert list(rollup.avg) == [0.5, 2.5]
+
+
+def test_expire_rollups(tmp_path) -> None:
+    writer = RollupWriter(tmp_path)
+    writer.add(_rows([0, PARTITION_USEC, 2 * PARTITION_USEC]))
+
+    # left by a version that maintained 1 s buckets
+    (tmp_path / 'rollup-1' / '0').mkdir(parents=True)
+
+    expire_rollups(tmp_path, PARTITION_USEC)
+    assert list(map_rollup(tmp_path, MINUTE, 0, 0, 3 * PARTITION_USEC).timestamps) == [PARTITION_USEC]
+    assert not (tmp_path / 'rollup-1').exists()
+    expire_rollups(tmp_path, 3 * PARTITION_USEC)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,167 @@
+import threading
+from typing import Iterator, List, Tuple
+
+import pytest
+from peewee import SqliteDatabase
+from reactivex import Subject
+
+from gwe.model import fan_profile, overclock_profile, speed_step
+from gwe.model.cb_change import DbChange
+from gwe.model.fan_profile import FanProfile, FanProfileChangedSubject
+from gwe.model.fan_profile_type import FanProfileType
+from gwe.model.overclock_profile import OverclockProfile, OverclockProfileChangedSubject
+from gwe.model.speed_step import SpeedStep, SpeedStepChangedSubject
+from gwe.repository.database_worker import DatabaseWorker
+from gwe.repository.profile_repository import ProfileRepository
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Iterator[SqliteDatabase]:
+    database = SqliteDatabase(str(tmp_path / 'gwe.db'))
+    monkeypatch.setattr(fan_profile, 'FAN_PROFILE_CHANGED_SUBJECT',
+                        FanProfileChangedSubject(Subject()), raising=False)
+    monkeypatch.setattr(speed_step, 'SPEED_STEP_CHANGED_SUBJECT',
+                        SpeedStepChangedSubject(Subject()), raising=False)
+    monkeypatch.setattr(overclock_profile, 'OVERCLOCK_PROFILE_CHANGED_SUBJECT',
+                        OverclockProfileChangedSubject(Subject()), raising=False)
+    # bound for this test only
+    with database.bind_ctx([FanProfile, SpeedStep, OverclockProfile]):
+        database.create_tables([FanProfile, SpeedStep, OverclockProfile])
+        yield database
+    database.close()
+
+
+@pytest.fixture
+def worker(database: SqliteDatabase) -> Iterator[DatabaseWorker]:
+    worker = DatabaseWorker(database)
+    yield worker
+    worker.close()
+
+
+def _repository(worker: DatabaseWorker) -> ProfileRepository:
+    return ProfileRepository(fan_profile.FAN_PROFILE_CHANGED_SUBJECT,
+                             speed_step.SPEED_STEP_CHANGED_SUBJECT,
+                             overclock_profile.OVERCLOCK_PROFILE_CHANGED_SUBJECT,
+                             worker)
+
+
+def test_profile_repository_loads_profiles(worker: DatabaseWorker) -> None:
+    FanProfile.create(name="Auto", type=FanProfileType.AUTO.value, read_only=True)
+    custom = FanProfile.create(name="Custom")
+    SpeedStep.create(profile=custom.id, temperature=60, duty=80)
+    SpeedStep.create(profile=custom.id, temperature=30, duty=25)
+    OverclockProfile.create(name="Default", gpu=0, memory=0)
+    repository = _repository(worker)
+    assert [p.name for p in repository.get_fan_profiles()] == ["Auto", "Custom"]
+    assert repository.get_auto_fan_profile().name == "Auto"
+    assert [s.temperature for s in repository.get_speed_steps(custom.id)] == [30, 60]
+    assert [p.name for p in repository.get_overclock_profiles()] == ["Default"]
+
+
+def test_profile_repository_follows_changes(worker: DatabaseWorker) -> None:
+    repository = _repository(worker)
+    profile = FanProfile.create(name="Custom")
+    step = SpeedStep.create(profile=profile.id, temperature=40, duty=50)
+    SpeedStep.create(profile=profile.id, temperature=50, duty=60)
+    step.temperature = 55
+    step.save()
+    assert [(s.temperature, s.duty) for s in repository.get_speed_steps(profile.id)] == [(50, 60), (55, 50)]
+    step.delete_instance()
+    assert [s.temperature for s in repository.get_speed_steps(profile.id)] == [50]
+
+    profile.name = "Renamed"
+    profile.save()
+    assert repository.get_fan_profile(profile.id).name == "Renamed"
+    profile.delete_instance(recursive=True)
+    assert repository.get_fan_profile(profile.id) is None
+    assert repository.get_speed_steps(profile.id) == []
+
+    overclock = OverclockProfile.create(name="Fast", gpu=100, memory=200)
+    assert repository.get_overclock_profile(overclock.id).gpu == 100
+    overclock.delete_instance()
+    assert repository.get_overclock_profiles() == []
+
+
+def test_fan_curve_edit_session_commits_once(worker: DatabaseWorker) -> None:
+    repository = _repository(worker)
+    profile = FanProfile.create(name="Custom")
+    first = SpeedStep.create(profile=profile.id, temperature=30, duty=25)
+    second = SpeedStep.create(profile=profile.id, temperature=60, duty=80)
+    changes: List[DbChange] = []
+    speed_step.SPEED_STEP_CHANGED_SUBJECT.subscribe(on_next=changes.append)
+
+    session = repository.edit_fan_curve(profile)
+    staged = session.set_step(first, 40, 30)
+    staged = session.set_step(staged, 45, 35)
+    session.set_step(SpeedStep(profile=profile.id), 70, 100)
+    session.delete_step(second)
+    assert [(s.temperature, s.duty) for s in session.get_steps()] == [(45, 35), (70, 100)]
+    # a new step at the temperature of a stored one
+    new = session.set_step(SpeedStep(profile=profile.id), 45, 40)
+    steps = session.get_steps()
+    assert steps[0] is staged and steps[1] is new
+    session.delete_step(new)
+    # nothing is written or visible to the polling before the commit
+    assert [s.temperature for s in repository.get_speed_steps(profile.id)] == [30, 60]
+
+    committed: List[List[Tuple[int, SpeedStep]]] = []
+    session.commit().subscribe(on_next=committed.append)
+    worker.flush()
+    assert len(changes) == 1
+    assert [(s.temperature, s.duty) for s in repository.get_speed_steps(profile.id)] == [(45, 35), (70, 100)]
+    assert all(s.id is not None for _, s in committed[0])
+    # the worker wrote copies, the new step gets its id on the main loop
+    assert steps[1].id is None
+    session.apply_committed(committed[0])
+    assert [s.id for s in session.get_steps()] == [s.id for _, s in committed[0]]
+    stored = SpeedStep.select().where(SpeedStep.profile == profile.id).order_by(SpeedStep.temperature)
+    assert [(s.temperature, s.duty) for s in stored] == [(45, 35), (70, 100)]
+    assert not session.has_changes()
+
+
+def test_fan_curve_edit_session_inserts_a_new_step_once(worker: DatabaseWorker) -> None:
+    repository = _repository(worker)
+    profile = FanProfile.create(name="Custom")
+    session = repository.edit_fan_curve(profile)
+    release = threading.Event()
+    worker.submit(release.wait)
+
+    # saved again, then deleted, while the commit inserting it is queued
+    staged = session.set_step(SpeedStep(profile=profile.id), 40, 50)
+    session.commit()
+    staged = session.set_step(staged, 45, 55)
+    session.commit()
+    other = session.set_step(SpeedStep(profile=profile.id), 70, 100)
+    session.commit()
+    session.delete_step(other)
+    session.commit()
+    release.set()
+    worker.flush()
+
+    stored = SpeedStep.select().where(SpeedStep.profile == profile.id)
+    assert [(s.temperature, s.duty) for s in stored] == [(45, 55)]
+    assert [s.id for s in repository.get_speed_steps(profile.id)] == [stored[0].id]
+
+
+def test_fan_curve_edit_session_notifies_after_the_commit(worker: DatabaseWorker) -> None:
+    repository = _repository(worker)
+    profile = FanProfile.create(name="Custom")
+    changes: List[DbChange] = []
+    speed_step.SPEED_STEP_CHANGED_SUBJECT.subscribe(on_next=changes.append)
+    session = repository.edit_fan_curve(profile)
+
+    # rolled back, the duty can't be null
+    staged = session.set_step(SpeedStep(profile=profile.id), 40, None)
+    errors: List[Exception] = []
+    session.commit().subscribe(on_error=errors.append)
+    worker.flush()
+    assert len(errors) == 1 and changes == []
+    assert repository.get_speed_steps(profile.id) == []
+
+    # inserted by the next commit
+    session.set_step(staged, 40, 50)
+    session.commit()
+    worker.flush()
+    assert len(changes) == 1
+    stored = SpeedStep.select().where(SpeedStep.profile == profile.id)
+    assert [(s.temperature, s.duty) for s in stored] == [(40, 50)]
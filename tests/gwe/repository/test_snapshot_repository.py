@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from gwe.conf import APP_SNAPSHOT_NAME
+from gwe.model.clocks import Clocks
+from gwe.model.fan import Fan
+from gwe.model.gpu_status import GpuStatus
+from gwe.model.info import Info
+from gwe.model.overclock import Overclock
+from gwe.model.power import Power
+from gwe.model.sys_paths import SysPaths
+from gwe.model.temp import Temp
+from gwe.repository.snapshot_repository import SnapshotRepository
+
+
+def _status() -> GpuStatus:
+    return GpuStatus(index=0,
+                     info=Info(name='GeForce', uuid='GPU-1', memory_total=8192),
+                     power=Power(draw=42.5, limit=200.0),
+                     temp=Temp(gpu=55, slowdown=90),
+                     fan=Fan(fan_list=[(30, 1200), (31, 1210)], control_allowed=True),
+                     clocks=Clocks(graphic_current=1500, graphic_max=1900),
+                     overclock=Overclock(perf_level_max=3, available=True, gpu_range=(-200, 1000),
+                                         gpu_offset=50, memory_range=(-500, 3000), memory_offset=0))
+
+
+def _repository(tmp_path: Path) -> SnapshotRepository:
+    return SnapshotRepository(SysPaths('', '', str(tmp_path)))
+
+
+def test_snapshot_repository_empty_without_file(tmp_path: Path) -> None:
+    snapshot = _repository(tmp_path).load()
+    assert snapshot.status == [] and snapshot.mem_total is None and snapshot.max_clocks is None
+
+
+def test_snapshot_repository_round_trip(tmp_path: Path) -> None:
+    repository = _repository(tmp_path)
+    repository.set_status([_status()])
+    repository.set_max_values(8192, Clocks(graphic_max=1900, memory_max=7000))
+    repository.save()
+
+    snapshot = _repository(tmp_path).load()
+    assert snapshot.status == [_status()]
+    assert snapshot.mem_total == 8192
+    assert snapshot.max_clocks == Clocks(graphic_max=1900, memory_max=7000)
+
+
+def test_snapshot_repository_ignores_invalid_file(tmp_path: Path) -> None:
+    (tmp_path / APP_SNAPSHOT_NAME).write_text('{"version": 1, "status": [{"index": 0}]}')
+    assert _repository(tmp_path).load().status == []
+    (tmp_path / APP_SNAPSHOT_NAME).write_text('not json')
+    assert _repository(tmp_path).load().status == []
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+import pytest
+
+# the app imports Gtk at startup
+pytest.importorskip('gi')
+
+# only needed by rarely used features, imported when they're first used
+_LAZY_MODULES = [
+    'requests',
+    'packaging.version',
+    'gwe.view.edit_fan_profile_view',
+    'gwe.view.edit_overclock_profile_view',
+    'gwe.view.historical_data_view',
+    'gwe.view.preferences_view',
+]
+
+
+def test_startup_does_not_import_lazy_modules() -> None:
+    code = f"import sys, gwe.app, gwe.di; print(' '.join(m for m in {_LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
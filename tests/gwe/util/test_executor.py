@@ -0,0 +1,96 @@
+import threading
+import time
+
+import reactivex
+from reactivex import operators
+
+from gwe.util.executor import Lane, LaneExecutor
+
+
+def test_lane_executor_bounds_and_counts_tasks() -> None:
+    executor = LaneExecutor()
+    scheduler = executor.get_scheduler(Lane.NETWORK)
+    release = threading.Event()
+    lock = threading.Lock()
+    running = [0, 0]  # current, max
+    done = threading.Semaphore(0)
+
+    def task(*_) -> None:
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        done.release()
+
+    for _ in range(5):
+        scheduler.schedule(task)
+    time.sleep(0.1)
+    assert executor.get_metrics()[Lane.NETWORK].queued == 4
+    release.set()
+    for _ in range(5):
+        assert done.acquire(timeout=5)
+    executor.shutdown()
+
+    metrics = executor.get_metrics()[Lane.NETWORK]
+    assert running[1] == 1
+    assert metrics.max_queued == 4
+    assert metrics.queued == 0
+
+
+def test_lane_executor_interval() -> None:
+    executor = LaneExecutor()
+    scheduler = executor.get_scheduler(Lane.SAMPLING)
+    ticks = threading.Semaphore(0)
+    threads = set()
+
+    def on_next(_) -> None:
+        threads.add(threading.current_thread().name)
+        ticks.release()
+
+    disposable = reactivex.interval(0.01, scheduler=scheduler).pipe(
+        operators.start_with(0),
+        operators.subscribe_on(scheduler),
+    ).subscribe(on_next=on_next)
+    for _ in range(3):
+        assert ticks.acquire(timeout=5)
+    disposable.dispose()
+    executor.shutdown()
+    # the timer is disposed on its lane, then the lane runs dry
+    for _ in range(500):
+        if executor.get_metrics()[Lane.SAMPLING].running == 0:
+            break
+        time.sleep(0.01)
+
+    assert executor.get_metrics()[Lane.SAMPLING].running == 0
+    assert all(name.startswith('gwe-sampling') for name in threads)
+
+
+def test_lane_executor_restarts_an_interval_while_the_lane_is_busy() -> None:
+    executor = LaneExecutor()
+    scheduler = executor.get_scheduler(Lane.SAMPLING)
+    release = threading.Event()
+    ticks = threading.Semaphore(0)
+
+    def start_refresh() -> reactivex.abc.DisposableBase:
+        return reactivex.interval(0.01, scheduler=scheduler).pipe(
+            operators.subscribe_on(scheduler),
+        ).subscribe(on_next=lambda _: ticks.release())
+
+    refresh = start_refresh()
+    assert ticks.acquire(timeout=5)
+    # a slow read holds a sampling thread
+    scheduler.schedule(lambda *_: release.wait(5))
+    refresh.dispose()
+    refresh = start_refresh()
+    done = threading.Event()
+    scheduler.schedule(lambda *_: done.set())
+
+    assert done.wait(1)
+    while ticks.acquire(blocking=False):
+        pass
+    assert ticks.acquire(timeout=1)
+    release.set()
+    refresh.dispose()
+    executor.shutdown()
@@ -0,0 +1,54 @@
+import math
+import random
+
+import pytest
+
+from gwe.util.gorilla import BitReader, BitWriter, decode_timestamps, decode_values, encode_timestamps, \
+    encode_values
+
+
+def test_bit_writer_reader_roundtrip() -> None:
+    writer = BitWriter()
+    fields = [(1, 1), (0, 1), (0b101, 3), (2 ** 64 - 1, 64), (12345, 17), (0, 7)] * 20
+    for value, bits in fields:
+        writer.write(value, bits)
+    reader = BitReader(writer.getvalue())
+    assert [reader.read(bits) for _, bits in fields] == [value for value, _ in fields]
+
+
+def test_bit_reader_raises_at_end() -> None:
+    reader = BitReader(b'\xff')
+    reader.read(8)
+    with pytest.raises(EOFError):
+        reader.read(1)
+
+
+def test_timestamps_roundtrip() -> None:
+    timestamps = [-5, 0, 1000, 2000, 3001, 3999, 5000, 5000, 9000, 2 ** 40, 2 ** 40 + 1]
+    assert decode_timestamps(encode_timestamps(timestamps), len(timestamps)) == timestamps
+    assert decode_timestamps(encode_timestamps([]), 0) == []
+
+
+def test_steady_timestamps_take_one_bit() -> None:
+    timestamps = [1_700_000_000_000 + i * 1000 for i in range(1001)]
+    # 64 bits for the first timestamp, 16 for the first delta, then 1 bit each
+    assert len(encode_timestamps(timestamps)) <= (64 + 16 + 999 + 7) // 8
+
+
+def test_values_roundtrip() -> None:
+    rng = random.Random(4)
+    values = [0.0, 0.0, 1.5, -1.5, 1e300, -0.0, 42.0, 42.0, 42.25] + [rng.uniform(-1000, 1000) for _ in range(500)]
+    assert decode_values(encode_values(values), len(values)) == values
+    assert decode_values(encode_values([]), 0) == []
+
+
+def test_values_roundtrip_nan() -> None:
+    values = [math.nan, math.nan, 3.0, math.nan]
+    decoded = decode_values(encode_values(values), len(values))
+    assert [math.isnan(v) for v in decoded] == [True, True, False, True]
+    assert decoded[2] == 3.0
+
+
+def test_constant_values_take_one_bit() -> None:
+    values = [55.0] * 1000
+    assert len(encode_values(values)) <= (64 + 999 + 7) // 8
@@ -0,0 +1,88 @@
+import io
+import json
+import math
+from itertools import count
+
+import pytest
+
+from gwe.model.history_metric import HISTORY_METRICS, HistoryMetric
+from gwe.util.history_export import ExportFormat, parse_metrics, parse_timestamp, write_export
+
+TEMP = HISTORY_METRICS.index(HistoryMetric.GPU_TEMP)
+
+
+def _rows(n: int):
+    for i in range(n):
+        values = [math.nan] * len(HISTORY_METRICS)
+        values[TEMP] = 40.0 + i
+        yield 'GPU-a', 1_700_000_000_000_000 + i * 1_000_000, values
+
+
+def test_export_format_from_path() -> None:
+    assert ExportFormat.from_path('out.jsonl') is ExportFormat.JSONL
+    assert ExportFormat.from_path('out.PARQUET') is ExportFormat.PARQUET
+    assert ExportFormat.from_path('out') is ExportFormat.CSV
+
+
+def test_parse_metrics() -> None:
+    assert parse_metrics('gpu_temp, fan_rpm') == [HistoryMetric.GPU_TEMP, HistoryMetric.FAN_RPM]
+    with pytest.raises(ValueError):
+        parse_metrics('gpu_temp,bogus')
+
+
+def test_parse_timestamp() -> None:
+    assert parse_timestamp('2023-11-14T22:13:20+00:00') == 1_700_000_000_000_000
+
+
+def test_write_csv() -> None:
+    file = io.StringIO()
+    assert write_export(file, ExportFormat.CSV, [HistoryMetric.GPU_TEMP, HistoryMetric.GPU_CLOCK], _rows(2)) == 2
+    assert file.getvalue().splitlines() == [
+        'timestamp,gpu_uuid,gpu_temp,gpu_clock',
+        '2023-11-14T22:13:20+00:00,GPU-a,40.0,',
+        '2023-11-14T22:13:21+00:00,GPU-a,41.0,',
+    ]
+
+
+def test_write_jsonl() -> None:
+    file = io.StringIO()
+    assert write_export(file, ExportFormat.JSONL, [HistoryMetric.GPU_TEMP, HistoryMetric.GPU_CLOCK], _rows(2)) == 2
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert records[1] == {'timestamp': '2023-11-14T22:13:21+00:00', 'gpu_uuid': 'GPU-a',
+                          'gpu_temp': 41.0, 'gpu_clock': None}
+
+
+def test_write_streams_rows() -> None:
+    consumed = count()
+
+    def rows():
+        for row in _rows(1000):
+            next(consumed)
+            yield row
+
+    class StopWriting(Exception):
+        pass
+
+    class LimitedFile(io.StringIO):
+        def write(self, s: str) -> int:
+            if self.tell() > 1000:
+                raise StopWriting()
+            return super().write(s)
+
+    # the rows are written as they are produced, not collected first
+    with pytest.raises(StopWriting):
+        write_export(LimitedFile(), ExportFormat.JSONL, [HistoryMetric.GPU_TEMP], rows())
+    assert next(consumed) < 100
+
+
+def test_write_parquet() -> None:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        with pytest.raises(ImportError):
+            write_export(io.BytesIO(), ExportFormat.PARQUET, [HistoryMetric.GPU_TEMP], _rows(2))
+        return
+    file = io.BytesIO()
+    assert write_export(file, ExportFormat.PARQUET, [HistoryMetric.GPU_TEMP], _rows(3)) == 3
+    file.seek(0)
+    assert pq.read_table(file).column('gpu_temp').to_pylist() == [40.0, 41.0, 42.0]
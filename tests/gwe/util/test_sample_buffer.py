@@ -0,0 +1,40 @@
+import pytest
+from gwe.util.sample_buffer import SampleBuffer
+
+
+def test_sample_buffer_keeps_last_samples():
+    buffer = SampleBuffer(3)
+    for i in range(10):
+        buffer.append(i * 10, [float(i)])
+        assert len(buffer) == min(i + 1, 3)
+    timestamps, values = buffer.drain()
+    assert list(timestamps) == [70, 80, 90]
+    assert [list(column) for column in values] == [[7.0, 8.0, 9.0]]
+    assert len(buffer) == 0
+
+
+def test_sample_buffer_columns():
+    buffer = SampleBuffer(5, columns=2)
+    buffer.append(1, [1.5, -1.5])
+    buffer.append(2, [2.5, -2.5])
+    timestamps, values = buffer.drain()
+    assert list(timestamps) == [1, 2]
+    assert [list(column) for column in values] == [[1.5, 2.5], [-1.5, -2.5]]
+    timestamps, values = buffer.drain()
+    assert list(timestamps) == []
+    assert len(values) == 2
+    with pytest.raises(ValueError):
+        buffer.append(3, [1.0])
+
+
+def test_sample_buffer_resize_keeps_samples():
+    buffer = SampleBuffer(4)
+    for i in range(5):
+        buffer.append(i, [float(i)])
+    buffer.resize(8)
+    assert len(buffer) == 5
+    buffer.append(5, [5.0])
+    buffer.resize(3)
+    timestamps, values = buffer.drain()
+    assert list(timestamps) == [3, 4, 5]
+    assert [list(column) for column in values] == [[3.0, 4.0, 5.0]]
@@ -0,0 +1,74 @@
+import math
+from array import array
+
+import pytest
+
+from gwe.util.sequence import ChainedSequence, OffsetSequence, align_series, chain_sequences
+
+
+def test_chained_sequence_indexing() -> None:
+    seq = ChainedSequence([[1, 2], [], memoryview(array('q', [3, 4, 5])), (6,)])
+    assert len(seq) == 6
+    assert [seq[i] for i in range(6)] == [1, 2, 3, 4, 5, 6]
+    assert seq[-1] == 6
+    assert list(seq) == [1, 2, 3, 4, 5, 6]
+    with pytest.raises(IndexError):
+        seq[6]
+    with pytest.raises(IndexError):
+        seq[-7]
+
+
+def test_chained_sequence_slicing() -> None:
+    seq = ChainedSequence([[1, 2], [3, 4, 5], [6]])
+    assert list(seq[1:5]) == [2, 3, 4, 5]
+    assert list(seq[3:]) == [4, 5, 6]
+    assert list(seq[:0]) == []
+    assert list(seq[::2]) == [1, 3, 5]
+    assert isinstance(seq[1:5], ChainedSequence)
+
+
+def test_chained_sequence_bisect() -> None:
+    from bisect import bisect_left
+    seq = ChainedSequence([[10, 20], [30, 40, 50]])
+    assert bisect_left(seq, 35) == 3
+    assert bisect_left(seq, 5) == 0
+    assert bisect_left(seq, 60) == 5
+
+
+def test_chain_sequences_single_part() -> None:
+    part = [1, 2, 3]
+    assert chain_sequences([[], part]) is part
+    assert len(chain_sequences([])) == 0
+    # a chained part is flattened
+    assert chain_sequences([ChainedSequence([part])]) is part
+    assert ChainedSequence([ChainedSequence([[1], [2]]), [3]]).parts == [[1], [2], [3]]
+
+
+def test_offset_sequence() -> None:
+    seq = OffsetSequence([1, 2, 3], 100)
+    assert len(seq) == 3
+    assert seq[0] == 101
+    assert seq[-1] == 103
+    assert list(seq) == [101, 102, 103]
+    assert list(seq[1:]) == [102, 103]
+
+
+def test_align_series_recorded_together():
+    timestamps = [1, 2, 3]
+    aligned, columns = align_series([(timestamps, [1.0, 2.0, 3.0]), ([1, 2, 3], [4.0, 5.0, 6.0])])
+    assert aligned is timestamps
+    assert [list(c) for c in columns] == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+def test_align_series_merges_missing_samples():
+    aligned, columns = align_series([([1, 2, 3], [1.0, 2.0, 3.0]), ([2, 4], [5.0, 7.0]), ([], [])])
+    assert list(aligned) == [1, 2, 3, 4]
+    assert columns[0][:3] == [1.0, 2.0, 3.0] and math.isnan(columns[0][3])
+    assert math.isnan(columns[1][0]) and columns[1][1] == 5.0 and columns[1][3] == 7.0
+    assert all(math.isnan(v) for v in columns[2])
+
+
+def test_align_series_empty():
+    aligned, columns = align_series([([], []), ([], [])])
+    assert list(aligned) == []
+    assert len(columns) == 2
@@ -0,0 +1,45 @@
+import math
+
+from gwe.view.widget.graph_points import decimate_min_max, transform_points
+
+
+def test_decimate_keeps_one_point_per_column_when_sparse() -> None:
+    xs, ys = [0.5, 10.2, 20.7], [5.0, 6.0, 7.0]
+    assert decimate_min_max(xs, ys) == (xs, ys)
+
+
+def test_decimate_keeps_min_max_in_order() -> None:
+    xs = [0.0, 0.2, 0.4, 0.6, 0.8, 1.1, 1.5]
+    ys = [5.0, 9.0, 1.0, 4.0, 5.0, 3.0, 3.0]
+    # column 0: max (9) before min (1), column 1: a flat line
+    assert decimate_min_max(xs, ys) == ([0.2, 0.4, 1.1], [9.0, 1.0, 3.0])
+
+
+def test_decimate_keeps_gaps() -> None:
+    xs = [0.0, 0.3, 0.6, 0.9]
+    ys = [1.0, 2.0, math.nan, 4.0]
+    out_x, out_y = decimate_min_max(xs, ys)
+    assert out_x == [0.0, 0.3, 0.6, 0.9]
+    assert out_y[:2] == [1.0, 2.0] and math.isnan(out_y[2]) and out_y[3] == 4.0
+
+
+def test_decimate_bounded_by_width() -> None:
+    count = 100000
+    xs = [i * 400 / count for i in range(count)]
+    ys = [math.sin(i) for i in range(count)]
+    out_x, out_y = decimate_min_max(xs, ys)
+    assert len(out_x) <= 2 * 400
+    assert max(out_y) == max(ys) and min(out_y) == min(ys)
+
+
+def test_transform_points() -> None:
+    xs, ys = transform_points([100, 150, 200], [0.0, 50.0, math.nan], 100, 200, 0.0, 100.0, 400, 80)
+    assert xs == [0.0, 200.0, 400.0]
+    # zero is a valid value, at the bottom of the graph
+    assert ys[:2] == [80.0, 40.0]
+    assert math.isnan(ys[2])
+
+
+def test_transform_points_value_range() -> None:
+    _, ys = transform_points([0, 1], [-10.0, 30.0], 0, 1, -10.0, 30.0, 10, 100)
+    assert ys == [100.0, 0.0]
@@ -0,0 +1,14 @@
+from gwe.view.widget.graph_scroll_driver import moved_a_pixel, scroll_offset
+
+
+def test_scroll_offset() -> None:
+    assert scroll_offset(1000, 1000, 100) == 0.0
+    assert scroll_offset(1050, 1000, 100) == -0.5
+
+
+def test_moved_a_pixel() -> None:
+    # 0.001 of a 400 px graph is less than a pixel, but 0.8 device pixel on a HiDPI screen
+    assert not moved_a_pixel(0.0, -0.001, 400, 1)
+    assert not moved_a_pixel(0.0, -0.001, 400, 2)
+    assert moved_a_pixel(0.0, -0.0025, 400, 1)
+    assert moved_a_pixel(0.0, -0.0015, 400, 2)